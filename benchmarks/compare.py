@@ -0,0 +1,180 @@
+"""Compare two result files of `benchmarks.suite` and fail on regressions.
+
+The timings of each file are divided by the fastest run of the calibration
+workload recorded in it, so that results from different machines, or from one
+machine under a different load, can be compared. For every benchmark in both
+files the change of the geometric mean time is reported with a bootstrap
+confidence interval. A benchmark regressed when it is slower by more than the
+threshold and the whole interval is above no change.
+
+Run with `python -m benchmarks.compare baseline.json candidate.json`. The exit
+status is 1 if any benchmark regressed.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """The change of one benchmark between two result files.
+
+    :param name: the name of the benchmark
+    :param baseline: the geometric mean time of the baseline, normalized
+    :param candidate: the geometric mean time of the candidate, normalized
+    :param ratio: the candidate time divided by the baseline time
+    :param low: the lower bound of the confidence interval of the ratio
+    :param high: the upper bound of the confidence interval of the ratio
+    :param regressed: whether the slowdown exceeds the threshold
+    """
+
+    name: str
+    baseline: float
+    candidate: float
+    ratio: float
+    low: float
+    high: float
+    regressed: bool
+
+
+def load_results(
+    path: str | os.PathLike[str],
+    normalize: bool = True,
+) -> tuple[dict[str, npt.NDArray[np.float64]], float]:
+    """Read the timings of every benchmark of a result file.
+
+    :param normalize: divide the timings by the fastest calibration run. Files
+        without calibration are left as they are.
+    :returns: the timings of each benchmark by name, and the time in seconds
+        they were divided by
+    """
+    with open(path) as f:
+        data: dict[str, Any] = json.load(f)
+
+    scale = 1.0
+    if normalize and data.get("calibration"):
+        scale = min(data["calibration"])
+    elif normalize:
+        print(f"warning: {path} has no calibration, its timings are not normalized", file=sys.stderr)
+
+    timings = {
+        benchmark["name"]: np.asarray(benchmark["seconds"], dtype=np.float64) / scale
+        for benchmark in data["benchmarks"]
+    }
+
+    return timings, scale
+
+
+def compare(
+    baseline: dict[str, npt.NDArray[np.float64]],
+    candidate: dict[str, npt.NDArray[np.float64]],
+    threshold: float = 0.1,
+    confidence: float = 0.95,
+    min_seconds: float = 0.0,
+    resamples: int = 10_000,
+    seed: int = 0,
+) -> list[Comparison]:
+    """Compare the benchmarks present in both results, in baseline order.
+
+    :param threshold: the relative slowdown above which a benchmark regressed
+    :param confidence: the level of the confidence intervals
+    :param min_seconds: benchmarks whose baseline is faster than this, in the
+        units of the timings, are reported but never regress, as they are
+        dominated by noise
+    :param resamples: the number of bootstrap samples
+    """
+    rng = np.random.default_rng(seed)
+    tail = (1 - confidence) / 2 * 100
+
+    comparisons = []
+    for name, before in baseline.items():
+        after = candidate.get(name)
+        if after is None or not len(before) or not len(after):
+            continue
+
+        log_before, log_after = np.log(before), np.log(after)
+        ratio = float(np.exp(log_after.mean() - log_before.mean()))
+        # Resample both sides independently, all resamples at once
+        samples = np.exp(
+            rng.choice(log_after, (resamples, len(log_after))).mean(axis=1)
+            - rng.choice(log_before, (resamples, len(log_before))).mean(axis=1)
+        )
+        low, high = np.percentile(samples, [tail, 100 - tail])
+        baseline_time = float(np.exp(log_before.mean()))
+
+        comparisons.append(
+            Comparison(
+                name=name,
+                baseline=baseline_time,
+                candidate=float(np.exp(log_after.mean())),
+                ratio=ratio,
+                low=float(low),
+                high=float(high),
+                regressed=ratio > 1 + threshold and low > 1 and baseline_time >= min_seconds,
+            )
+        )
+
+    return comparisons
+
+
+def format_table(comparisons: Sequence[Comparison], confidence: float = 0.95) -> str:
+    width = max([len("benchmark"), *(len(comparison.name) for comparison in comparisons)])
+    lines = [
+        f"{'benchmark':<{width}} {'baseline':>10} {'candidate':>10} {'change':>8}  {confidence:.0%} interval",
+    ]
+    for comparison in comparisons:
+        lines.append(
+            f"{comparison.name:<{width}} {comparison.baseline:10.4f} {comparison.candidate:10.4f}"
+            f" {comparison.ratio - 1:+8.1%}  [{comparison.low - 1:+.1%}, {comparison.high - 1:+.1%}]"
+            + ("  REGRESSED" if comparison.regressed else "")
+        )
+
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown allowed, 0.1 by default")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.001,
+        help="baseline time in seconds under which benchmarks never regress",
+    )
+    parser.add_argument("--no-normalize", action="store_true", help="compare the raw timings")
+    args = parser.parse_args(argv)
+
+    baseline, scale = load_results(args.baseline, normalize=not args.no_normalize)
+    candidate, _ = load_results(args.candidate, normalize=not args.no_normalize)
+
+    comparisons = compare(
+        baseline,
+        candidate,
+        threshold=args.threshold,
+        confidence=args.confidence,
+        # Normalized like the baseline timings
+        min_seconds=args.min_seconds / scale,
+    )
+    print(format_table(comparisons, args.confidence))
+
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} of {len(comparisons)} benchmarks regressed by more than {args.threshold:.0%}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Seeded synthetic corpora resembling the footprints seen in practice.
+
+Every generator takes the number of vertices of each polygon, summed over all
+rings and including closure points, the number of polygons and a seed, and
+always returns the same polygons for the same arguments. Vertex counts are
+approximate for small sizes, as every ring needs at least 4 coordinates.
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+import numpy.typing as npt
+from shapely.geometry import MultiPolygon, Polygon
+
+Corpus = Callable[[int, int, int], list[Polygon]]
+
+_FloatArray = npt.NDArray[np.float64]
+
+
+def swaths(vertices: int, count: int, seed: int = 0) -> list[Polygon]:
+    """Long along-track swaths of a polar orbiting satellite, 30 to 60
+    degrees of track long and about 2 degrees wide. Some of them cross the
+    antimeridian.
+    """
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for _ in range(count):
+        # The pole of the orbit plane, for an inclination of about 98 degrees
+        node = np.radians(rng.uniform(-180, 180))
+        inclination = np.radians(rng.normal(98, 0.5))
+        pole = np.array(
+            [
+                np.sin(inclination) * np.sin(node),
+                -np.sin(inclination) * np.cos(node),
+                np.cos(inclination),
+            ]
+        )
+        start = np.array([np.cos(node), np.sin(node), 0.0])
+
+        side = max(vertices // 2 - 1, 2)
+        track = np.linspace(0, 1, side)[:, None] * np.radians(rng.uniform(30, 60)) + rng.uniform(0, 2 * np.pi)
+        centers = start * np.cos(track) + np.cross(pole, start) * np.sin(track)
+        width = np.radians(rng.uniform(0.8, 1.2))
+        # The right edge forward and the left edge back, counter clockwise
+        # seen from above
+        right = centers * np.cos(width) - pole * np.sin(width)
+        left = centers * np.cos(width) + pole * np.sin(width)
+        polygons.append(Polygon(_to_lon_lat(np.concatenate((right, left[::-1])))))
+
+    return polygons
+
+
+def polar_footprints(vertices: int, count: int, seed: int = 0) -> list[Polygon]:
+    """Wobbly circular footprints close to either pole, most of which contain
+    the pole. In longitude and latitude their rings wrap around the pole and
+    cross the antimeridian.
+    """
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for _ in range(count):
+        hemisphere = rng.choice([-1, 1])
+        center = (rng.uniform(-180, 180), hemisphere * rng.uniform(80, 88))
+        radius = rng.uniform(5, 15) * _wobble(rng, max(vertices - 1, 3))
+        polygons.append(Polygon(_circle(center, radius)))
+
+    return polygons
+
+
+def antimeridian_frames(vertices: int, count: int, seed: int = 0) -> list[Polygon]:
+    """Rotated rectangular frames of 2 to 10 degrees straddling the
+    antimeridian, with their vertices spread along the edges.
+    """
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for _ in range(count):
+        center = np.array([rng.uniform(176, 184), rng.uniform(-60, 60)])
+        half_width, half_height = rng.uniform(1, 5, 2)
+        corners = np.array(
+            [
+                [-half_width, -half_height],
+                [half_width, -half_height],
+                [half_width, half_height],
+                [-half_width, half_height],
+                [-half_width, -half_height],
+            ]
+        )
+        angle = np.radians(rng.uniform(-30, 30))
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+
+        per_edge = max((vertices - 1) // 4, 1)
+        steps = np.linspace(0, 1, per_edge, endpoint=False)[:, None]
+        edges = [start + steps * (end - start) for start, end in zip(corners[:-1], corners[1:])]
+        coords = np.concatenate(edges) @ rotation.T + center
+        coords[:, 0] = (coords[:, 0] + 180) % 360 - 180
+        polygons.append(Polygon(coords))
+
+    return polygons
+
+
+def polygons_with_holes(vertices: int, count: int, seed: int = 0) -> list[Polygon]:
+    """Wobbly circles with 1 to 8 smaller circular holes, with half of the
+    vertices in the holes.
+    """
+    rng = np.random.default_rng(seed)
+    polygons = []
+    for _ in range(count):
+        center = (rng.uniform(-170, 170), rng.uniform(-60, 60))
+        hole_count = min(int(rng.integers(1, 9)), max(vertices // 8, 1))
+        shell = _circle(center, 10 * _wobble(rng, max(vertices // 2 - 1, 3)))
+
+        holes = []
+        hole_vertices = max((vertices - vertices // 2) // hole_count - 1, 3)
+        for angle in np.linspace(0, 2 * np.pi, hole_count, endpoint=False):
+            hole_center = (center[0] + 5 * np.cos(angle), center[1] + 5 * np.sin(angle))
+            # Holes are clockwise
+            holes.append(_circle(hole_center, np.full(hole_vertices, 1.5))[::-1])
+
+        polygons.append(Polygon(shell, holes))
+
+    return polygons
+
+
+def multipolygon_parts(vertices: int, count: int, seed: int = 0) -> list[Polygon]:
+    """The parts of large MultiPolygons made of a grid of noisy squares.
+
+    Transformations work on one polygon at a time, so each MultiPolygon is
+    returned as its parts, which share the vertex count between them.
+    """
+    rng = np.random.default_rng(seed)
+    polygons: list[Polygon] = []
+    for _ in range(count):
+        parts = int(np.clip(vertices // 100, 1, 1024))
+        columns = int(np.ceil(np.sqrt(parts)))
+        origin = np.array([rng.uniform(-170, 150), rng.uniform(-60, 40)])
+
+        squares = []
+        per_edge = max((vertices // parts - 1) // 4, 1)
+        steps = np.linspace(0, 0.8, per_edge, endpoint=False)[:, None]
+        for i in range(parts):
+            corner = origin + np.array([i % columns, i // columns])
+            corners = corner + np.array([[0, 0], [0.8, 0], [0.8, 0.8], [0, 0.8]])
+            directions = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]])
+            coords = np.concatenate([start + steps * direction for start, direction in zip(corners, directions)])
+            # Noise well below the spacing of the points keeps the edges simple
+            coords += rng.normal(0, 0.08 / per_edge, coords.shape)
+            squares.append(Polygon(coords))
+
+        polygons.extend(MultiPolygon(squares).geoms)
+
+    return polygons
+
+
+CORPORA: dict[str, Corpus] = {
+    "swaths": swaths,
+    "polar_footprints": polar_footprints,
+    "antimeridian_frames": antimeridian_frames,
+    "polygons_with_holes": polygons_with_holes,
+    "multipolygon_parts": multipolygon_parts,
+}
+
+
+def _circle(center: tuple[float, float], radii: _FloatArray) -> _FloatArray:
+    """Points at angular distances in degrees from a center, counter
+    clockwise, following great circles.
+    """
+    lon, lat = np.radians(center)
+    distance = np.radians(radii)
+    # Bearings are measured clockwise from north
+    bearing = -np.linspace(0, 2 * np.pi, len(radii), endpoint=False)
+
+    lats = np.arcsin(np.sin(lat) * np.cos(distance) + np.cos(lat) * np.sin(distance) * np.cos(bearing))
+    lons = lon + np.arctan2(
+        np.sin(bearing) * np.sin(distance) * np.cos(lat),
+        np.cos(distance) - np.sin(lat) * np.sin(lats),
+    )
+
+    return np.stack(((np.degrees(lons) + 180) % 360 - 180, np.degrees(lats)), axis=-1)
+
+
+def _wobble(rng: np.random.Generator, count: int) -> _FloatArray:
+    """Smooth random factors around 1 for the radii of a circle, which keep
+    the circle simple however many points it has.
+    """
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    harmonics = np.arange(2, 6)[:, None]
+    phases = rng.uniform(0, 2 * np.pi, (len(harmonics), 1))
+
+    return 1 + 0.02 * np.sin(harmonics * angles + phases).sum(axis=0)
+
+
+def _to_lon_lat(points: _FloatArray) -> _FloatArray:
+    lons = np.degrees(np.arctan2(points[:, 1], points[:, 0]))
+    lats = np.degrees(np.arcsin(np.clip(points[:, 2], -1, 1)))
+
+    return np.stack((lons, lats), axis=-1)
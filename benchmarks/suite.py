@@ -0,0 +1,218 @@
+"""Time the built-in transformations and whole pipelines on synthetic corpora.
+
+Every benchmark runs a transformation, or a pipeline, on one corpus from
+`benchmarks.corpora` at one polygon size. Small polygons are repeated until
+the batch has about `--vertices` vertices in total, so that every size does a
+comparable amount of work. The timings of every repetition are written as
+JSON, to track performance between releases, together with the timings of a
+fixed calibration workload which `benchmarks.compare` uses to account for
+the speed of the machine.
+
+Run with `python -m benchmarks.suite --output results.json`.
+"""
+
+import argparse
+import datetime
+import importlib.metadata
+import json
+import os
+import platform
+import sys
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import numpy as np
+import shapely
+
+from benchmarks.corpora import CORPORA
+from geo_extensions import Transformer
+from geo_extensions.transformations import (
+    densify_polygon,
+    densify_polygon_by_length,
+    drop_z_coordinate,
+    reverse_polygon,
+    round_points,
+    simplify_polygon,
+    simplify_polygon_geodetic,
+    simplify_polygon_to_vertex_count,
+    split_polygon_on_antimeridian_ccw,
+    split_polygon_on_antimeridian_fixed_size,
+)
+from geo_extensions.types import Transformation
+
+FORMAT_VERSION = 2
+
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# Created for every benchmark, as some transformations keep state
+BENCHMARKS: dict[str, Callable[[], list[Transformation]]] = {
+    "drop_z_coordinate": lambda: [drop_z_coordinate],
+    "reverse_polygon": lambda: [reverse_polygon],
+    "round_points": lambda: [round_points(6)],
+    "simplify_polygon": lambda: [simplify_polygon(0.01)],
+    "simplify_polygon_to_vertex_count": lambda: [simplify_polygon_to_vertex_count(500)],
+    "split_polygon_on_antimeridian_ccw": lambda: [split_polygon_on_antimeridian_ccw],
+    "split_polygon_on_antimeridian_fixed_size": lambda: [split_polygon_on_antimeridian_fixed_size(20)],
+    "densify_polygon": lambda: [densify_polygon(10_000)],
+    "densify_polygon_by_length": lambda: [densify_polygon_by_length(100_000)],
+    "simplify_polygon_geodetic": lambda: [simplify_polygon_geodetic(1000)],
+    "pipeline:cartesian": lambda: [
+        drop_z_coordinate,
+        split_polygon_on_antimeridian_fixed_size(20),
+        simplify_polygon(0.01),
+    ],
+    "pipeline:geodetic": lambda: [
+        drop_z_coordinate,
+        simplify_polygon_geodetic(1000),
+        densify_polygon(10_000),
+    ],
+}
+
+
+def calibrate(repeat: int = 10) -> list[float]:
+    """Time a fixed workload mixing interpreted code, GEOS and numpy calls,
+    in about the proportions of the transformations.
+
+    :returns: the time of each repetition in seconds
+    """
+    angles = np.linspace(0, 2 * np.pi, 10_000, endpoint=False)
+    polygon = shapely.Polygon(np.stack((np.cos(angles), np.sin(angles)), axis=-1))
+    values = np.random.default_rng(0).uniform(size=100_000)
+
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0.0
+        for i in range(100_000):
+            total += i * 0.5
+        shapely.simplify(shapely.segmentize(polygon, 0.0001), 0.001)
+        np.sort(values)
+        seconds.append(time.perf_counter() - start)
+
+    return seconds
+
+
+def run_benchmark(
+    transformations: Sequence[Transformation],
+    polygons: Sequence[Any],
+    repeat: int,
+) -> dict[str, Any]:
+    """Time a pipeline on a batch of polygons.
+
+    The pipeline runs once more before the timed repetitions, which also
+    counts the polygons it fails on and the vertices it produces.
+    """
+    transformer = Transformer(transformations)
+    result = transformer.try_transform_batch(polygons, deduplicate=False)
+    outputs = [polygon for group in result.results for polygon in group]
+
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transformer.try_transform_batch(polygons, deduplicate=False)
+        seconds.append(time.perf_counter() - start)
+
+    return {
+        "seconds": seconds,
+        "errors": len(result.errors),
+        "output_polygons": len(outputs),
+        "output_vertices": int(shapely.get_num_coordinates(np.asarray(outputs, dtype=object)).sum()),
+    }
+
+
+def run_suite(
+    corpora: Sequence[str],
+    benchmarks: Sequence[str],
+    sizes: Sequence[int],
+    vertices: int,
+    repeat: int,
+    seed: int = 0,
+    log: Callable[[str], None] = lambda message: None,
+) -> dict[str, Any]:
+    """Run every benchmark on every corpus at every size.
+
+    :param vertices: the approximate number of vertices of each batch
+    :param log: called with a line describing each finished benchmark
+    :returns: the results in the JSON format
+    """
+    calibration = calibrate()
+    results = []
+    for corpus in corpora:
+        for size in sizes:
+            polygons = CORPORA[corpus](size, max(vertices // size, 1), seed)
+            input_vertices = int(shapely.get_num_coordinates(np.asarray(polygons, dtype=object)).sum())
+
+            for benchmark in benchmarks:
+                result = run_benchmark(BENCHMARKS[benchmark](), polygons, repeat)
+                results.append(
+                    {
+                        "name": f"{corpus}/{size}/{benchmark}",
+                        "corpus": corpus,
+                        "size": size,
+                        "benchmark": benchmark,
+                        "polygons": len(polygons),
+                        "vertices": input_vertices,
+                        **result,
+                    }
+                )
+                log(f"{corpus:>20} {size:>8} {benchmark:<42} {min(result['seconds']):10.4f} s")
+
+    return {
+        "version": FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "machine": _machine(),
+        "settings": {"seed": seed, "repeat": repeat, "vertices": vertices},
+        "calibration": calibration,
+        "benchmarks": results,
+    }
+
+
+def _machine() -> dict[str, Any]:
+    try:
+        version = importlib.metadata.version("geo_extensions")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+
+    return {
+        "geo_extensions": version,
+        "python": platform.python_version(),
+        "shapely": shapely.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", "-o", help="the JSON file to write, standard output by default")
+    parser.add_argument("--corpora", nargs="+", choices=list(CORPORA), default=list(CORPORA))
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="vertices per polygon")
+    parser.add_argument("--vertices", type=int, default=10_000, help="vertices per batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run_suite(
+        args.corpora,
+        args.benchmarks,
+        args.sizes,
+        args.vertices,
+        args.repeat,
+        seed=args.seed,
+        log=lambda message: print(message, file=sys.stderr),
+    )
+
+    text = json.dumps(results, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
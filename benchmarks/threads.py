@@ -0,0 +1,63 @@
+"""Compare the serial and thread pool execution modes of `Transformer`.
+
+Run with `python -m benchmarks.threads`. Threads can only be faster with as
+many CPU cores, so run it on a machine with at least 4.
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from geo_extensions import Transformer
+from geo_extensions.transformations import (
+    simplify_polygon,
+    split_polygon_on_antimeridian_fixed_size,
+)
+
+
+def wavy_polygons(count: int, vertices: int, seed: int = 0) -> list[Polygon]:
+    """Create noisy circles with many vertices, some of them crossing the
+    antimeridian, so simplifying and splitting them both take real work.
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    polygons = []
+    for _ in range(count):
+        lon, lat = rng.uniform(150, 210), rng.uniform(-60, 60)
+        radius = 5 + rng.normal(0, 0.1, vertices)
+        lons = (lon + radius * np.cos(angles) + 180) % 360 - 180
+        polygons.append(Polygon(np.stack((lons, lat + radius * np.sin(angles)), axis=-1)))
+
+    return polygons
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--vertices", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    polygons = wavy_polygons(args.count, args.vertices)
+    transformations = [split_polygon_on_antimeridian_fixed_size(20), simplify_polygon(0.01)]
+
+    cpus = os.cpu_count() or 1
+    print(f"{cpus} CPU cores")
+    if cpus < max(args.threads):
+        print("Warning: fewer cores than threads, the threaded timings can't show a speedup")
+
+    baseline = None
+    for threads in [None, *args.threads]:
+        transformer = Transformer(transformations, threads=threads)
+        start = time.perf_counter()
+        transformer.transform(polygons)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"threads={threads or 'serial':>6}  {elapsed:8.3f} s  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,90 @@
+from geo_extensions.checkpoint import (
+    CheckpointStore,
+    DirectoryCheckpointStore,
+    MemoryCheckpointStore,
+)
 from geo_extensions.checks import (
+    ValidationResult,
     polygon_crosses_antimeridian_ccw,
     polygon_crosses_antimeridian_fixed_size,
+    polygon_exceeds_hemisphere,
+    polygon_is_ccw_spherical,
+    polygon_spherical_signed_area,
+    validate_polygons,
+)
+from geo_extensions.metadata import (
+    TransformationInfo,
+    TransformationProperties,
+    describe_transformation,
+    fingerprint,
+)
+from geo_extensions.planner import plan_transformations
+from geo_extensions.tracking import (
+    MemoryDiagnostics,
+    SlowInputTracker,
+    StageProfiler,
+    load_slow_inputs,
 )
 from geo_extensions.transformations import (
+    EdgeCache,
+    VertexBudgetExceeded,
     densify_polygon,
+    densify_polygon_by_length,
     drop_z_coordinate,
     reverse_polygon,
     round_points,
     simplify_polygon,
+    simplify_polygon_geodetic,
+    simplify_polygon_to_vertex_count,
+    simplify_polygons_to_vertex_count,
     split_polygon_on_antimeridian_ccw,
     split_polygon_on_antimeridian_fixed_size,
 )
-from geo_extensions.transformer import Transformer, to_polygons
+from geo_extensions.transformer import (
+    BatchResult,
+    Transformer,
+    to_polygons,
+    transform_many,
+)
 from geo_extensions.types import Transformation, TransformationResult
 
 __all__ = (
+    "BatchResult",
+    "CheckpointStore",
     "densify_polygon",
+    "densify_polygon_by_length",
+    "describe_transformation",
+    "DirectoryCheckpointStore",
     "drop_z_coordinate",
+    "EdgeCache",
+    "fingerprint",
+    "load_slow_inputs",
+    "MemoryCheckpointStore",
+    "MemoryDiagnostics",
+    "plan_transformations",
     "polygon_crosses_antimeridian_ccw",
     "polygon_crosses_antimeridian_fixed_size",
+    "polygon_exceeds_hemisphere",
+    "polygon_is_ccw_spherical",
+    "polygon_spherical_signed_area",
     "reverse_polygon",
     "round_points",
     "simplify_polygon",
+    "simplify_polygon_geodetic",
+    "simplify_polygon_to_vertex_count",
+    "simplify_polygons_to_vertex_count",
+    "SlowInputTracker",
     "split_polygon_on_antimeridian_ccw",
     "split_polygon_on_antimeridian_fixed_size",
+    "StageProfiler",
     "to_polygons",
+    "transform_many",
     "Transformation",
+    "TransformationInfo",
+    "TransformationProperties",
     "TransformationResult",
     "Transformer",
+    "validate_polygons",
+    "ValidationResult",
+    "VertexBudgetExceeded",
 )
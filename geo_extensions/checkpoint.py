@@ -0,0 +1,142 @@
+"""Storage for intermediate results of a transformation pipeline.
+
+A `Transformer` configured with a checkpoint store saves the results of its
+leading transformations, and resumes from the longest saved prefix of its own
+transformations when it is run on the same input again. Prefixes are compared
+using the configuration fingerprints of the transformations, so a pipeline
+which only differs in its final stages, for instance the tolerance passed to
+`simplify_polygon`, can skip the expensive leading stages entirely.
+"""
+
+import hashlib
+import os
+import struct
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from pathlib import Path
+
+import shapely
+from shapely.geometry import Polygon
+
+_COUNT = struct.Struct("<I")
+
+
+class CheckpointStore(ABC):
+    """Base class for checkpoint storage backends."""
+
+    @abstractmethod
+    def load(self, key: str) -> list[list[Polygon]] | None:
+        """Load the results saved under a key.
+
+        :returns: the saved results, or None if there are none
+        """
+
+    @abstractmethod
+    def save(self, key: str, results: list[list[Polygon]]) -> None:
+        """Save the results of a batch under a key."""
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """Keep checkpoints in memory for the lifetime of the store."""
+
+    def __init__(self) -> None:
+        self._results: dict[str, list[list[Polygon]]] = {}
+
+    def load(self, key: str) -> list[list[Polygon]] | None:
+        results = self._results.get(key)
+        if results is None:
+            return None
+
+        return [list(group) for group in results]
+
+    def save(self, key: str, results: list[list[Polygon]]) -> None:
+        self._results[key] = [list(group) for group in results]
+
+
+class DirectoryCheckpointStore(CheckpointStore):
+    """Write checkpoints to files in a directory so they can be reused between
+    runs.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path)
+
+    def load(self, key: str) -> list[list[Polygon]] | None:
+        try:
+            data = (self.path / f"{key}.bin").read_bytes()
+        except FileNotFoundError:
+            return None
+
+        return _decode(data)
+
+    def save(self, key: str, results: list[list[Polygon]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so that an interrupted run never
+        # leaves a partial checkpoint behind.
+        file_path = self.path / f"{key}.bin"
+        tmp_path = self.path / f"{key}.bin.tmp"
+        tmp_path.write_bytes(_encode(results))
+        tmp_path.replace(file_path)
+
+
+def checkpoint_keys(fingerprints: Sequence[str], polygons: Sequence[Polygon]) -> list[str]:
+    """Compute the checkpoint keys for every leading subsequence of a pipeline.
+
+    :param fingerprints: the fingerprints of the pipeline transformations
+    :param polygons: the input polygons of the batch
+    :returns: a list where the key at index `i` identifies the results of
+        running the first `i + 1` transformations on the polygons
+    """
+    polygons_hash = hashlib.sha256()
+    for wkb in shapely.to_wkb(polygons, output_dimension=3):
+        polygons_hash.update(_COUNT.pack(len(wkb)))
+        polygons_hash.update(wkb)
+    polygons_digest = polygons_hash.digest()
+
+    keys = []
+    prefix_hash = hashlib.sha256()
+    for fingerprint in fingerprints:
+        encoded = fingerprint.encode()
+        prefix_hash.update(_COUNT.pack(len(encoded)))
+        prefix_hash.update(encoded)
+
+        key_hash = prefix_hash.copy()
+        key_hash.update(polygons_digest)
+        keys.append(key_hash.hexdigest())
+
+    return keys
+
+
+def _encode(results: list[list[Polygon]]) -> bytes:
+    chunks = [_COUNT.pack(len(results))]
+    for group in results:
+        chunks.append(_COUNT.pack(len(group)))
+        for wkb in shapely.to_wkb(group, output_dimension=3):
+            chunks.append(_COUNT.pack(len(wkb)))
+            chunks.append(wkb)
+
+    return b"".join(chunks)
+
+
+def _decode(data: bytes) -> list[list[Polygon]]:
+    offset = 0
+
+    def read_count() -> int:
+        nonlocal offset
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        return int(count)
+
+    results = []
+    for _ in range(read_count()):
+        wkbs = []
+        for _ in range(read_count()):
+            size = read_count()
+            end = offset + size
+            wkbs.append(data[offset:end])
+            offset = end
+
+        results.append(list(shapely.from_wkb(wkbs)))
+
+    return results
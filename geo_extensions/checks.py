@@ -9,10 +9,23 @@ ordered on the surface of the Earth makes the shapely `is_ccw` property a very
 useful and easy check to determine if the polygon crosses the antimeridian, as
 in this case, the polygon will appear to be mis-ordered in the infinite flat
 plane space.
+
+Near the poles, and for polygons larger than a hemisphere, the planar order is
+not a reliable indication of the order on the sphere. The `spherical` checks
+compute the orientation from the area enclosed on the sphere instead.
 """
 
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+import shapely
 from shapely.geometry import Polygon
 
+from geo_extensions.spherical import EARTH_RADIUS_METERS, FloatArray
+
 
 def polygon_crosses_antimeridian_ccw(polygon: Polygon) -> bool:
     """Checks if the longitude coordinates 'wrap around' the 180/-180 line.
@@ -27,6 +40,19 @@ def polygon_crosses_antimeridian_ccw(polygon: Polygon) -> bool:
     return not (polygon.exterior.is_ccw and polygon.exterior.is_valid)
 
 
+def polygons_cross_antimeridian_ccw(polygons: Sequence[Polygon]) -> npt.NDArray[np.bool_]:
+    """Vectorized version of `polygon_crosses_antimeridian_ccw`.
+
+    :param polygons: the polygons to check, must be known to be in counter-
+        clockwise order.
+    :returns: a boolean array which is true for the polygons crossing the
+        antimeridian
+    """
+
+    exteriors = shapely.get_exterior_ring(np.asarray(polygons, dtype=object))
+    return ~(shapely.is_ccw(exteriors) & shapely.is_valid(exteriors))
+
+
 def polygon_crosses_antimeridian_fixed_size(
     polygon: Polygon,
     min_lon_extent: float,
@@ -46,3 +72,319 @@ def polygon_crosses_antimeridian_fixed_size(
     dist_from_180 = 180 - min_lon_extent
 
     return max_lon > dist_from_180 or min_lon < -dist_from_180
+
+
+def polygons_cross_antimeridian_fixed_size(
+    polygons: Sequence[Polygon],
+    min_lon_extent: float,
+) -> npt.NDArray[np.bool_]:
+    """Vectorized version of `polygon_crosses_antimeridian_fixed_size`.
+
+    :param polygons: the polygons to check
+    :param min_lon_extent: the lower bound for the distance between the
+        longitude values of the bounding box enclosing the entire polygon.
+        Must be between (0, 180) exclusive.
+    :returns: a boolean array which is true for the polygons crossing the
+        antimeridian
+    """
+    assert 0 < min_lon_extent < 180
+
+    bounds = shapely.bounds(np.asarray(polygons, dtype=object)).reshape(-1, 4)
+    min_lon, max_lon = bounds[:, 0], bounds[:, 2]
+    dist_from_180 = 180 - min_lon_extent
+
+    return (max_lon > dist_from_180) | (min_lon < -dist_from_180)
+
+
+def polygon_spherical_signed_area(polygon: Polygon) -> float:
+    """Compute the area enclosed by the exterior ring of a polygon on a
+    spherical Earth, signed by its orientation.
+
+    A ring divides the sphere into two regions. The result is the area of the
+    smaller one, which is positive when the ring goes around it in counter-
+    clockwise order and negative when it goes around it in clockwise order.
+
+    :returns: the signed area in square meters
+    """
+    return float(polygons_spherical_signed_area([polygon])[0])
+
+
+def polygons_spherical_signed_area(polygons: Sequence[Polygon]) -> FloatArray:
+    """Vectorized version of `polygon_spherical_signed_area`.
+
+    :returns: an array of signed areas in square meters
+    """
+    sphere = 4 * np.pi * EARTH_RADIUS_METERS**2
+    areas = _left_areas(polygons)
+
+    return np.where(areas <= sphere / 2, areas, areas - sphere)
+
+
+def polygon_is_ccw_spherical(polygon: Polygon) -> bool:
+    """Checks if the exterior ring of a polygon is in counter-clockwise order
+    on the surface of the Earth, around the smaller of the two regions it
+    divides the sphere into.
+
+    :returns: true if the polygon is counter-clockwise
+    """
+    return bool(polygons_are_ccw_spherical([polygon])[0])
+
+
+def polygons_are_ccw_spherical(polygons: Sequence[Polygon]) -> npt.NDArray[np.bool_]:
+    """Vectorized version of `polygon_is_ccw_spherical`.
+
+    :returns: a boolean array which is true for the counter-clockwise
+        polygons
+    """
+    return polygons_spherical_signed_area(polygons) > 0
+
+
+def polygon_exceeds_hemisphere(polygon: Polygon) -> bool:
+    """Checks if a polygon covers more than half of the Earth, taking its
+    exterior ring to be in counter-clockwise order as UMM-G requires.
+
+    A counter-clockwise polygon larger than a hemisphere has the same points
+    as a clockwise polygon around the rest of the Earth, so for any polygon
+    this is true exactly when `polygon_is_ccw_spherical` is false, except for
+    polygons without area.
+
+    :returns: true if the polygon covers more than half of the Earth
+    """
+    return bool(polygons_exceed_hemisphere([polygon])[0])
+
+
+def polygons_exceed_hemisphere(polygons: Sequence[Polygon]) -> npt.NDArray[np.bool_]:
+    """Vectorized version of `polygon_exceeds_hemisphere`.
+
+    :returns: a boolean array which is true for the polygons covering more
+        than half of the Earth
+    """
+    return _left_areas(polygons) > 2 * np.pi * EARTH_RADIUS_METERS**2
+
+
+_Check = Callable[[npt.NDArray[np.object_]], npt.NDArray[np.bool_]]
+
+
+@dataclass(frozen=True)
+class ValidationResult:
+    """The outcome of validating one polygon against the CMR constraints.
+
+    :param check: the name of the first check the polygon failed, or None if
+        it passed every check
+    :param message: a description of the failure
+    """
+
+    check: str | None = None
+    message: str | None = None
+
+    @property
+    def valid(self) -> bool:
+        return self.check is None
+
+
+_VALID = ValidationResult()
+
+
+def validate_polygons(
+    polygons: Sequence[Polygon],
+    coordinate_system: Literal["cartesian", "geodetic"] = "geodetic",
+    max_vertices: int | None = None,
+) -> list[ValidationResult]:
+    """Check an array of polygons against the UMM-G and CMR constraints.
+
+    The checks run from cheapest to most expensive, each one on all polygons
+    that passed the previous ones at once, so every polygon stops at its
+    first failure. The checks are:
+
+        - `empty`: the polygon has no points
+        - `vertex_count`: the polygon has more than `max_vertices` points,
+            if given
+        - `duplicate_points`: a ring has consecutive duplicate points, or
+            fewer than 3 distinct points
+        - `orientation`: the exterior is not counter-clockwise or a hole is
+            not clockwise. For geodetic polygons this is checked on the
+            sphere, which also catches polygons covering more than half of
+            the Earth.
+        - `antimeridian`: a cartesian polygon crosses the antimeridian
+        - `self_intersection`: a ring crosses itself. Geodetic rings are
+            checked with their longitudes unwrapped across the antimeridian,
+            except for rings around a pole.
+
+    Ring closure is not checked, as shapely always closes rings.
+
+    :param coordinate_system: the CMR coordinate system the polygons are in
+    :param max_vertices: the maximum number of points of a polygon
+    :returns: a result for each polygon, in order
+    """
+    if coordinate_system not in ("cartesian", "geodetic"):
+        raise ValueError(f"unknown coordinate system '{coordinate_system}'")
+
+    geodetic = coordinate_system == "geodetic"
+    checks: list[tuple[str, str, _Check]] = [
+        ("empty", "polygon is empty", lambda polygons: ~shapely.is_empty(polygons)),
+    ]
+    if max_vertices is not None:
+        checks.append(
+            (
+                "vertex_count",
+                f"polygon has more than {max_vertices} points",
+                lambda polygons: shapely.get_num_coordinates(polygons) <= max_vertices,
+            )
+        )
+    checks.append(("duplicate_points", "ring has duplicate points", _have_distinct_points))
+    if geodetic:
+        checks.append(
+            (
+                "orientation",
+                "ring order is wrong on the sphere, or the polygon covers more than half of the earth",
+                _are_oriented_spherical,
+            )
+        )
+    else:
+        checks.append(("orientation", "ring order is wrong", _are_oriented_planar))
+        checks.append(("antimeridian", "polygon crosses the antimeridian", _do_not_cross_antimeridian))
+    checks.append(
+        (
+            "self_intersection",
+            "ring intersects itself",
+            _are_simple_geodetic if geodetic else _are_simple_planar,
+        )
+    )
+
+    array = np.asarray(polygons, dtype=object)
+    results = [_VALID] * len(array)
+    remaining = np.arange(len(array))
+    for name, message, check in checks:
+        if not len(remaining):
+            break
+
+        passed = np.asarray(check(array[remaining]), dtype=np.bool_)
+        failure = ValidationResult(name, message)
+        for i in remaining[~passed].tolist():
+            results[i] = failure
+        remaining = remaining[passed]
+
+    return results
+
+
+def _rings_per_polygon(polygons: npt.NDArray[np.object_]) -> tuple[npt.NDArray[np.object_], npt.NDArray[np.intp]]:
+    """Get every ring of the polygons, and the index of the polygon of each."""
+    return shapely.get_rings(polygons, return_index=True)
+
+
+def _all_per_polygon(
+    passed: npt.NDArray[np.bool_],
+    polygon_index: npt.NDArray[np.intp],
+    count: int,
+) -> npt.NDArray[np.bool_]:
+    """Combine a per ring result into a per polygon result."""
+    failed = np.zeros(count, dtype=np.bool_)
+    failed[polygon_index[~passed]] = True
+
+    return ~failed
+
+
+def _have_distinct_points(polygons: npt.NDArray[np.object_]) -> npt.NDArray[np.bool_]:
+    rings, polygon_index = _rings_per_polygon(polygons)
+    coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+    is_edge = ring_index[1:] == ring_index[:-1]
+    edge_ring_index = ring_index[:-1][is_edge]
+
+    duplicate = np.all(coords[1:] == coords[:-1], axis=-1)[is_edge]
+    has_duplicates = np.bincount(edge_ring_index, weights=duplicate, minlength=len(rings)) > 0
+    # The closing point repeats the first one
+    distinct_counts = np.bincount(ring_index, minlength=len(rings)) - 1
+
+    return _all_per_polygon(~has_duplicates & (distinct_counts >= 3), polygon_index, len(polygons))
+
+
+def _are_oriented_spherical(polygons: npt.NDArray[np.object_]) -> npt.NDArray[np.bool_]:
+    rings, polygon_index = _rings_per_polygon(polygons)
+    is_exterior = np.ones(len(rings), dtype=np.bool_)
+    is_exterior[1:] = polygon_index[1:] != polygon_index[:-1]
+
+    is_ccw = _ring_left_areas(rings) <= 2 * np.pi * EARTH_RADIUS_METERS**2
+
+    return _all_per_polygon(is_ccw == is_exterior, polygon_index, len(polygons))
+
+
+def _are_oriented_planar(polygons: npt.NDArray[np.object_]) -> npt.NDArray[np.bool_]:
+    rings, polygon_index = _rings_per_polygon(polygons)
+    is_exterior = np.ones(len(rings), dtype=np.bool_)
+    is_exterior[1:] = polygon_index[1:] != polygon_index[:-1]
+
+    return _all_per_polygon(shapely.is_ccw(rings) == is_exterior, polygon_index, len(polygons))
+
+
+def _do_not_cross_antimeridian(polygons: npt.NDArray[np.object_]) -> npt.NDArray[np.bool_]:
+    return ~polygons_cross_antimeridian_ccw(list(polygons))
+
+
+def _are_simple_planar(polygons: npt.NDArray[np.object_]) -> npt.NDArray[np.bool_]:
+    rings, polygon_index = _rings_per_polygon(polygons)
+
+    return _all_per_polygon(shapely.is_simple(rings), polygon_index, len(polygons))
+
+
+def _are_simple_geodetic(polygons: npt.NDArray[np.object_]) -> npt.NDArray[np.bool_]:
+    rings, polygon_index = _rings_per_polygon(polygons)
+    coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+
+    # Make the longitudes continuous along each ring, so rings crossing the
+    # antimeridian don't appear to cross themselves. Every ring has points,
+    # since empty polygons were rejected before.
+    starts = np.ones(len(coords), dtype=np.bool_)
+    starts[1:] = ring_index[1:] != ring_index[:-1]
+    firsts = np.flatnonzero(starts)
+    steps = (np.diff(coords[:, 0], prepend=0.0) + 180) % 360 - 180
+    steps[starts] = 0.0
+    offsets = np.cumsum(steps)
+    lons = coords[firsts, 0][ring_index] + offsets - offsets[firsts][ring_index]
+
+    # Rings around a pole don't end where they started after unwrapping, and
+    # can't be checked in the plane
+    lasts = np.append(firsts[1:], len(coords)) - 1
+    around_pole = np.abs(lons[lasts] - lons[firsts]) > 180
+    # Rounding errors in the sum would leave the other rings slightly open,
+    # and closing them again adds a spike
+    closed = ~around_pole
+    lons[lasts[closed]] = lons[firsts[closed]]
+
+    unwrapped = shapely.linearrings(np.stack((lons, coords[:, 1]), axis=-1), indices=ring_index)
+
+    return _all_per_polygon(shapely.is_simple(unwrapped) | around_pole, polygon_index, len(polygons))
+
+
+def _left_areas(polygons: Sequence[Polygon]) -> FloatArray:
+    """Compute the area of the region to the left of the exterior ring of
+    each polygon, on a sphere.
+    """
+    return _ring_left_areas(shapely.get_exterior_ring(np.asarray(polygons, dtype=object)))
+
+
+def _ring_left_areas(rings: npt.NDArray[np.object_]) -> FloatArray:
+    """Compute the area of the region to the left of each ring, on a sphere,
+    for all edges at once.
+
+    The spherical excess of each edge is computed from the tangents of the
+    half latitudes and summed per ring. The sum for rings that go around a
+    pole is off by half of the sphere, which is corrected using the total
+    change in longitude.
+    """
+    coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+    radians = np.radians(coords)
+    is_edge = ring_index[1:] == ring_index[:-1]
+    edge_ring_index = ring_index[:-1][is_edge]
+
+    lon_differences = np.diff(radians[:, 0])[is_edge]
+    lon_differences = (lon_differences + np.pi) % (2 * np.pi) - np.pi
+    half_tangents = np.tan(radians[:, 1] / 2)
+    t1, t2 = half_tangents[:-1][is_edge], half_tangents[1:][is_edge]
+    excesses = 2 * np.arctan2(np.tan(lon_differences / 2) * (t1 + t2), 1 + t1 * t2)
+
+    count = len(rings)
+    excess_sums = np.bincount(edge_ring_index, weights=excesses, minlength=count)
+    windings = np.rint(np.bincount(edge_ring_index, weights=lon_differences, minlength=count) / (2 * np.pi))
+    areas = (2 * np.pi * np.abs(windings) - excess_sums) % (4 * np.pi)
+
+    return np.asarray(areas * EARTH_RADIUS_METERS**2, dtype=np.float64)
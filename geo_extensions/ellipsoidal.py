@@ -0,0 +1,201 @@
+"""Vectorized geodesic helpers on the WGS84 ellipsoid.
+
+These solve the inverse and direct geodesic problems for whole arrays of
+points at once using NumPy and Vincenty's formulae, giving the same results as
+`pygeodesy.ellipsoidalVincenty` without constructing a `LatLon` for each point.
+
+Coordinates are passed as arrays of shape (N, 2) holding (lon, lat) pairs in
+degrees, matching the order used by shapely. Azimuths are in degrees clockwise
+from north and distances are in meters.
+
+Like `pygeodesy.ellipsoidalVincenty`, the inverse solution is not reliable for
+nearly antipodal points, where Vincenty's iteration does not converge.
+"""
+
+import numpy as np
+from pygeodesy import Datums
+
+from geo_extensions.spherical import FloatArray
+
+_WGS84 = Datums.WGS84.ellipsoid
+SEMI_MAJOR_AXIS_METERS = _WGS84.a
+SEMI_MINOR_AXIS_METERS = _WGS84.b
+FLATTENING = _WGS84.f
+
+_MAX_ITERATIONS = 200
+_EPSILON = 1e-12
+
+
+def inverse_geodesics(starts: FloatArray, ends: FloatArray) -> tuple[FloatArray, FloatArray, FloatArray]:
+    """Solve the inverse geodesic problem between corresponding points.
+
+    :param starts: array of shape (N, 2) of (lon, lat) pairs
+    :param ends: array of shape (N, 2) of (lon, lat) pairs
+    :returns: arrays of shape (N,) holding the geodesic distance, the azimuth
+        at the start point and the azimuth at the end point. The azimuths of
+        coincident points are 0.
+    """
+    starts = np.radians(np.asarray(starts, dtype=np.float64)[..., :2])
+    ends = np.radians(np.asarray(ends, dtype=np.float64)[..., :2])
+
+    lon_difference = ends[..., 0] - starts[..., 0]
+    sin_u1, cos_u1 = _reduced_latitude(starts[..., 1])
+    sin_u2, cos_u2 = _reduced_latitude(ends[..., 1])
+
+    lam = lon_difference
+    for _ in range(_MAX_ITERATIONS):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+
+        coincident = sin_sigma == 0
+        sin_alpha = np.divide(
+            cos_u1 * cos_u2 * sin_lam,
+            sin_sigma,
+            out=np.zeros_like(sin_sigma),
+            where=~coincident,
+        )
+        cos2_alpha = 1 - sin_alpha**2
+        # Points on the equator have no midpoint latitude
+        cos_2sigma_m = np.subtract(
+            cos_sigma,
+            np.divide(
+                2 * sin_u1 * sin_u2,
+                cos2_alpha,
+                out=np.zeros_like(cos2_alpha),
+                where=cos2_alpha != 0,
+            ),
+        )
+
+        new_lam = lon_difference + _longitude_correction(
+            sigma, sin_sigma, cos_sigma, sin_alpha, cos2_alpha, cos_2sigma_m
+        )
+        converged = np.all(np.abs(new_lam - lam) <= _EPSILON)
+        lam = new_lam
+        if converged:
+            break
+
+    delta_sigma = _sigma_correction(cos2_alpha, sin_sigma, cos_sigma, cos_2sigma_m)
+    distances = SEMI_MINOR_AXIS_METERS * _series_a(cos2_alpha) * (sigma - delta_sigma)
+
+    sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+    start_azimuths = np.arctan2(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+    end_azimuths = np.arctan2(cos_u1 * sin_lam, -sin_u1 * cos_u2 + cos_u1 * sin_u2 * cos_lam)
+    start_azimuths[coincident] = 0.0
+    end_azimuths[coincident] = 0.0
+
+    return distances, np.degrees(start_azimuths), np.degrees(end_azimuths)
+
+
+def direct_geodesics(
+    starts: FloatArray,
+    azimuths: FloatArray,
+    distances: FloatArray,
+) -> tuple[FloatArray, FloatArray]:
+    """Solve the direct geodesic problem from each start point.
+
+    :param starts: array of shape (N, 2) of (lon, lat) pairs
+    :param azimuths: array of shape (N,) of azimuths at the start points
+    :param distances: array of shape (N,) of distances to travel
+    :returns: an array of shape (N, 2) of the (lon, lat) pairs reached, with
+        the longitudes normalized to [-180, 180], and an array of shape (N,)
+        of the azimuths at those points
+    """
+    starts = np.asarray(starts, dtype=np.float64)[..., :2]
+    lon1 = np.radians(starts[..., 0])
+    alpha1 = np.radians(np.asarray(azimuths, dtype=np.float64))
+    distances = np.asarray(distances, dtype=np.float64)
+
+    sin_u1, cos_u1 = _reduced_latitude(np.radians(starts[..., 1]))
+    sin_alpha1, cos_alpha1 = np.sin(alpha1), np.cos(alpha1)
+    sigma1 = np.arctan2(sin_u1, cos_u1 * cos_alpha1)
+    sin_alpha = cos_u1 * sin_alpha1
+    cos2_alpha = 1 - sin_alpha**2
+
+    first_sigma = distances / (SEMI_MINOR_AXIS_METERS * _series_a(cos2_alpha))
+    sigma = first_sigma
+    for _ in range(_MAX_ITERATIONS):
+        cos_2sigma_m = np.cos(2 * sigma1 + sigma)
+        sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+        new_sigma = first_sigma + _sigma_correction(cos2_alpha, sin_sigma, cos_sigma, cos_2sigma_m)
+        converged = np.all(np.abs(new_sigma - sigma) <= _EPSILON)
+        sigma = new_sigma
+        if converged:
+            break
+
+    cos_2sigma_m = np.cos(2 * sigma1 + sigma)
+    sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+    x = sin_u1 * sin_sigma - cos_u1 * cos_sigma * cos_alpha1
+    lat2 = np.arctan2(
+        sin_u1 * cos_sigma + cos_u1 * sin_sigma * cos_alpha1,
+        (1 - FLATTENING) * np.hypot(sin_alpha, x),
+    )
+    lam = np.arctan2(sin_sigma * sin_alpha1, cos_u1 * cos_sigma - sin_u1 * sin_sigma * cos_alpha1)
+    lon2 = lon1 + lam - _longitude_correction(sigma, sin_sigma, cos_sigma, sin_alpha, cos2_alpha, cos_2sigma_m)
+
+    lon2 = np.degrees(lon2)
+    lon2 = np.where(np.abs(lon2) > 180, (lon2 + 180) % 360 - 180, lon2)
+    points = np.stack((lon2, np.degrees(lat2)), axis=-1)
+
+    return points, np.degrees(np.arctan2(sin_alpha, -x))
+
+
+def _reduced_latitude(lat: FloatArray) -> tuple[FloatArray, FloatArray]:
+    """Get the sine and cosine of the reduced latitude."""
+    u = np.arctan((1 - FLATTENING) * np.tan(lat))
+    return np.sin(u), np.cos(u)
+
+
+def _longitude_correction(
+    sigma: FloatArray,
+    sin_sigma: FloatArray,
+    cos_sigma: FloatArray,
+    sin_alpha: FloatArray,
+    cos2_alpha: FloatArray,
+    cos_2sigma_m: FloatArray,
+) -> FloatArray:
+    """Get the difference between the longitude on the auxiliary sphere and
+    on the ellipsoid.
+    """
+    c = FLATTENING / 16 * cos2_alpha * (4 + FLATTENING * (4 - 3 * cos2_alpha))
+
+    return (
+        (1 - c)
+        * FLATTENING
+        * sin_alpha
+        * (sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m**2)))
+    )
+
+
+def _series_a(cos2_alpha: FloatArray) -> FloatArray:
+    u2 = _u_squared(cos2_alpha)
+    return 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+
+
+def _sigma_correction(
+    cos2_alpha: FloatArray,
+    sin_sigma: FloatArray,
+    cos_sigma: FloatArray,
+    cos_2sigma_m: FloatArray,
+) -> FloatArray:
+    u2 = _u_squared(cos2_alpha)
+    b = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+
+    return (
+        b
+        * sin_sigma
+        * (
+            cos_2sigma_m
+            + b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2sigma_m**2)
+                - b / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2sigma_m**2)
+            )
+        )
+    )
+
+
+def _u_squared(cos2_alpha: FloatArray) -> FloatArray:
+    return cos2_alpha * (SEMI_MAJOR_AXIS_METERS**2 - SEMI_MINOR_AXIS_METERS**2) / SEMI_MINOR_AXIS_METERS**2
@@ -0,0 +1,206 @@
+"""Descriptions of transformations that the pipeline can reason about.
+
+Transformations are plain callables, so on their own there is no way to tell
+whether two of them will do the same thing. Transformations created by this
+library are annotated with a `TransformationInfo` describing their name and
+configuration, which is used to compute a configuration fingerprint, and the
+`TransformationProperties` the pipeline planner relies on when reordering or
+merging transformations. Transformations may also declare a cheap, vectorized
+predicate telling which polygons they would actually change, so the pipeline
+can pass all other polygons through untouched, and a vectorized estimate of
+the work each polygon takes, which the parallel modes use to balance the load
+between workers. Custom transformations can be annotated the same way with
+`describe_transformation`.
+"""
+
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+from shapely.geometry import Polygon
+
+from geo_extensions.types import Transformation
+
+F = TypeVar("F", bound=Callable)
+
+Merge = Callable[[Transformation, Transformation], Transformation | None]
+Predicate = Callable[[Sequence[Polygon]], npt.NDArray[np.bool_]]
+CostEstimate = Callable[[Sequence[Polygon]], npt.NDArray[np.float64]]
+
+_INFO_ATTRIBUTE = "__geo_extensions_info__"
+
+
+@dataclass(frozen=True)
+class TransformationProperties:
+    """Guarantees that a transformation makes about its output.
+
+    Every property defaults to False, which is always a safe declaration.
+    """
+
+    # Yields exactly one polygon for every input polygon.
+    one_to_one: bool = False
+    # Maps every vertex independently, without adding, removing or reordering
+    # any vertices.
+    coordinate_wise: bool = False
+    # Gives the same result whether it is applied before or after
+    # `round_points`.
+    commutes_with_rounding: bool = False
+    # Applying the transformation to its own output does not change it.
+    idempotent: bool = False
+    # Never yields polygons with more vertices than the input polygon.
+    reduces_vertex_count: bool = False
+    # Names of other transformations that give the same result whether they
+    # are applied before or after this one.
+    commutes_with: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class TransformationInfo:
+    """Description of a transformation and the parameters it was created
+    with.
+    """
+
+    name: str
+    params: tuple[tuple[str, Hashable], ...] = ()
+    properties: TransformationProperties = TransformationProperties()
+    # Combine this transformation with the one following it into a single
+    # equivalent transformation, or return None if that isn't possible.
+    merge: Merge | None = field(default=None, compare=False)
+    # Compute for a batch of polygons which ones the transformation would
+    # change. Polygons it returns False for would be yielded unchanged.
+    applies: Predicate | None = field(default=None, compare=False)
+    # Estimate for a batch of polygons the relative work of transforming each
+    # one. Only the ratios between polygons matter.
+    cost: CostEstimate | None = field(default=None, compare=False)
+
+    @property
+    def fingerprint(self) -> str:
+        """A string that is equal for two transformations exactly when they
+        have the same name and configuration.
+        """
+        params = ", ".join(f"{key}={value!r}" for key, value in self.params)
+        return f"{self.name}({params})"
+
+    def param(self, key: str) -> Hashable:
+        """Get the value of a parameter by name.
+
+        :raises: KeyError
+        """
+        return dict(self.params)[key]
+
+
+def describe_transformation(
+    name: str,
+    *,
+    properties: TransformationProperties = TransformationProperties(),
+    merge: Merge | None = None,
+    applies: Predicate | None = None,
+    cost: CostEstimate | None = None,
+    **params: Hashable,
+) -> Callable[[F], F]:
+    """Create a decorator that attaches a `TransformationInfo` to a
+    transformation.
+
+    :param name: the name of the transformation, usually the name of the
+        public function or factory that created it.
+    :param properties: the guarantees the transformation makes, used by the
+        pipeline planner.
+    :param merge: a function combining the transformation with the one
+        following it, used by the pipeline planner.
+    :param applies: a vectorized predicate returning False for the polygons
+        that the transformation would yield unchanged. It must be much cheaper
+        than the transformation itself.
+    :param cost: a vectorized estimate of the relative work of transforming
+        each polygon, used to balance parallel work. Defaults to the vertex
+        count. It must be much cheaper than the transformation itself.
+    :param params: the configuration the transformation was created with. The
+        `repr` of each value becomes part of the fingerprint, so it should be
+        stable between runs.
+    :returns: a decorator returning the transformation unchanged
+    """
+    info = TransformationInfo(
+        name=name,
+        params=tuple(params.items()),
+        properties=properties,
+        merge=merge,
+        applies=applies,
+        cost=cost,
+    )
+
+    def decorator(transformation: F) -> F:
+        setattr(transformation, _INFO_ATTRIBUTE, info)
+        return transformation
+
+    return decorator
+
+
+def get_transformation_info(transformation: Transformation) -> TransformationInfo | None:
+    """Get the description attached to a transformation.
+
+    :returns: the attached info, or None if the transformation was not
+        described
+    """
+    info = getattr(transformation, _INFO_ATTRIBUTE, None)
+    if isinstance(info, TransformationInfo):
+        return info
+
+    return None
+
+
+def transformation_applies(
+    transformation: Transformation,
+    polygons: Sequence[Polygon],
+) -> npt.NDArray[np.bool_]:
+    """Check which polygons a transformation would change.
+
+    :returns: a boolean array which is False for the polygons that the
+        transformation is known to yield unchanged
+    """
+    info = get_transformation_info(transformation)
+    if info is None or info.applies is None:
+        return np.ones(len(polygons), dtype=np.bool_)
+
+    return info.applies(polygons)
+
+
+def transformation_costs(
+    transformation: Transformation,
+    polygons: Sequence[Polygon],
+) -> npt.NDArray[np.float64]:
+    """Estimate the relative work of applying a transformation to each
+    polygon.
+
+    :returns: an array of costs, the vertex counts of the polygons if the
+        transformation has no cost estimate
+    """
+    info = get_transformation_info(transformation)
+    if info is None or info.cost is None:
+        counts = shapely.get_num_coordinates(np.asarray(polygons, dtype=object))
+        return np.asarray(counts, dtype=np.float64).reshape(-1)
+
+    return np.asarray(info.cost(polygons), dtype=np.float64)
+
+
+def fingerprint(transformation: Transformation) -> str | None:
+    """Get the configuration fingerprint of a transformation.
+
+    Transformations that were not described are fingerprinted by their import
+    path if they are plain functions. Closures and other callables may depend
+    on state that can't be inspected, so they have no fingerprint.
+
+    :returns: the fingerprint, or None if it can't be determined
+    """
+    info = get_transformation_info(transformation)
+    if info is not None:
+        return info.fingerprint
+
+    module = getattr(transformation, "__module__", None)
+    qualname = getattr(transformation, "__qualname__", None)
+    closure = getattr(transformation, "__closure__", None)
+    if module is None or qualname is None or closure is not None or "<" in qualname:
+        return None
+
+    return f"{module}.{qualname}"
@@ -0,0 +1,94 @@
+"""Optimize a sequence of transformations before running it.
+
+The planner only relies on the `TransformationProperties` and merge functions
+declared through `describe_transformation`, so undescribed transformations are
+never moved and nothing is moved across them. Two kinds of rewrites are done
+until neither applies anymore:
+
+    - Merging: two adjacent transformations are replaced by one, either by the
+        merge function of the first one, or by dropping the second one when
+        both have the same fingerprint and are idempotent.
+    - Hoisting: a coordinate-wise, one-to-one transformation is moved in front
+        of a transformation it commutes with, as long as that transformation
+        is not itself coordinate-wise and does not reduce the vertex count.
+        For instance `drop_z_coordinate` is moved in front of
+        `densify_polygon`, so that it runs on fewer vertices and densify only
+        sees 2D data.
+"""
+
+from collections.abc import Sequence
+
+from geo_extensions.metadata import TransformationInfo, get_transformation_info
+from geo_extensions.types import Transformation
+
+ROUNDING = "round_points"
+
+
+def plan_transformations(transformations: Sequence[Transformation]) -> list[Transformation]:
+    """Rewrite a sequence of transformations into an equivalent sequence that
+    is cheaper to run.
+
+    :returns: the planned transformations
+    """
+    plan = list(transformations)
+
+    changed = True
+    while changed:
+        changed = False
+        i = 0
+        while i < len(plan) - 1:
+            first, second = plan[i], plan[i + 1]
+            first_info = get_transformation_info(first)
+            second_info = get_transformation_info(second)
+            if first_info is None or second_info is None:
+                i += 1
+                continue
+
+            merged = _merge(first, first_info, second, second_info)
+            if merged is not None:
+                plan[i] = merged
+                del plan[i + 1]
+                changed = True
+                continue
+
+            if _should_hoist(first_info, second_info):
+                plan[i], plan[i + 1] = second, first
+                changed = True
+
+            i += 1
+
+    return plan
+
+
+def _merge(
+    first: Transformation,
+    first_info: TransformationInfo,
+    second: Transformation,
+    second_info: TransformationInfo,
+) -> Transformation | None:
+    if first_info.merge is not None:
+        merged = first_info.merge(first, second)
+        if merged is not None:
+            return merged
+
+    if first_info.properties.idempotent and first_info.fingerprint == second_info.fingerprint:
+        return first
+
+    return None
+
+
+def _should_hoist(previous: TransformationInfo, info: TransformationInfo) -> bool:
+    if not (info.properties.coordinate_wise and info.properties.one_to_one):
+        return False
+
+    if previous.properties.coordinate_wise or previous.properties.reduces_vertex_count:
+        return False
+
+    return _commutes(previous, info) or _commutes(info, previous)
+
+
+def _commutes(info: TransformationInfo, other: TransformationInfo) -> bool:
+    if other.name in info.properties.commutes_with:
+        return True
+
+    return other.name == ROUNDING and info.properties.commutes_with_rounding
@@ -0,0 +1,348 @@
+"""Transfer of polygon batches to worker processes through shared memory.
+
+Pickling a shapely polygon serializes it to WKB, which is copied once into the
+pipe to the worker and once more out of it. For batches with millions of
+vertices that costs about as much as transforming them. Instead, the batch is
+flattened into a single shared memory block holding one coordinate array and
+the offsets of each ring, polygon and group in it. Only the small
+`SharedGroups` handle and the range of groups to work on are pickled, and the
+worker writes its results into a new block the same way.
+
+Transformations created by factories are closures, which can't be pickled.
+The workers of a `SharedMemoryExecutor` receive all transformations of the
+pipeline once when they start, and tasks refer to them by position. The
+workers are always started with the `fork` start method, which passes them
+without pickling, so process mode is only available on platforms that
+support it.
+
+A group is the list of polygons produced from one input polygon, as in
+`Transformer.transform_batch`.
+"""
+
+import multiprocessing
+import multiprocessing.context
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+from shapely.geometry import Polygon
+
+from geo_extensions.types import Transformation
+
+_Offsets = npt.NDArray[np.int64]
+
+# The polygons produced from one polygon, or the exception raised for it, and
+# the time it took in seconds
+TransformOutput = tuple[list[Polygon] | Exception, float]
+
+# The transformations of the pipeline, in each worker process
+_worker_transformations: tuple[Transformation, ...] = ()
+
+
+@dataclass(frozen=True)
+class SharedGroups:
+    """A handle to groups of polygons in a shared memory block.
+
+    The block holds, in order, the (x, y, z) coordinates, the offsets of each
+    ring into the coordinates, of each polygon into the rings and of each
+    group into the polygons, and a flag for each polygon telling if it has z
+    coordinates.
+    """
+
+    name: str
+    group_count: int
+    polygon_count: int
+    ring_count: int
+    coord_count: int
+
+    def load(self, start: int = 0, stop: int | None = None) -> list[list[Polygon]]:
+        """Copy a range of groups out of the block.
+
+        :raises: FileNotFoundError if the block was already released
+        """
+        memory = SharedMemory(self.name)
+        try:
+            coords, ring_offsets, polygon_offsets, group_offsets, has_z = self._arrays(memory)
+            end = None if stop is None else stop + 1
+            groups = _unflatten(coords, ring_offsets, polygon_offsets, group_offsets[start:end], has_z)
+            # The arrays must be released before the memory can be closed
+            del coords, ring_offsets, polygon_offsets, group_offsets, has_z
+        finally:
+            memory.close()
+
+        return groups
+
+    def release(self) -> None:
+        """Free the block. It can't be loaded afterwards."""
+        memory = SharedMemory(self.name)
+        memory.close()
+        memory.unlink()
+
+    def _arrays(
+        self,
+        memory: SharedMemory,
+    ) -> tuple[npt.NDArray[np.float64], _Offsets, _Offsets, _Offsets, npt.NDArray[np.bool_]]:
+        buffer, offset = memory.buf, 0
+        assert buffer is not None
+
+        def take(dtype: type, count: int) -> np.ndarray:
+            nonlocal offset
+            array: np.ndarray = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes
+            return array
+
+        coords = take(np.float64, 3 * self.coord_count).reshape(-1, 3)
+        ring_offsets = take(np.int64, self.ring_count + 1)
+        polygon_offsets = take(np.int64, self.polygon_count + 1)
+        group_offsets = take(np.int64, self.group_count + 1)
+        has_z = take(np.bool_, self.polygon_count)
+
+        return coords, ring_offsets, polygon_offsets, group_offsets, has_z
+
+
+def share_groups(groups: Sequence[Sequence[Polygon]]) -> SharedGroups:
+    """Copy groups of polygons into a new shared memory block.
+
+    The block stays allocated until `SharedGroups.release` is called.
+
+    :returns: the handle to the block
+    """
+    polygons = np.asarray([polygon for group in groups for polygon in group], dtype=object).reshape(-1)
+    rings, ring_polygon_index = shapely.get_rings(polygons, return_index=True)
+    coords, coord_ring_index = shapely.get_coordinates(rings, include_z=True, return_index=True)
+
+    arrays = (
+        np.asarray(coords, dtype=np.float64).reshape(-1),
+        _to_offsets(coord_ring_index, len(rings)),
+        _to_offsets(ring_polygon_index, len(polygons)),
+        np.concatenate(([0], np.cumsum([len(group) for group in groups], dtype=np.int64))).astype(np.int64),
+        np.asarray(shapely.has_z(polygons), dtype=np.bool_).reshape(-1),
+    )
+    # Shared memory blocks can't be empty
+    memory = SharedMemory(create=True, size=max(sum(array.nbytes for array in arrays), 1))
+    try:
+        buffer, offset = memory.buf, 0
+        assert buffer is not None
+        for array in arrays:
+            end = offset + array.nbytes
+            buffer[offset:end] = array.tobytes()
+            offset = end
+    finally:
+        memory.close()
+
+    return SharedGroups(
+        name=memory.name,
+        group_count=len(groups),
+        polygon_count=len(polygons),
+        ring_count=len(rings),
+        coord_count=len(coords),
+    )
+
+
+class SharedMemoryExecutor:
+    """A process pool transforming chunks of polygons passed through shared
+    memory.
+
+    :param processes: the number of worker processes
+    :param transformations: the transformations the workers should know. Any
+        other transformation is pickled with every chunk.
+    :raises: ValueError if the platform doesn't support the `fork` start
+        method
+    """
+
+    def __init__(self, processes: int, transformations: Sequence[Transformation]):
+        self._transformations = tuple(transformations)
+        self._pool = ProcessPoolExecutor(
+            processes,
+            mp_context=fork_context(),
+            initializer=_init_worker,
+            initargs=(self._transformations,),
+        )
+
+    def __enter__(self) -> "SharedMemoryExecutor":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    def map_chunks(
+        self,
+        transformation: Transformation,
+        chunks: Sequence[Sequence[Polygon]],
+        capture: bool = False,
+    ) -> list[list[TransformOutput]]:
+        """Apply a transformation to each polygon of each chunk.
+
+        All chunks are written to one block, so each worker only receives the
+        range of its chunk.
+
+        :param capture: return the exception raised for a polygon in place of
+            its results instead of raising it. The exception must be
+            picklable.
+        :returns: the transformed polygons of each input polygon and the time
+            it took, by chunk
+        """
+        key: Transformation | int = transformation
+        for i, known in enumerate(self._transformations):
+            if known is transformation:
+                key = i
+                break
+
+        shared = share_groups([[polygon] for chunk in chunks for polygon in chunk])
+        futures: list[Future[tuple[SharedGroups, dict[int, Exception], list[float]]]] = []
+        try:
+            start = 0
+            for chunk in chunks:
+                futures.append(
+                    self._pool.submit(_transform_shared, key, shared, start, start + len(chunk), capture),
+                )
+                start += len(chunk)
+
+            results = []
+            for future in futures:
+                output, errors, seconds = future.result()
+                groups: list[list[Polygon] | Exception] = list(output.load())
+                for i, error in errors.items():
+                    groups[i] = error
+                results.append(list(zip(groups, seconds)))
+
+            return results
+        finally:
+            shared.release()
+            # The results of chunks that finished before a failure must be
+            # freed as well
+            wait(futures)
+            for future in futures:
+                if not future.cancelled() and future.exception() is None:
+                    future.result()[0].release()
+
+
+def fork_context() -> multiprocessing.context.ForkContext:
+    """Get the `fork` start method, which passes the transformations to the
+    workers without pickling them, whatever the default start method is.
+
+    :raises: ValueError if the platform doesn't support it
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise ValueError("'processes' requires the 'fork' start method, which this platform doesn't support")
+
+    return multiprocessing.get_context("fork")
+
+
+def _init_worker(transformations: tuple[Transformation, ...]) -> None:
+    global _worker_transformations
+    _worker_transformations = transformations
+
+
+def _transform_shared(
+    transformation: Transformation | int,
+    shared: SharedGroups,
+    start: int,
+    stop: int,
+    capture: bool = False,
+) -> tuple[SharedGroups, dict[int, Exception], list[float]]:
+    """Apply a transformation to each polygon of a range of single polygon
+    groups, in a worker process.
+
+    :param transformation: the transformation, or its position in the
+        transformations the worker was started with
+    :param capture: catch the exceptions raised for each polygon, leaving
+        its group empty
+    :returns: the handle to a new block holding the results, one group per
+        input group, which the caller must release, the exceptions caught by
+        group index, and the time each group took
+    """
+    if isinstance(transformation, int):
+        transformation = _worker_transformations[transformation]
+
+    groups: list[list[Polygon]] = []
+    errors: dict[int, Exception] = {}
+    seconds: list[float] = []
+    for i, (polygon,) in enumerate(shared.load(start, stop)):
+        begin = time.perf_counter()
+        try:
+            groups.append(list(transformation(polygon)))
+        except Exception as e:
+            if not capture:
+                raise
+            groups.append([])
+            errors[i] = e
+        seconds.append(time.perf_counter() - begin)
+
+    return share_groups(groups), errors, seconds
+
+
+def _to_offsets(index: npt.NDArray[np.intp], count: int) -> _Offsets:
+    """Convert the parent index of each item into the offsets of the first
+    item of each parent.
+    """
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(index, minlength=count), out=offsets[1:])
+
+    return offsets
+
+
+def _unflatten(
+    coords: npt.NDArray[np.float64],
+    ring_offsets: _Offsets,
+    polygon_offsets: _Offsets,
+    group_offsets: _Offsets,
+    has_z: npt.NDArray[np.bool_],
+) -> list[list[Polygon]]:
+    """Create the polygons of a range of groups from the flattened arrays.
+
+    `group_offsets` covers only the groups to create, while the other arrays
+    cover the whole block.
+    """
+    if len(group_offsets) < 2:
+        return []
+
+    first_polygon, end_polygon = int(group_offsets[0]), int(group_offsets[-1])
+    first_ring, end_ring = int(polygon_offsets[first_polygon]), int(polygon_offsets[end_polygon])
+
+    polygon_stop, ring_stop = end_polygon + 1, end_ring + 1
+    first_coord, end_coord = ring_offsets[first_ring], ring_offsets[end_ring]
+
+    ring_polygon_index = np.repeat(
+        np.arange(end_polygon - first_polygon),
+        np.diff(polygon_offsets[first_polygon:polygon_stop]),
+    )
+    ring_has_z = has_z[first_polygon:end_polygon][ring_polygon_index]
+    ring_sizes = np.diff(ring_offsets[first_ring:ring_stop])
+    ring_coords = coords[first_coord:end_coord]
+
+    # 2D and 3D rings are created separately, as a NaN z coordinate would
+    # make the ring look unclosed
+    rings = np.empty(end_ring - first_ring, dtype=object)
+    coord_has_z = np.repeat(ring_has_z, ring_sizes)
+    for z in (False, True):
+        selected = ring_has_z == z
+        if selected.any():
+            dimensions = 3 if z else 2
+            rings[selected] = shapely.linearrings(
+                ring_coords[coord_has_z == z][:, :dimensions],
+                indices=np.repeat(np.arange(np.count_nonzero(selected)), ring_sizes[selected]),
+            )
+
+    # Polygons without rings are empty
+    polygons = np.array([Polygon() for _ in range(end_polygon - first_polygon)], dtype=object)
+    if len(rings):
+        shapely.polygons(rings, indices=ring_polygon_index, out=polygons)
+
+    polygon_list = polygons.tolist()
+    offsets = (group_offsets - first_polygon).tolist()
+    return [polygon_list[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
@@ -0,0 +1,261 @@
+"""Vectorized spherical geometry helpers.
+
+These work on whole arrays of coordinates at once using NumPy, and use the same
+spherical earth model as `pygeodesy.sphericalTrigonometry`, so they can be used
+to cheaply compute the same quantities for many points without constructing a
+`LatLon` for each of them.
+
+Coordinates are passed as arrays of shape (N, 2) holding (lon, lat) pairs in
+degrees, matching the order used by shapely.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from pygeodesy import R_M
+from shapely.geometry import LinearRing, Polygon
+
+EARTH_RADIUS_METERS = R_M
+
+FloatArray = npt.NDArray[np.float64]
+
+# Start and end points whose cross product is shorter than this are treated as
+# coincident or antipodal.
+DEGENERATE_NORM = 1e-12
+
+
+@dataclass(frozen=True)
+class GeodeticRings:
+    """The coordinates of the rings of a polygon, exterior first, together
+    with their unit vectors.
+
+    Converting coordinates to unit vectors takes several trigonometric
+    functions per vertex. The rings of a polygon are cached for as long as the
+    polygon is alive, and polygons created with `to_polygon` start out cached,
+    so consecutive geodetic stages only convert each vertex once. The cache
+    holds at most `MAX_CACHED_VERTICES` vertices, dropping the least recently
+    used rings first.
+
+    :param coords: an array of shape (N, 2) or (N, 3) for each ring
+    :param vectors: an array of shape (N, 3) of unit vectors for each ring
+    """
+
+    coords: tuple[FloatArray, ...]
+    vectors: tuple[FloatArray, ...]
+
+    @classmethod
+    def from_polygon(cls, polygon: Polygon) -> "GeodeticRings":
+        """Get the rings of a polygon, converting them if they aren't cached."""
+        return cls.from_polygons([polygon])[0]
+
+    @classmethod
+    def from_polygons(cls, polygons: Sequence[Polygon]) -> list["GeodeticRings"]:
+        """Get the rings of several polygons, converting the ones that aren't
+        cached all at once.
+        """
+        found: dict[int, GeodeticRings] = {}
+        for polygon in polygons:
+            cached = _RINGS.get(id(polygon))
+            if cached is not None:
+                found[id(polygon)] = cached
+        missing = {id(polygon): polygon for polygon in polygons if id(polygon) not in found}
+
+        if missing:
+            coords = [
+                # ruff hint
+                [np.asarray(ring.coords, dtype=np.float64) for ring in _rings(polygon)]
+                for polygon in missing.values()
+            ]
+            flat = [ring for rings in coords for ring in rings]
+            vectors = np.split(
+                to_unit_vectors(np.concatenate([ring[:, :2] for ring in flat])) if flat else np.empty((0, 3)),
+                np.cumsum([len(ring) for ring in flat])[:-1],
+            )
+
+            offset = 0
+            for (key, polygon), polygon_coords in zip(missing.items(), coords):
+                end = offset + len(polygon_coords)
+                rings = cls(tuple(polygon_coords), tuple(vectors[offset:end]))
+                rings._cache(polygon)
+                found[key] = rings
+                offset = end
+
+        return [found[id(polygon)] for polygon in polygons]
+
+    def to_polygon(self) -> Polygon:
+        """Create a polygon from the rings, which starts out cached."""
+        if not self.coords:
+            return Polygon()
+
+        shell, *holes = self.coords
+        polygon = Polygon(shell=shell, holes=holes)
+        self._cache(polygon)
+
+        return polygon
+
+    def _cache(self, polygon: Polygon) -> None:
+        key = id(polygon)
+        if _RINGS.put(key, self):
+            weakref.finalize(polygon, _RINGS.discard, key)
+
+    @property
+    def vertex_count(self) -> int:
+        return sum(len(ring) for ring in self.coords)
+
+
+class _RingCache:
+    """The rings of live polygons by the id of the polygon, holding at most
+    `MAX_CACHED_VERTICES` vertices.
+    """
+
+    def __init__(self) -> None:
+        self._rings: OrderedDict[int, GeodeticRings] = OrderedDict()
+        self._vertices = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._rings
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    def get(self, key: int) -> GeodeticRings | None:
+        with self._lock:
+            rings = self._rings.get(key)
+            if rings is not None:
+                self._rings.move_to_end(key)
+
+        return rings
+
+    def put(self, key: int, rings: GeodeticRings) -> bool:
+        """Cache the rings of a polygon, dropping the least recently used
+        rings to make room.
+
+        :returns: whether the rings were cached
+        """
+        if rings.vertex_count > MAX_CACHED_VERTICES:
+            return False
+
+        with self._lock:
+            self._discard(key)
+            self._rings[key] = rings
+            self._vertices += rings.vertex_count
+            while self._vertices > MAX_CACHED_VERTICES:
+                _, dropped = self._rings.popitem(last=False)
+                self._vertices -= dropped.vertex_count
+
+        return True
+
+    def discard(self, key: int) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: int) -> None:
+        rings = self._rings.pop(key, None)
+        if rings is not None:
+            self._vertices -= rings.vertex_count
+
+
+# Up to about 100 MB of coordinates and unit vectors
+MAX_CACHED_VERTICES = 2_000_000
+
+_RINGS = _RingCache()
+
+
+def _rings(polygon: Polygon) -> list[LinearRing]:
+    if polygon.is_empty:
+        return []
+
+    return [polygon.exterior, *polygon.interiors]
+
+
+def to_unit_vectors(coords: npt.ArrayLike) -> FloatArray:
+    """Convert (lon, lat) coordinates to unit vectors on the sphere.
+
+    :param coords: array of shape (N, 2) with (lon, lat) pairs in degrees
+    :returns: array of shape (N, 3) of earth-centered unit vectors
+    """
+    radians = np.radians(np.asarray(coords, dtype=np.float64)[..., :2])
+    lon, lat = radians[..., 0], radians[..., 1]
+    cos_lat = np.cos(lat)
+
+    return np.stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1)
+
+
+def from_unit_vectors(vectors: FloatArray) -> FloatArray:
+    """Convert unit vectors on the sphere to (lon, lat) coordinates.
+
+    :param vectors: array of shape (N, 3) of earth-centered unit vectors
+    :returns: array of shape (N, 2) with (lon, lat) pairs in degrees
+    """
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+
+    return np.degrees(np.stack((np.arctan2(y, x), np.arctan2(z, np.hypot(x, y))), axis=-1))
+
+
+def cross_track_distances(
+    points: FloatArray,
+    starts: FloatArray,
+    ends: FloatArray,
+    radius: float = EARTH_RADIUS_METERS,
+) -> FloatArray:
+    """Compute the unsigned distance from each point to the great circle
+    through the corresponding start and end points.
+
+    The great circle through two coincident points is taken to be the meridian
+    through them, mirroring pygeodesy. The great circle through two antipodal
+    points is undefined, so the distance is reported as infinite.
+
+    :param points: array of shape (N, 3) of unit vectors
+    :param starts: array of shape (N, 3) of unit vectors
+    :param ends: array of shape (N, 3) of unit vectors
+    :param radius: the radius of the sphere
+    :returns: array of shape (N,) of distances in the units of `radius`
+    """
+    normals = np.cross(starts, ends)
+    norms = np.linalg.norm(normals, axis=-1)
+
+    degenerate = norms < DEGENERATE_NORM
+    coincident = degenerate & (np.einsum("ij,ij->i", starts, ends) > 0)
+    # The normal of the meridian plane is the local east vector
+    normals[coincident] = np.stack(
+        (-starts[coincident, 1], starts[coincident, 0], np.zeros(np.count_nonzero(coincident))),
+        axis=-1,
+    )
+    norms[coincident] = np.linalg.norm(normals[coincident], axis=-1)
+    # The east vector is undefined at the poles, where every great circle
+    # through the point is a meridian
+    at_pole = coincident & (norms == 0)
+    normals[at_pole] = (1.0, 0.0, 0.0)
+    norms[at_pole] = 1.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sines = np.einsum("ij,ij->i", points, normals) / norms
+
+    distances = radius * np.arcsin(np.clip(np.abs(sines), 0.0, 1.0))
+    distances[degenerate & ~coincident] = np.inf
+
+    return distances
+
+
+def angular_distances(
+    starts: FloatArray,
+    ends: FloatArray,
+    radius: float = EARTH_RADIUS_METERS,
+) -> FloatArray:
+    """Compute the great circle distance between corresponding points.
+
+    :param starts: array of shape (N, 3) of unit vectors
+    :param ends: array of shape (N, 3) of unit vectors, or a single vector
+    :param radius: the radius of the sphere
+    :returns: array of shape (N,) of distances in the units of `radius`
+    """
+    sines = np.linalg.norm(np.cross(starts, ends), axis=-1)
+    cosines = np.einsum("...j,...j->...", starts, ends)
+
+    return np.asarray(radius * np.arctan2(sines, cosines))
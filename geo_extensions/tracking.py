@@ -0,0 +1,490 @@
+"""Diagnostics of the time and memory a transformation pipeline uses.
+
+A latency spike in production usually comes from a handful of unusual inputs,
+like a footprint with thousands of vertices wrapping around a pole. A
+`SlowInputTracker` given to a `Transformer` keeps the slowest inputs it has
+seen, with the time spent in each stage and the number of vertices each stage
+produced, without storing anything about the other inputs. The tracked inputs
+can be written to a file and loaded again as a corpus for reproducing the
+problem or for benchmarking.
+
+Densifying can multiply the vertex count of a polygon many times over.
+`MemoryDiagnostics` records for each stage the peak memory it allocated and
+the largest polygon it produced, to tell which stage drives the memory use of
+a pipeline.
+
+`StageProfiler` runs each stage under a profiler and keeps separate
+statistics for every stage, in the `pstats` format understood by tools like
+snakeviz.
+"""
+
+import cProfile
+import heapq
+import importlib.util
+import itertools
+import json
+import marshal
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import shapely
+from shapely.geometry import Polygon
+
+from geo_extensions.metadata import fingerprint, get_transformation_info
+from geo_extensions.types import Transformation
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """The time a stage spent on one input and the vertices it produced.
+
+    :param stage: the fingerprint of the transformation, or its name if it
+        has none
+    :param seconds: the time spent transforming the polygons of the input
+    :param vertices: the number of vertices of all polygons after the stage
+    """
+
+    stage: str
+    seconds: float
+    vertices: int
+
+
+@dataclass(frozen=True)
+class SlowInput:
+    """An input polygon and how long the pipeline took for it.
+
+    :param wkb: the input polygon as WKB, including z coordinates
+    :param seconds: the total time spent on the input
+    :param stages: the timing of each stage, in order
+    """
+
+    wkb: bytes
+    seconds: float
+    stages: tuple[StageTiming, ...]
+
+    @property
+    def polygon(self) -> Polygon:
+        return cast(Polygon, shapely.from_wkb(self.wkb))
+
+    @property
+    def output_vertices(self) -> int:
+        """The number of vertices the pipeline produced for the input."""
+        return self.stages[-1].vertices if self.stages else int(shapely.get_num_coordinates(self.polygon))
+
+
+class SlowInputTracker:
+    """Keep the `size` slowest inputs of the transformers it is given to.
+
+    The tracker may be shared between transformers and threads.
+
+    :param size: the number of inputs to keep
+    """
+
+    def __init__(self, size: int = 10):
+        if size < 1:
+            raise ValueError("'size' must be at least 1")
+
+        self.size = size
+        # A min heap, so the fastest kept input is replaced first. The counter
+        # breaks ties without comparing inputs.
+        self._heap: list[tuple[float, int, SlowInput]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def record(
+        self,
+        polygons: Sequence[Polygon],
+        transformations: Sequence[Transformation],
+        seconds: npt.NDArray[np.float64],
+        vertices: npt.NDArray[np.int64],
+    ) -> None:
+        """Record a batch of inputs.
+
+        :param polygons: the input polygons
+        :param transformations: the stages the polygons went through
+        :param seconds: an array of shape (stages, polygons) of the time each
+            stage spent on each input
+        :param vertices: an array of shape (stages, polygons) of the vertex
+            count of each input after each stage
+        """
+        if not len(polygons):
+            return
+
+        totals = seconds.sum(axis=0)
+        # Only the slowest inputs of the batch can make it into the heap
+        count = min(self.size, len(polygons))
+        candidates = np.argpartition(-totals, count - 1)[:count].tolist()
+
+        stages = [_stage_name(transformation) for transformation in transformations]
+        with self._lock:
+            for i in candidates:
+                total = float(totals[i])
+                if len(self._heap) == self.size and total <= self._heap[0][0]:
+                    continue
+
+                slow_input = SlowInput(
+                    wkb=shapely.to_wkb(polygons[i], output_dimension=3),
+                    seconds=total,
+                    stages=tuple(
+                        StageTiming(stage, float(seconds[j, i]), int(vertices[j, i])) for j, stage in enumerate(stages)
+                    ),
+                )
+                entry = (total, next(self._counter), slow_input)
+                if len(self._heap) < self.size:
+                    heapq.heappush(self._heap, entry)
+                else:
+                    heapq.heapreplace(self._heap, entry)
+
+    def slowest(self) -> list[SlowInput]:
+        """Get the tracked inputs, slowest first."""
+        with self._lock:
+            entries = sorted(self._heap, reverse=True)
+
+        return [slow_input for _, _, slow_input in entries]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+    def dump(self, path: str | os.PathLike[str]) -> None:
+        """Write the tracked inputs to a file, one JSON object per line,
+        slowest first.
+        """
+        lines = [
+            json.dumps(
+                {
+                    "wkb": slow_input.wkb.hex(),
+                    "seconds": slow_input.seconds,
+                    "stages": [
+                        {"stage": timing.stage, "seconds": timing.seconds, "vertices": timing.vertices}
+                        for timing in slow_input.stages
+                    ],
+                }
+            )
+            for slow_input in self.slowest()
+        ]
+        Path(path).write_text("".join(f"{line}\n" for line in lines))
+
+
+@dataclass(frozen=True)
+class StageMemory:
+    """The largest memory use seen for one stage.
+
+    :param stage: the fingerprint of the transformation, or its name if it
+        has none. The input polygons are recorded as the stage "input".
+    :param traced_peak_bytes: the peak of the memory allocated by Python and
+        numpy while the stage ran, above what was allocated before it, or
+        None if tracemalloc was not used. GEOS allocations are not traced.
+    :param estimated_bytes: an estimate of the memory GEOS uses for the
+        coordinates of all polygons after the stage
+    :param largest_vertices: the vertex count of the largest polygon after
+        the stage
+    :param largest_wkb: the largest polygon after the stage as WKB
+    """
+
+    stage: str
+    traced_peak_bytes: int | None
+    estimated_bytes: int
+    largest_vertices: int
+    largest_wkb: bytes | None
+
+    @property
+    def largest_polygon(self) -> Polygon | None:
+        return None if self.largest_wkb is None else cast(Polygon, shapely.from_wkb(self.largest_wkb))
+
+
+class MemoryDiagnostics:
+    """Record the memory use of each stage of the transformers it is given
+    to, keeping the largest values seen for each stage over all runs.
+
+    tracemalloc slows down every allocation and traces all threads of the
+    process, so peaks measured while other work is running include that work.
+    Its peak is process-wide as well: while several runs are active at once,
+    for instance with `Transformer.transform_async`, the peak isn't reset
+    between stages, so the peak of a stage is an upper bound that may come
+    from another run or an earlier stage. Without tracing, only the estimates
+    from the vertex counts are recorded. Work done in worker processes is
+    never traced.
+
+    :param trace: measure the peak allocations of each stage with
+        tracemalloc. Tracing is started while any run is active if it isn't
+        running already.
+    """
+
+    # GEOS stores three doubles per vertex
+    BYTES_PER_VERTEX = 24
+
+    def __init__(self, trace: bool = True):
+        self.trace = trace
+        self._stages: dict[str, StageMemory] = {}
+        # The number of active runs, and whether they started tracing
+        self._runs = 0
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start_run(self) -> None:
+        """Start tracing, if enabled and not running already."""
+        with self._lock:
+            self._runs += 1
+            if self.trace and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+
+    def stop_run(self) -> None:
+        """Stop tracing when the last active run ends, if it was started by
+        `start_run`.
+        """
+        with self._lock:
+            self._runs -= 1
+            if self._runs == 0 and self._started:
+                tracemalloc.stop()
+                self._started = False
+
+    def start_stage(self) -> int | None:
+        """Reset the traced peak before a stage, unless other runs are
+        active.
+
+        :returns: the memory traced before the stage, to pass to `end_stage`
+        """
+        if not tracemalloc.is_tracing():
+            return None
+
+        with self._lock:
+            if self._runs <= 1:
+                tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+
+    def end_stage(
+        self,
+        transformation: Transformation | None,
+        groups: Sequence[Sequence[Polygon]],
+        traced_before: int | None,
+    ) -> None:
+        """Record the memory use of a stage and the polygons it produced.
+
+        :param transformation: the transformation of the stage, or None for
+            the input polygons
+        :param traced_before: the value returned by `start_stage`
+        """
+        traced_peak = None
+        if traced_before is not None and tracemalloc.is_tracing():
+            traced_peak = max(tracemalloc.get_traced_memory()[1] - traced_before, 0)
+
+        polygons = np.asarray([polygon for group in groups for polygon in group], dtype=object).reshape(-1)
+        counts = np.asarray(shapely.get_num_coordinates(polygons)).reshape(-1)
+        largest = int(np.argmax(counts)) if len(counts) else None
+
+        stage = "input" if transformation is None else _stage_name(transformation)
+        memory = StageMemory(
+            stage=stage,
+            traced_peak_bytes=traced_peak,
+            estimated_bytes=int(counts.sum()) * self.BYTES_PER_VERTEX,
+            largest_vertices=0 if largest is None else int(counts[largest]),
+            largest_wkb=None if largest is None else shapely.to_wkb(polygons[largest], output_dimension=3),
+        )
+
+        with self._lock:
+            previous = self._stages.get(stage)
+            if previous is not None:
+                memory = _max_memory(previous, memory)
+            self._stages[stage] = memory
+
+    def stages(self) -> list[StageMemory]:
+        """Get the largest memory use recorded for each stage, in the order
+        the stages were first seen.
+        """
+        with self._lock:
+            return list(self._stages.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+
+class StageProfiler:
+    """Profile each stage of the transformers it is given to separately.
+
+    Only the thread calling the transformer is profiled, so in the `threads`
+    and `processes` modes the statistics miss the transformations themselves
+    and mostly show the scheduling overhead. Profile in the serial mode to see
+    where the transformations spend their time.
+
+    Runs in several threads at once, like those of
+    `Transformer.transform_async`, are profiled separately and their
+    statistics are added together. From Python 3.12, only one `cProfile`
+    profiler can be active in the process, so a stage starting while a stage
+    of another run is profiled with `cProfile` is not profiled.
+
+    :param sampling: use the sampling profiler `pyinstrument`, which has a
+        much lower overhead than `cProfile` but doesn't count calls. By
+        default it is used if it is installed.
+    :param interval: the sampling interval in seconds
+    """
+
+    def __init__(self, sampling: bool | None = None, interval: float = 0.001):
+        if sampling is None:
+            sampling = importlib.util.find_spec("pyinstrument") is not None
+
+        self.sampling = sampling
+        self.interval = interval
+        self._stats: dict[str, pstats.Stats] = {}
+        self._names: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def start_stage(self) -> Any:
+        """Start profiling a stage in the current thread.
+
+        :returns: the profiler of the stage, to pass to `end_stage`, or None
+            if another profiler is active
+        """
+        if self.sampling:
+            from pyinstrument import Profiler
+
+            sampler = Profiler(interval=self.interval)
+            sampler.start()
+            return sampler
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+
+        return profiler
+
+    def end_stage(self, transformation: Transformation, profiler: Any) -> None:
+        """Stop profiling a stage and add the statistics to those of the
+        transformation.
+
+        :param profiler: the value returned by `start_stage`
+        """
+        if profiler is None:
+            return
+
+        if self.sampling:
+            from pyinstrument.renderers import PstatsRenderer
+
+            profiler.stop()
+            data = profiler.output(PstatsRenderer()).encode("utf-8", errors="surrogateescape")
+            raw = marshal.loads(data)
+            # Stages too short to be sampled have no statistics, which
+            # `pstats.Stats` refuses to load
+            stats = pstats.Stats(cast(cProfile.Profile, _RawStats(raw))) if raw else pstats.Stats()
+        else:
+            profiler.disable()
+            stats = pstats.Stats(profiler)
+
+        stage = _stage_name(transformation)
+        with self._lock:
+            if stage in self._stats:
+                self._stats[stage].add(stats)
+            else:
+                self._stats[stage] = stats
+                self._names[stage] = _file_name(transformation)
+
+    def stats(self) -> dict[str, pstats.Stats]:
+        """Get the statistics of each stage, by stage fingerprint, in the
+        order the stages were first seen.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def dump(self, directory: str | os.PathLike[str]) -> list[Path]:
+        """Write the statistics of each stage, and of all stages combined as
+        `pipeline.prof`, to a directory. Each file can be read with
+        `pstats.Stats`.
+
+        :returns: the paths of the written files, the combined file last
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            stages = list(self._stats.items())
+            names = dict(self._names)
+
+        paths = []
+        combined = pstats.Stats()
+        for i, (stage, stats) in enumerate(stages):
+            file_path = path / f"{i:02d}-{names[stage]}.prof"
+            stats.dump_stats(file_path)
+            combined.add(stats)
+            paths.append(file_path)
+
+        combined.dump_stats(path / "pipeline.prof")
+        paths.append(path / "pipeline.prof")
+
+        return paths
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._names.clear()
+
+
+class _RawStats:
+    """Statistics in the `pstats` format that `pstats.Stats` can load like
+    those of a profiler.
+    """
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def load_slow_inputs(path: str | os.PathLike[str]) -> list[SlowInput]:
+    """Read inputs written by `SlowInputTracker.dump`."""
+    slow_inputs = []
+    for line in Path(path).read_text().splitlines():
+        if not line:
+            continue
+
+        obj = json.loads(line)
+        slow_inputs.append(
+            SlowInput(
+                wkb=bytes.fromhex(obj["wkb"]),
+                seconds=obj["seconds"],
+                stages=tuple(StageTiming(**stage) for stage in obj["stages"]),
+            )
+        )
+
+    return slow_inputs
+
+
+def _max_memory(a: StageMemory, b: StageMemory) -> StageMemory:
+    """Combine the records of a stage from two runs."""
+    largest = a if a.largest_vertices >= b.largest_vertices else b
+    traced = [peak for peak in (a.traced_peak_bytes, b.traced_peak_bytes) if peak is not None]
+
+    return StageMemory(
+        stage=a.stage,
+        traced_peak_bytes=max(traced) if traced else None,
+        estimated_bytes=max(a.estimated_bytes, b.estimated_bytes),
+        largest_vertices=largest.largest_vertices,
+        largest_wkb=largest.largest_wkb,
+    )
+
+
+def _stage_name(transformation: Transformation) -> str:
+    return fingerprint(transformation) or str(getattr(transformation, "__qualname__", repr(transformation)))
+
+
+def _file_name(transformation: Transformation) -> str:
+    info = get_transformation_info(transformation)
+    name = info.name if info is not None else getattr(transformation, "__name__", type(transformation).__name__)
+
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
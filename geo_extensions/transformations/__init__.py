@@ -36,6 +36,8 @@ CMR additional requirements.
 
 from geo_extensions.transformations.cartesian import (
     simplify_polygon,
+    simplify_polygon_to_vertex_count,
+    simplify_polygons_to_vertex_count,
     split_polygon_on_antimeridian_ccw,
     split_polygon_on_antimeridian_fixed_size,
 )
@@ -44,14 +46,26 @@ from geo_extensions.transformations.general import (
     reverse_polygon,
     round_points,
 )
-from geo_extensions.transformations.geodetic import densify_polygon
+from geo_extensions.transformations.geodetic import (
+    EdgeCache,
+    VertexBudgetExceeded,
+    densify_polygon,
+    densify_polygon_by_length,
+    simplify_polygon_geodetic,
+)
 
 __all__ = (
     "densify_polygon",
+    "densify_polygon_by_length",
     "drop_z_coordinate",
+    "EdgeCache",
     "reverse_polygon",
     "round_points",
     "simplify_polygon",
+    "simplify_polygon_geodetic",
+    "simplify_polygon_to_vertex_count",
+    "simplify_polygons_to_vertex_count",
     "split_polygon_on_antimeridian_ccw",
     "split_polygon_on_antimeridian_fixed_size",
+    "VertexBudgetExceeded",
 )
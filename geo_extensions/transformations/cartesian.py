@@ -11,8 +11,15 @@ CMR+Data+Partner+User+Guide#CMRDataPartnerUserGuide-CartesianCoordinateSystem>
 This module contains helpers to fulfill the cartesian system CMR requirements.
 """
 
+import functools
+import heapq
+import itertools
+from collections.abc import Sequence
 from typing import cast
 
+import numpy as np
+import numpy.typing as npt
+import shapely
 import shapely.ops
 from shapely.geometry import LineString, Polygon
 from shapely.geometry.polygon import orient
@@ -20,7 +27,10 @@ from shapely.geometry.polygon import orient
 from geo_extensions.checks import (
     polygon_crosses_antimeridian_ccw,
     polygon_crosses_antimeridian_fixed_size,
+    polygons_cross_antimeridian_ccw,
+    polygons_cross_antimeridian_fixed_size,
 )
+from geo_extensions.metadata import TransformationProperties, describe_transformation
 from geo_extensions.types import Transformation, TransformationResult
 
 ANTIMERIDIAN = LineString([(180, 90), (180, -90)])
@@ -32,6 +42,16 @@ def simplify_polygon(tolerance: float, preserve_topology: bool = True) -> Transf
     :returns: a callable transformation using the passed parameters
     """
 
+    @describe_transformation(
+        "simplify_polygon",
+        properties=TransformationProperties(
+            one_to_one=True,
+            reduces_vertex_count=True,
+            commutes_with=frozenset({"drop_z_coordinate"}),
+        ),
+        tolerance=tolerance,
+        preserve_topology=preserve_topology,
+    )
     def simplify(polygon: Polygon) -> TransformationResult:
         """Perform a shapely simplify operation on the polygon."""
         # NOTE(reweeden): I have been unable to produce a situation where a
@@ -47,6 +67,127 @@ def simplify_polygon(tolerance: float, preserve_topology: bool = True) -> Transf
     return simplify
 
 
+def simplify_polygon_to_vertex_count(
+    max_vertices: int,
+    preserve_topology: bool = True,
+) -> Transformation:
+    """CARTESIAN: Create a transformation that simplifies polygons with more
+    than a maximum number of vertices, using the smallest tolerance that gets
+    them under the limit.
+
+    See `simplify_polygons_to_vertex_count` for details.
+
+    :param max_vertices: the maximum number of vertices, summed over all rings
+        and including closure points. Must be at least 4.
+    :returns: a callable transformation using the passed parameters
+    """
+    if max_vertices < 4:
+        raise ValueError("'max_vertices' must be at least 4")
+
+    @describe_transformation(
+        "simplify_polygon_to_vertex_count",
+        properties=TransformationProperties(
+            one_to_one=True,
+            idempotent=True,
+            reduces_vertex_count=True,
+            commutes_with=frozenset({"drop_z_coordinate"}),
+        ),
+        applies=functools.partial(_exceeds_vertex_count, max_vertices=max_vertices),
+        max_vertices=max_vertices,
+        preserve_topology=preserve_topology,
+    )
+    def simplify(polygon: Polygon) -> TransformationResult:
+        """Simplify the polygon until it has at most `max_vertices` vertices."""
+        yield from simplify_polygons_to_vertex_count(
+            [polygon],
+            max_vertices,
+            preserve_topology=preserve_topology,
+        )
+
+    return simplify
+
+
+def simplify_polygons_to_vertex_count(
+    polygons: Sequence[Polygon],
+    max_vertices: int,
+    preserve_topology: bool = True,
+) -> list[Polygon]:
+    """CARTESIAN: Simplify a batch of polygons so that each one has at most a
+    maximum number of vertices.
+
+    Instead of trying tolerances one by one, the Douglas-Peucker importance of
+    every vertex is computed once, which is the largest tolerance at which the
+    vertex survives simplification. The tolerances at which the result can
+    change lie between those importances, and the one predicted to keep
+    exactly the allowed number of vertices is tried for all polygons in a
+    single vectorized call, together with the next smaller one. GEOS may also
+    drop the start point of a ring, or keep more vertices to preserve
+    topology, so when the prediction is off a binary search over the
+    candidate tolerances finds the smallest one that fits for that polygon.
+
+    Simplification never empties a polygon. Polygons that can't be simplified
+    below the limit, for instance because of their holes or because GEOS
+    would collapse them, are simplified as far as possible.
+
+    :param max_vertices: the maximum number of vertices, summed over all rings
+        and including closure points. Must be at least 4.
+    :returns: the simplified polygons in the same order as the input
+    """
+    if max_vertices < 4:
+        raise ValueError("'max_vertices' must be at least 4")
+
+    results = list(polygons)
+    over_indices = np.flatnonzero(_exceeds_vertex_count(results, max_vertices))
+    if len(over_indices) == 0:
+        return results
+
+    over = np.asarray([results[i] for i in over_indices], dtype=object)
+    rings = [_ring_coordinates(polygon) for polygon in over]
+    # GEOS may drop the start point of each ring, so a few more vertices than
+    # predicted are ranked
+    counts = [_needed_count(polygon_rings, max_vertices) + 2 * len(polygon_rings) + 1 for polygon_rings in rings]
+    candidates = [
+        _tolerance_candidates(polygon_rings, max_vertices, count) for polygon_rings, count in zip(rings, counts)
+    ]
+    predicted, fits = _simplify_within(
+        over,
+        [tolerances[start] for tolerances, start, _ in candidates],
+        max_vertices,
+        preserve_topology,
+    )
+    _, smaller_fits = _simplify_within(
+        over,
+        [tolerances[max(start - 1, 0)] for tolerances, start, _ in candidates],
+        max_vertices,
+        preserve_topology,
+    )
+
+    for k, i in enumerate(over_indices):
+        tolerances, start, complete = candidates[k]
+        if fits[k] and start > 0 and not smaller_fits[k]:
+            results[i] = cast(Polygon, predicted[k])
+        elif fits[k]:
+            results[i] = _search_smaller_tolerance(
+                over[k],
+                rings[k],
+                counts[k],
+                tolerances,
+                start,
+                cast(Polygon, predicted[k]),
+                complete,
+                max_vertices,
+                preserve_topology,
+            )
+        else:
+            results[i] = _search_larger_tolerance(over[k], tolerances, start + 1, max_vertices, preserve_topology)
+
+    return results
+
+
+@describe_transformation(
+    "split_polygon_on_antimeridian_ccw",
+    applies=polygons_cross_antimeridian_ccw,
+)
 def split_polygon_on_antimeridian_ccw(polygon: Polygon) -> TransformationResult:
     """CARTESIAN: Perform adjustment when the polygon crosses the antimeridian
     and is known to be wound in counter clockwise order.
@@ -87,6 +228,14 @@ def split_polygon_on_antimeridian_fixed_size(
     :returns: a callable transformation using the passed parameters
     """
 
+    @describe_transformation(
+        "split_polygon_on_antimeridian_fixed_size",
+        applies=functools.partial(
+            polygons_cross_antimeridian_fixed_size,
+            min_lon_extent=min_lon_extent,
+        ),
+        min_lon_extent=min_lon_extent,
+    )
     def split(polygon: Polygon) -> TransformationResult:
         if not polygon_crosses_antimeridian_fixed_size(polygon, min_lon_extent):
             yield polygon
@@ -101,6 +250,277 @@ def split_polygon_on_antimeridian_fixed_size(
     return split
 
 
+def _exceeds_vertex_count(polygons: Sequence[Polygon], max_vertices: int) -> npt.NDArray[np.bool_]:
+    return shapely.get_num_coordinates(np.asarray(polygons, dtype=object)) > max_vertices
+
+
+def _ring_coordinates(polygon: Polygon) -> list[npt.NDArray[np.float64]]:
+    return [shapely.get_coordinates(ring) for ring in (polygon.exterior, *polygon.interiors)]
+
+
+def _tolerance_candidates(
+    rings: list[npt.NDArray[np.float64]],
+    max_vertices: int,
+    count: int,
+) -> tuple[npt.NDArray[np.float64], int, bool]:
+    """Find the tolerances at which simplifying a polygon may give different
+    results, from the ranking of its `count` most important vertices.
+
+    :param count: the number of vertices to rank
+    :returns: increasing tolerances, the index of the smallest one that is
+        predicted to leave at most `max_vertices` vertices, and whether the
+        tolerances cover all vertices. If they don't, smaller tolerances are
+        left out.
+    """
+    needed = _needed_count(rings, max_vertices)
+    ranked, ring_indices, vertex_indices = _ranked_importance(rings, count)
+    complete = len(ranked) == sum(max(len(coords) - 2, 0) for coords in rings)
+    if len(ranked) == 0:
+        return np.zeros(1), 0, complete
+
+    # A vertex survives any tolerance below its importance. Tolerances are
+    # placed halfway between the levels at which the result changes, so that
+    # floating point differences to GEOS don't matter.
+    levels = np.unique(np.concatenate((ranked, _start_point_distances(rings, ranked, ring_indices, vertex_indices))))
+    tolerances = np.append((levels[1:] + levels[:-1]) / 2, levels[-1] * 2 + 1)
+    if not complete:
+        # Tolerances below the ranked vertices would miss the levels of the
+        # vertices that weren't ranked
+        tolerances = tolerances[tolerances > ranked[-1]]
+    if needed <= 0 or len(ranked) < needed:
+        return tolerances, len(tolerances) - 1, complete
+
+    # Keeping the `max_vertices` most important vertices means dropping the
+    # next one in line, and every vertex that is as important.
+    return tolerances, int(np.searchsorted(tolerances, ranked[needed - 1])), complete
+
+
+def _needed_count(rings: list[npt.NDArray[np.float64]], max_vertices: int) -> int:
+    """The number of ranked vertices up to the first one that has to be
+    dropped to keep at most `max_vertices` vertices.
+    """
+    # The ranking keeps the end points of each ring
+    fixed = sum(min(len(coords), 2) for coords in rings)
+    return max_vertices - fixed + 1
+
+
+def _ranked_importance(
+    rings: list[npt.NDArray[np.float64]],
+    count: int,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """Compute the importance of the `count` most important vertices that are
+    not ring end points, in decreasing order.
+
+    The importance of a vertex is the largest Douglas-Peucker tolerance at
+    which it is kept. The vertex chosen to split a segment doesn't depend on
+    the tolerance, only whether the split happens does. So a vertex is kept
+    exactly when its own distance, and that of every vertex that split the
+    segments containing it, is greater than the tolerance. Splitting the
+    segments in order of importance therefore ranks the vertices, and only
+    the splits needed to rank `count` vertices are ever computed.
+
+    :returns: the importances, and the ring and index in the ring of each
+        vertex
+    """
+    heap: list[tuple[float, int, int, int, int, int]] = []
+    counter = itertools.count()
+
+    def push(ring: int, start: int, end: int, parent_importance: float) -> None:
+        if end - start < 2:
+            return
+
+        coords = rings[ring]
+        distances = _segment_distances(coords[start:end][1:], coords[start], coords[end])
+        split = int(np.argmax(distances))
+        importance = min(float(distances[split]), parent_importance)
+        heapq.heappush(heap, (-importance, next(counter), ring, start, end, start + 1 + split))
+
+    for ring, coords in enumerate(rings):
+        push(ring, 0, len(coords) - 1, np.inf)
+
+    ranked: list[tuple[float, int, int]] = []
+    while heap and len(ranked) < count:
+        negative_importance, _, ring, start, end, split = heapq.heappop(heap)
+        ranked.append((-negative_importance, ring, split))
+        push(ring, start, split, -negative_importance)
+        push(ring, split, end, -negative_importance)
+
+    importances, ring_indices, vertex_indices = zip(*ranked) if ranked else ((), (), ())
+    return (
+        np.array(importances, dtype=np.float64),
+        np.array(ring_indices, dtype=np.intp),
+        np.array(vertex_indices, dtype=np.intp),
+    )
+
+
+def _start_point_distances(
+    rings: list[npt.NDArray[np.float64]],
+    ranked: npt.NDArray[np.float64],
+    ring_indices: npt.NDArray[np.intp],
+    vertex_indices: npt.NDArray[np.intp],
+) -> npt.NDArray[np.float64]:
+    """Compute the tolerances at which GEOS drops the start point of a ring.
+
+    After simplifying a ring, GEOS drops its start point if it is within the
+    tolerance of the segment between its remaining neighbours. The neighbours
+    can change with every vertex added to the ranking, and a distance only
+    matters if it is below the importance of the vertex that was added.
+    """
+    first = [len(coords) - 1 for coords in rings]
+    last = [0] * len(rings)
+    starts, lefts, rights, highs = [], [], [], []
+    for ring, vertex, importance in zip(ring_indices.tolist(), vertex_indices.tolist(), ranked.tolist()):
+        first[ring] = min(first[ring], vertex)
+        last[ring] = max(last[ring], vertex)
+        if first[ring] < last[ring]:
+            coords = rings[ring]
+            starts.append(coords[0])
+            lefts.append(coords[last[ring]])
+            rights.append(coords[first[ring]])
+            highs.append(importance)
+
+    if not starts:
+        return np.zeros(0)
+
+    start, left, right = np.asarray(starts), np.asarray(lefts), np.asarray(rights)
+    segment = right - left
+    length_squared = np.einsum("ij,ij->i", segment, segment)
+    fractions = np.clip(
+        np.einsum("ij,ij->i", start - left, segment) / np.where(length_squared == 0, 1, length_squared),
+        0.0,
+        1.0,
+    )
+    distances = np.linalg.norm(start - left - fractions[:, np.newaxis] * segment, axis=1)
+
+    return distances[distances < np.asarray(highs)]
+
+
+def _segment_distances(
+    points: npt.NDArray[np.float64],
+    start: npt.NDArray[np.float64],
+    end: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    segment = end - start
+    offsets = points - start
+    length_squared = float(segment @ segment)
+    if length_squared == 0:
+        return np.asarray(np.linalg.norm(offsets, axis=1))
+
+    fractions = np.clip(offsets @ segment / length_squared, 0.0, 1.0)
+    return np.asarray(np.linalg.norm(offsets - fractions[:, np.newaxis] * segment, axis=1))
+
+
+def _simplify_within(
+    polygons: npt.NDArray[np.object_],
+    tolerances: Sequence[float],
+    max_vertices: int,
+    preserve_topology: bool,
+) -> tuple[npt.NDArray[np.object_], npt.NDArray[np.bool_]]:
+    """Simplify polygons with a tolerance each.
+
+    :returns: the simplified polygons, and whether each one has at most
+        `max_vertices` vertices without being empty
+    """
+    simplified = np.asarray(shapely.simplify(polygons, tolerances, preserve_topology=preserve_topology), dtype=object)
+    fits = (shapely.get_num_coordinates(simplified) <= max_vertices) & ~shapely.is_empty(simplified)
+
+    return simplified, np.asarray(fits, dtype=np.bool_)
+
+
+def _search_tolerance(
+    polygon: Polygon,
+    tolerances: npt.NDArray[np.float64],
+    low: int,
+    high: int,
+    max_vertices: int,
+    preserve_topology: bool,
+) -> tuple[int, Polygon] | None:
+    """Binary search for the smallest tolerance between the indices `low` and
+    `high` that simplifies the polygon to at most `max_vertices` vertices
+    without emptying it.
+
+    :returns: the index of the tolerance and the simplified polygon, or None
+        if no tolerance was found
+    """
+    best = None
+    while low <= high:
+        middle = (low + high) // 2
+        simplified = cast(
+            Polygon,
+            polygon.simplify(float(tolerances[middle]), preserve_topology=preserve_topology),
+        )
+        if not simplified.is_empty and shapely.get_num_coordinates(simplified) <= max_vertices:
+            best = (middle, simplified)
+            high = middle - 1
+        else:
+            low = middle + 1
+
+    return best
+
+
+def _search_smaller_tolerance(
+    polygon: Polygon,
+    rings: list[npt.NDArray[np.float64]],
+    count: int,
+    tolerances: npt.NDArray[np.float64],
+    index: int,
+    simplified: Polygon,
+    complete: bool,
+    max_vertices: int,
+    preserve_topology: bool,
+) -> Polygon:
+    """Search for a smaller tolerance than the one at `index`, which is known
+    to fit. When even the smallest candidate fits, more vertices are ranked to
+    find smaller candidates.
+
+    :param count: the number of vertices the tolerances were ranked from
+    """
+    while True:
+        found = _search_tolerance(polygon, tolerances, 0, index - 1, max_vertices, preserve_topology)
+        if found is not None:
+            index, simplified = found
+        if index > 0 or complete:
+            return simplified
+
+        tolerance = tolerances[index]
+        count *= 2
+        tolerances, _, complete = _tolerance_candidates(rings, max_vertices, count)
+        index = int(np.searchsorted(tolerances, tolerance))
+
+
+def _search_larger_tolerance(
+    polygon: Polygon,
+    tolerances: npt.NDArray[np.float64],
+    low: int,
+    max_vertices: int,
+    preserve_topology: bool,
+) -> Polygon:
+    """Search for the smallest tolerance from the index `low` on that fits, or
+    simplify the polygon as far as possible without emptying it.
+    """
+    found = _search_tolerance(polygon, tolerances, low, len(tolerances) - 1, max_vertices, preserve_topology)
+    if found is not None:
+        return found[1]
+
+    # The limit can't be reached, so find the largest tolerance that leaves
+    # something of the polygon
+    low, high = 0, len(tolerances) - 1
+    best = polygon
+    while low <= high:
+        middle = (low + high) // 2
+        simplified = cast(
+            Polygon,
+            polygon.simplify(float(tolerances[middle]), preserve_topology=preserve_topology),
+        )
+        if simplified.is_empty:
+            high = middle - 1
+        else:
+            best = simplified
+            low = middle + 1
+
+    return best
+
+
 def _shift_polygon(polygon: Polygon) -> Polygon:
     """Shift into [0, 360) range."""
 
@@ -2,18 +2,53 @@
 the polygons are using.
 """
 
+import operator
+from collections.abc import Sequence
 from typing import SupportsIndex
 
+import numpy as np
+import numpy.typing as npt
+import shapely
 from shapely.geometry import Polygon
 
+from geo_extensions.metadata import (
+    TransformationProperties,
+    describe_transformation,
+    get_transformation_info,
+)
 from geo_extensions.types import Transformation, TransformationResult
 
 
+@describe_transformation(
+    "reverse_polygon",
+    properties=TransformationProperties(
+        one_to_one=True,
+        commutes_with_rounding=True,
+        reduces_vertex_count=True,
+        commutes_with=frozenset({"drop_z_coordinate"}),
+    ),
+)
 def reverse_polygon(polygon: Polygon) -> TransformationResult:
     """Perform a shapely reverse operation on the polygon."""
     yield polygon.reverse()
 
 
+def _has_z(polygons: Sequence[Polygon]) -> npt.NDArray[np.bool_]:
+    return shapely.has_z(np.asarray(polygons, dtype=object))
+
+
+@describe_transformation(
+    "drop_z_coordinate",
+    properties=TransformationProperties(
+        one_to_one=True,
+        coordinate_wise=True,
+        commutes_with_rounding=True,
+        idempotent=True,
+        reduces_vertex_count=True,
+        commutes_with=frozenset({"densify_polygon", "reverse_polygon", "simplify_polygon"}),
+    ),
+    applies=_has_z,
+)
 def drop_z_coordinate(polygon: Polygon) -> TransformationResult:
     """Drop the third element from each coordinate in the polygon."""
     yield Polygon(
@@ -33,6 +68,17 @@ def round_points(ndigits: SupportsIndex) -> Transformation:
     :returns: a callable transformation using the passed parameters
     """
 
+    @describe_transformation(
+        "round_points",
+        properties=TransformationProperties(
+            one_to_one=True,
+            coordinate_wise=True,
+            idempotent=True,
+            reduces_vertex_count=True,
+        ),
+        merge=_merge_round_points,
+        ndigits=operator.index(ndigits),
+    )
     def round_points_(polygon: Polygon) -> TransformationResult:
         """Round the polygon's points."""
         yield Polygon(
@@ -47,6 +93,29 @@ def round_points(ndigits: SupportsIndex) -> Transformation:
     return round_points_
 
 
+def _merge_round_points(
+    first: Transformation,
+    second: Transformation,
+) -> Transformation | None:
+    """Rounding to more digits than the previous rounding is a no-op.
+
+    The other way around is not merged, since rounding twice can give a
+    different result than rounding once to the smaller number of digits.
+    """
+    first_info = get_transformation_info(first)
+    second_info = get_transformation_info(second)
+    if first_info is None or second_info is None or second_info.name != "round_points":
+        return None
+
+    first_ndigits = first_info.param("ndigits")
+    second_ndigits = second_info.param("ndigits")
+    assert isinstance(first_ndigits, int) and isinstance(second_ndigits, int)
+    if second_ndigits >= first_ndigits:
+        return first
+
+    return None
+
+
 def _round_coord(
     coords: tuple[float, ...],
     ndigits: SupportsIndex,
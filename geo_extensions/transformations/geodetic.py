@@ -15,20 +15,145 @@ CMR+Data+Partner+User+Guide#CMRDataPartnerUserGuide-GeodeticCoordinateSystem>
 This module contains helpers to fulfill the geodetic system CMR requirements.
 """
 
+import functools
 import itertools
-from collections.abc import Generator
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Iterable, Sequence
 from typing import TypeVar
 
+import numpy as np
+import numpy.typing as npt
 from pygeodesy.sphericalTrigonometry import LatLon
-from shapely.coords import CoordinateSequence
 from shapely.geometry import Polygon
 
+from geo_extensions.ellipsoidal import direct_geodesics, inverse_geodesics
+from geo_extensions.metadata import TransformationProperties, describe_transformation
+from geo_extensions.spherical import (
+    DEGENERATE_NORM,
+    EARTH_RADIUS_METERS,
+    FloatArray,
+    GeodeticRings,
+    angular_distances,
+    cross_track_distances,
+    from_unit_vectors,
+    to_unit_vectors,
+)
 from geo_extensions.types import Transformation, TransformationResult
 
 T = TypeVar("T")
 
+# The unit vector of a point, and a ring vertex as both a pygeodesy point and
+# its unit vector, so it only needs to be converted once.
+_Vector = tuple[float, float, float]
+_Vertex = tuple[LatLon, _Vector]
+# A point of a densified ring with its unit vector
+_Point = tuple[Sequence[float], _Vector]
+# The coordinates of a ring and their unit vectors
+_Ring = tuple[FloatArray, FloatArray]
+# The rounded endpoints of an edge and the densify tolerance
+_EdgeKey = tuple[tuple[float, float], tuple[float, float], float]
 
-def densify_polygon(tolerance_meters: float) -> Transformation:
+# Multiplying the tolerance by 4 roughly halves the number of points added to
+# each edge, since the cross track error shrinks by about a factor of 4 with
+# every bisection.
+_BUDGET_TOLERANCE_FACTOR = 4
+
+# No point of an edge is further than half the circumference of the Earth
+# from the edge, so larger tolerances can't remove any more points.
+_MAX_EDGE_ERROR_METERS = math.pi * EARTH_RADIUS_METERS
+
+# Edges are bisected at most this many times. Halves shorter than 2^-48 of
+# their edge only differ by rounding errors.
+_MAX_BISECTIONS = 48
+
+
+class VertexBudgetExceeded(ValueError):
+    """Raised when densifying a polygon would exceed its vertex budget."""
+
+
+class EdgeCache:
+    """A bounded cache of the points `densify_polygon` adds to each edge.
+
+    Adjacent footprints, like consecutive frames along an orbit, share edges
+    exactly. Passing the same cache to `densify_polygon` for a batch of them
+    lets the points of each shared edge be computed only once. An edge that
+    appears in the opposite direction gets the cached points in reverse.
+
+    :param maxsize: the maximum number of edges to keep. The least recently
+        used edges are evicted first.
+    :param ndigits: the number of decimal places the edge endpoints are
+        rounded to when looking them up
+    """
+
+    def __init__(self, maxsize: int = 4096, ndigits: int = 9):
+        if maxsize <= 0:
+            raise ValueError("'maxsize' must be greater than 0")
+
+        self.maxsize = maxsize
+        self.ndigits = ndigits
+        self.hits = 0
+        self.misses = 0
+        self._edges: OrderedDict[_EdgeKey, tuple[_Point, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def get(
+        self,
+        c1: Sequence[float],
+        c2: Sequence[float],
+        tolerance_meters: float,
+    ) -> tuple[_Point, ...] | None:
+        """Get the points added between two endpoints, if they are cached in
+        either direction.
+        """
+        p1, p2 = self._round(c1), self._round(c2)
+        with self._lock:
+            for key, reverse in (((p1, p2, tolerance_meters), False), ((p2, p1, tolerance_meters), True)):
+                points = self._edges.get(key)
+                if points is not None:
+                    self._edges.move_to_end(key)
+                    self.hits += 1
+                    return points[::-1] if reverse else points
+
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        c1: Sequence[float],
+        c2: Sequence[float],
+        tolerance_meters: float,
+        points: tuple[_Point, ...],
+    ) -> None:
+        """Store the points added between two endpoints."""
+        key = (self._round(c1), self._round(c2), tolerance_meters)
+        with self._lock:
+            self._edges[key] = points
+            self._edges.move_to_end(key)
+            if len(self._edges) > self.maxsize:
+                self._edges.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._edges.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _round(self, coord: Sequence[float]) -> tuple[float, float]:
+        return (round(coord[0], self.ndigits), round(coord[1], self.ndigits))
+
+
+def densify_polygon(
+    tolerance_meters: float,
+    max_vertices: int | None = None,
+    adaptive: bool = True,
+    ellipsoidal: bool = False,
+    cache: EdgeCache | None = None,
+) -> Transformation:
     """GEODETIC: Create a transformation that increases the point density of a
     polygon along great circle arcs between each point.
 
@@ -37,64 +162,702 @@ def densify_polygon(tolerance_meters: float) -> Transformation:
     :param tolerance_meters: The maximum allowable cross track error between
         a line segment when interpreted as a cartesian point. Must be greater
         than 0.
+    :param max_vertices: The maximum number of vertices, summed over all
+        rings, that densifying a polygon may produce. Polygons that already
+        have more vertices than this are only left unchanged. Densification
+        stops as soon as the budget is exceeded, so the cost per polygon is
+        bounded.
+    :param adaptive: When the budget would be exceeded, retry with a larger
+        tolerance until the polygon fits in the budget. If False, or if the
+        polygon doesn't fit with any tolerance, for instance because it has
+        antipodal edges, which are always split, raise `VertexBudgetExceeded`
+        instead.
+    :param ellipsoidal: Follow geodesics on the WGS84 ellipsoid instead of
+        great circles on a sphere. The geodesics of all edges of a ring are
+        computed together, so this costs about the same as the spherical mode.
+    :param cache: Reuse the points added to edges that were already densified
+        with the same tolerance. Not supported in the ellipsoidal mode.
     :returns: a callable transformation using the passed parameters
     """
     if tolerance_meters <= 0:
         raise ValueError("'tolerance_meters' must be greater than 0")
+    if max_vertices is not None and max_vertices <= 0:
+        raise ValueError("'max_vertices' must be greater than 0")
+    if cache is not None and ellipsoidal:
+        raise ValueError("'cache' is not supported with 'ellipsoidal'")
 
+    @describe_transformation(
+        "densify_polygon",
+        properties=TransformationProperties(
+            one_to_one=True,
+            # An adapted tolerance would be adapted again on the next run
+            idempotent=max_vertices is None,
+            commutes_with=frozenset({"drop_z_coordinate"}),
+        ),
+        applies=functools.partial(
+            _needs_densify,
+            tolerance_meters=tolerance_meters,
+            ellipsoidal=ellipsoidal,
+        ),
+        cost=functools.partial(
+            _densify_costs,
+            tolerance_meters=tolerance_meters,
+            max_vertices=max_vertices,
+            ellipsoidal=ellipsoidal,
+        ),
+        tolerance_meters=tolerance_meters,
+        max_vertices=max_vertices,
+        adaptive=adaptive,
+        ellipsoidal=ellipsoidal,
+    )
     def densify(polygon: Polygon) -> TransformationResult:
         """Densify the polygon by adding additional points along the great
         circle arcs between the existing points.
         """
-        yield Polygon(
-            shell=_densify_ring(polygon.exterior.coords, tolerance_meters),
-            holes=[
-                # ruff hint
-                _densify_ring(interior.coords, tolerance_meters)
-                for interior in polygon.interiors
-            ],
+        rings = GeodeticRings.from_polygon(polygon)
+
+        if max_vertices is not None:
+            yield _densify_polygon_with_budget(
+                rings,
+                tolerance_meters,
+                max_vertices,
+                adaptive,
+                ellipsoidal,
+                cache,
+            )
+            return
+
+        if ellipsoidal:
+            yield _map_rings(
+                rings,
+                lambda coords, vectors: _densify_ring_ellipsoidal(coords, vectors, tolerance_meters),
+            )
+            return
+
+        yield _map_rings(
+            rings,
+            lambda coords, vectors: _collect(_densify_ring(coords, vectors, tolerance_meters, cache)),
         )
 
     return densify
 
 
+def simplify_polygon_geodetic(tolerance_meters: float) -> Transformation:
+    """GEODETIC: Create a transformation that reduces the point density of a
+    polygon while keeping the great circle arcs between the remaining points
+    within a tolerance of the original points.
+
+    This is the inverse operation of `densify_polygon`. It performs a
+    Douglas-Peucker simplification where the distance of a point to an edge is
+    its cross track distance to the great circle through the edge, so unlike
+    `simplify_polygon` the tolerance means the same thing everywhere on the
+    Earth. Each ring keeps at least 4 points.
+
+    :param tolerance_meters: The maximum allowable cross track error between
+        a removed point and the great circle arc that replaces it. Must not be
+        negative.
+    :returns: a callable transformation using the passed parameters
+    """
+    if tolerance_meters < 0:
+        raise ValueError("'tolerance_meters' must not be negative")
+
+    @describe_transformation(
+        "simplify_polygon_geodetic",
+        properties=TransformationProperties(
+            one_to_one=True,
+            reduces_vertex_count=True,
+            commutes_with=frozenset({"drop_z_coordinate"}),
+        ),
+        tolerance_meters=tolerance_meters,
+    )
+    def simplify(polygon: Polygon) -> TransformationResult:
+        """Simplify the polygon by removing points that are close to the
+        great circle arcs between the remaining points.
+        """
+        yield _map_rings(
+            GeodeticRings.from_polygon(polygon),
+            lambda coords, vectors: _simplify_ring(coords, vectors, tolerance_meters),
+        )
+
+    return simplify
+
+
+def densify_polygon_by_length(max_segment_meters: float) -> Transformation:
+    """GEODETIC: Create a transformation that splits every edge of a polygon
+    into evenly spaced great circle segments no longer than a maximum length.
+
+    Unlike `densify_polygon`, the number of points added to an edge only
+    depends on its length, so all edges of a ring are split in a single
+    vectorized pass without checking the error of each new point.
+
+    :param max_segment_meters: The maximum great circle length of an edge.
+        Must be greater than 0.
+    :returns: a callable transformation using the passed parameters
+    """
+    if max_segment_meters <= 0:
+        raise ValueError("'max_segment_meters' must be greater than 0")
+
+    @describe_transformation(
+        "densify_polygon_by_length",
+        properties=TransformationProperties(
+            one_to_one=True,
+            idempotent=True,
+            commutes_with=frozenset({"drop_z_coordinate"}),
+        ),
+        applies=functools.partial(_has_long_edges, max_segment_meters=max_segment_meters),
+        cost=functools.partial(_densify_by_length_costs, max_segment_meters=max_segment_meters),
+        max_segment_meters=max_segment_meters,
+    )
+    def densify(polygon: Polygon) -> TransformationResult:
+        """Densify the polygon by splitting long edges into evenly spaced
+        great circle segments.
+        """
+        yield _map_rings(
+            GeodeticRings.from_polygon(polygon),
+            lambda coords, vectors: _densify_ring_by_length(coords, vectors, max_segment_meters),
+        )
+
+    return densify
+
+
+def _densify_polygon_with_budget(
+    rings: GeodeticRings,
+    tolerance_meters: float,
+    max_vertices: int,
+    adaptive: bool,
+    ellipsoidal: bool,
+    cache: EdgeCache | None,
+) -> Polygon:
+    budget = max(max_vertices, sum(len(coords) for coords in rings.coords))
+
+    tolerance = tolerance_meters
+    while True:
+        densified = _densify_rings_within_budget(rings, tolerance, budget, ellipsoidal, cache)
+        if densified is not None:
+            return densified.to_polygon()
+
+        if not adaptive:
+            raise VertexBudgetExceeded(
+                f"densifying with a tolerance of {tolerance_meters} meters produces more than {budget} vertices",
+            )
+        # Antipodal edges are split whatever the tolerance
+        if tolerance > _MAX_EDGE_ERROR_METERS:
+            raise VertexBudgetExceeded(f"densifying produces more than {budget} vertices with any tolerance")
+
+        tolerance *= _BUDGET_TOLERANCE_FACTOR
+
+
+def _densify_rings_within_budget(
+    rings: GeodeticRings,
+    tolerance_meters: float,
+    budget: int,
+    ellipsoidal: bool,
+    cache: EdgeCache | None,
+) -> GeodeticRings | None:
+    """Densify each ring, stopping early once the total number of vertices
+    goes over the budget.
+
+    :returns: the densified rings, or None if the budget was exceeded
+    """
+    remaining = budget
+    densified: list[_Ring] = []
+    for coords, vectors in zip(rings.coords, rings.vectors):
+        if ellipsoidal:
+            ring = _densify_ring_ellipsoidal(coords, vectors, tolerance_meters, max_points=remaining + 1)
+        else:
+            points = _densify_ring(coords, vectors, tolerance_meters, cache)
+            ring = _collect(itertools.islice(points, remaining + 1))
+        remaining -= len(ring[0])
+        if remaining < 0:
+            return None
+
+        densified.append(ring)
+
+    return GeodeticRings(
+        tuple(coords for coords, _ in densified),
+        tuple(vectors for _, vectors in densified),
+    )
+
+
+def _map_rings(rings: GeodeticRings, function: Callable[[FloatArray, FloatArray], _Ring]) -> Polygon:
+    """Apply a function to the coordinates and unit vectors of each ring and
+    create a polygon from the results, keeping the new unit vectors cached.
+    """
+    results = [function(coords, vectors) for coords, vectors in zip(rings.coords, rings.vectors)]
+
+    return GeodeticRings(
+        tuple(coords for coords, _ in results),
+        tuple(vectors for _, vectors in results),
+    ).to_polygon()
+
+
+def _collect(points: Iterable[_Point]) -> _Ring:
+    coords, vectors = [], []
+    for coord, vector in points:
+        coords.append(coord)
+        vectors.append(vector)
+
+    return (
+        np.array(coords, dtype=np.float64).reshape(len(coords), -1),
+        np.array(vectors, dtype=np.float64).reshape(len(vectors), 3),
+    )
+
+
+def _edges(polygons: Sequence[Polygon]) -> tuple[_Ring, _Ring, npt.NDArray[np.intp]]:
+    """Get the (lon, lat) coordinates and unit vectors of the start and end
+    points of every edge of the polygons, and the index of the polygon each
+    edge belongs to.
+    """
+    all_rings = GeodeticRings.from_polygons(polygons)
+    ring_coords = [coords[:, :2] for rings in all_rings for coords in rings.coords]
+    ring_vectors = [vectors for rings in all_rings for vectors in rings.vectors]
+
+    coords = np.concatenate([np.empty((0, 2)), *ring_coords])
+    vectors = np.concatenate([np.empty((0, 3)), *ring_vectors])
+    ring_polygon_index = np.repeat(np.arange(len(all_rings)), [len(rings.coords) for rings in all_rings])
+    coord_ring_index = np.repeat(np.arange(len(ring_coords)), [len(coords) for coords in ring_coords])
+
+    is_edge = coord_ring_index[1:] == coord_ring_index[:-1]
+    starts = (coords[:-1][is_edge], vectors[:-1][is_edge])
+    ends = (coords[1:][is_edge], vectors[1:][is_edge])
+
+    return starts, ends, ring_polygon_index[coord_ring_index[:-1][is_edge]]
+
+
+def _needs_densify(
+    polygons: Sequence[Polygon],
+    tolerance_meters: float,
+    ellipsoidal: bool = False,
+) -> npt.NDArray[np.bool_]:
+    """Check which polygons have at least one edge that `_densify_edge`, or
+    `_densify_ring_ellipsoidal` when `ellipsoidal` is set, would split, by
+    computing the error of every edge at once.
+    """
+    errors, edge_polygon_index = _edge_errors(polygons, ellipsoidal)
+    # Be conservative about floating point differences to pygeodesy. Wrongly
+    # reporting an edge as needing densification only costs time.
+    needs_densify = errors >= tolerance_meters * (1 - 1e-9)
+
+    result = np.zeros(len(polygons), dtype=np.bool_)
+    result[edge_polygon_index[needs_densify]] = True
+
+    return result
+
+
+def _edge_errors(
+    polygons: Sequence[Polygon],
+    ellipsoidal: bool,
+) -> tuple[FloatArray, npt.NDArray[np.intp]]:
+    """Compute the error at the midpoint of every edge of the polygons, and
+    the index of the polygon each edge belongs to.
+    """
+    (starts, start_vectors), (ends, end_vectors), edge_polygon_index = _edges(polygons)
+
+    if ellipsoidal:
+        errors, _ = _ellipsoidal_edge_errors(starts, ends)
+    else:
+        errors = cross_track_distances(
+            to_unit_vectors((starts + ends) / 2),
+            start_vectors,
+            end_vectors,
+        )
+
+    return errors, edge_polygon_index
+
+
+def _has_long_edges(
+    polygons: Sequence[Polygon],
+    max_segment_meters: float,
+) -> npt.NDArray[np.bool_]:
+    """Check which polygons have at least one edge that
+    `_densify_ring_by_length` would split.
+    """
+    (_, start_vectors), (_, end_vectors), edge_polygon_index = _edges(polygons)
+
+    counts = _segment_counts(start_vectors, end_vectors, max_segment_meters)
+
+    result = np.zeros(len(polygons), dtype=np.bool_)
+    result[edge_polygon_index[counts > 1]] = True
+
+    return result
+
+
+def _densify_costs(
+    polygons: Sequence[Polygon],
+    tolerance_meters: float,
+    max_vertices: int | None,
+    ellipsoidal: bool,
+) -> FloatArray:
+    """Estimate the number of vertices `densify_polygon` produces for each
+    polygon.
+
+    The error of an edge grows with the square of its length, so an edge
+    with error e is split into about sqrt(e / tolerance) segments.
+    """
+    errors, edge_polygon_index = _edge_errors(polygons, ellipsoidal)
+
+    with np.errstate(invalid="ignore"):
+        segments = np.sqrt(errors / tolerance_meters)
+    # Edges between antipodal points can't be densified at all
+    segments = np.where(np.isfinite(segments), np.maximum(segments, 1), 1)
+    costs = np.bincount(edge_polygon_index, weights=segments, minlength=len(polygons))
+
+    if max_vertices is not None:
+        costs = np.minimum(costs, max_vertices)
+
+    return np.asarray(costs, dtype=np.float64)
+
+
+def _densify_by_length_costs(polygons: Sequence[Polygon], max_segment_meters: float) -> FloatArray:
+    """Get the number of vertices `densify_polygon_by_length` produces for
+    each polygon.
+    """
+    (_, start_vectors), (_, end_vectors), edge_polygon_index = _edges(polygons)
+
+    counts = _segment_counts(start_vectors, end_vectors, max_segment_meters)
+
+    return np.asarray(np.bincount(edge_polygon_index, weights=counts, minlength=len(polygons)), dtype=np.float64)
+
+
+def _segment_counts(starts: FloatArray, ends: FloatArray, max_segment_meters: float) -> npt.NDArray[np.intp]:
+    """Get the number of segments each edge needs to be split into."""
+    lengths = angular_distances(starts, ends)
+    # Allow for rounding errors so that densifying twice adds nothing
+    counts = np.ceil(lengths / max_segment_meters * (1 - 1e-9))
+
+    return np.maximum(counts, 1).astype(np.intp)
+
+
+def _simplify_ring(points: FloatArray, vectors: FloatArray, tolerance_meters: float) -> _Ring:
+    if len(points) < 3:
+        return points, vectors
+
+    keep = _douglas_peucker(vectors, tolerance_meters)
+
+    # Collapsed rings are not valid, so add back the farthest points
+    while np.count_nonzero(keep) < min(4, len(points)):
+        kept = np.flatnonzero(keep).tolist()
+        farthest = max(
+            (_farthest_from_edge(vectors, start, end) for start, end in itertools.pairwise(kept)),
+            key=lambda candidate: candidate[1],
+        )
+        assert farthest[0] is not None
+        keep[farthest[0]] = True
+
+    kept = _drop_redundant_points(vectors, np.flatnonzero(keep).tolist(), tolerance_meters)
+
+    return points[kept], vectors[kept]
+
+
+def _drop_redundant_points(
+    vectors: FloatArray,
+    kept: list[int],
+    tolerance_meters: float,
+) -> list[int]:
+    """Remove kept points whose neighbours already cover every point between
+    them within the tolerance.
+
+    Douglas-Peucker never revisits a split, so on a closed ring the first
+    split, which is the point farthest from the start rather than a corner,
+    and the splits made before its neighbours were added can be redundant.
+    """
+    if len(kept) <= 4:
+        return kept
+
+    # Cheaply find the candidates by the distance of the point itself
+    indices = np.array(kept)
+    distances = cross_track_distances(
+        vectors[indices[1:-1]],
+        vectors[indices[:-2]],
+        vectors[indices[2:]],
+    )
+    candidates = (np.flatnonzero(distances <= tolerance_meters) + 1).tolist()
+
+    # Removing a point changes the edges of its neighbours, so the candidates
+    # are checked one at a time from the end.
+    for position in reversed(candidates):
+        if len(kept) <= 4:
+            break
+        _, distance = _farthest_from_edge(vectors, kept[position - 1], kept[position + 1])
+        if distance <= tolerance_meters:
+            del kept[position]
+
+    return kept
+
+
+def _douglas_peucker(vectors: FloatArray, tolerance_meters: float) -> npt.NDArray[np.bool_]:
+    """Find the points kept by a Douglas-Peucker simplification using cross
+    track distances.
+
+    Instead of recursing into one edge at a time, all edges at the same depth
+    of the recursion are split at once using vectorized operations.
+
+    :returns: a boolean array which is True for the kept points
+    """
+    keep = np.zeros(len(vectors), dtype=np.bool_)
+    keep[[0, -1]] = True
+    # Compare the sine of the angular distances, which avoids computing the
+    # arcsine for every point.
+    max_sine = np.sin(min(tolerance_meters / EARTH_RADIUS_METERS, np.pi / 2))
+
+    starts = np.array([0])
+    ends = np.array([len(vectors) - 1])
+    while len(starts):
+        # The indices of the points between the start and end of every edge,
+        # all concatenated together.
+        counts = ends - starts - 1
+        edges = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.cumsum(counts) - counts
+        indices = np.arange(len(edges)) - offsets[edges] + starts[edges] + 1
+
+        normals = np.cross(vectors[starts], vectors[ends])
+        norms = np.linalg.norm(normals, axis=-1)
+        degenerate = norms < DEGENERATE_NORM
+        norms[degenerate] = 1.0
+        sines = np.abs(np.einsum("ij,ij->i", vectors[indices], normals[edges])) / norms[edges]
+
+        # For the closing edge of a ring, use the angular distance to the
+        # point instead, and compare it to the tolerance in radians.
+        degenerate_points = degenerate[edges]
+        if np.any(degenerate_points):
+            sines[degenerate_points] = angular_distances(
+                vectors[indices[degenerate_points]],
+                vectors[starts[edges[degenerate_points]]],
+                radius=1.0,
+            )
+        thresholds = np.where(degenerate, tolerance_meters / EARTH_RADIUS_METERS, max_sine)
+
+        # The first point with the largest distance on every edge
+        edge_max = np.full(len(starts), -1.0)
+        np.maximum.at(edge_max, edges, sines)
+        is_max = sines == edge_max[edges]
+        split_edges, first = np.unique(edges[is_max], return_index=True)
+        splits = indices[is_max][first]
+
+        needs_split = edge_max[split_edges] > thresholds[split_edges]
+        split_edges, splits = split_edges[needs_split], splits[needs_split]
+        keep[splits] = True
+
+        starts = np.concatenate((starts[split_edges], splits))
+        ends = np.concatenate((splits, ends[split_edges]))
+        has_points = ends - starts >= 2
+        starts, ends = starts[has_points], ends[has_points]
+
+    return keep
+
+
+def _farthest_from_edge(vectors: FloatArray, start: int, end: int) -> tuple[int | None, float]:
+    """Find the point between `start` and `end` with the largest distance to
+    the great circle through them. For the closing edge of a ring, where the
+    two points are the same, the distance to the point is used instead.
+    Antipodal points are treated the same way, as the great circle through
+    them is undefined.
+
+    :returns: the index of the point and its distance, or None if there are no
+        points in between
+    """
+    if end - start < 2:
+        return None, -np.inf
+
+    between = vectors[start:end][1:]
+    normal = np.cross(vectors[start], vectors[end])
+    norm = float(np.linalg.norm(normal))
+    if norm < DEGENERATE_NORM:
+        distances = angular_distances(between, vectors[start])
+        index = int(np.argmax(distances))
+        return start + 1 + index, float(distances[index])
+
+    # Only compute the distance of the farthest point
+    sines = np.abs(between @ normal)
+    index = int(np.argmax(sines))
+    distance = EARTH_RADIUS_METERS * np.arcsin(min(float(sines[index]) / norm, 1.0))
+
+    return start + 1 + index, float(distance)
+
+
 def _densify_ring(
-    coords: CoordinateSequence,
+    coords: FloatArray,
+    vectors: FloatArray,
     tolerance_meters: float,
-) -> Generator[tuple[float, ...]]:
+    cache: EdgeCache | None = None,
+) -> Generator[_Point]:
     assert tolerance_meters > 0
 
-    if len(coords) < 2:
-        yield from coords
+    points: list[list[float]] = coords.tolist()
+    units: list[_Vector] = [(x, y, z) for x, y, z in vectors.tolist()]
+    if len(points) < 2:
+        yield from zip(points, units)
         return
 
-    for c1, c2 in itertools.pairwise(coords):
-        p1 = _shapely_to_pygeodesy(c1)
-        p2 = _shapely_to_pygeodesy(c2)
+    # Every vertex is converted to a pygeodesy point once and shared between
+    # the two edges it is on
+    vertices = [(LatLon(point[1], point[0]), unit) for point, unit in zip(points, units)]
+    for c1, c2, v1, v2 in zip(points, points[1:], vertices, vertices[1:]):
+        yield c1, v1[1]
 
-        yield c1
+        if cache is None:
+            for p_new, n_new in _densify_edge(v1, v2, tolerance_meters):
+                yield (p_new.lon, p_new.lat), n_new
+            continue
 
-        for p_new in _densify_edge(p1, p2, tolerance_meters):
-            yield (p_new.lon, p_new.lat)
+        added = cache.get(c1, c2, tolerance_meters)
+        if added is None:
+            added = tuple(
+                # ruff hint
+                ((p_new.lon, p_new.lat), n_new)
+                for p_new, n_new in _densify_edge(v1, v2, tolerance_meters)
+            )
+            cache.put(c1, c2, tolerance_meters, added)
 
-    yield c2
+        yield from added
 
+    yield points[-1], units[-1]
 
-def _densify_edge(p1: LatLon, p2: LatLon, tolerance_meters: float) -> Generator[LatLon]:
-    # Cartesian midpoint
-    c_mid_cartesian = ((p1.lon + p2.lon) / 2, (p1.lat + p2.lat) / 2)
-    p_mid_cartesian = _shapely_to_pygeodesy(c_mid_cartesian)
 
-    error_meters = abs(p_mid_cartesian.crossTrackDistanceTo(p1, p2))
-    if error_meters < tolerance_meters:
-        return
+def _densify_ring_by_length(points: FloatArray, vectors: FloatArray, max_segment_meters: float) -> _Ring:
+    """Split every edge of a ring into evenly spaced great circle segments.
+
+    The new points are interpolated along the great circles for all edges at
+    once. Added points get Z values interpolated linearly along their edge.
+    """
+    if len(points) < 2:
+        return points, vectors
+
+    starts, ends = vectors[:-1], vectors[1:]
+    counts = _segment_counts(starts, ends, max_segment_meters)
+    if np.all(counts == 1):
+        return points, vectors
+
+    angles = angular_distances(starts, ends, radius=1.0)
+    if np.any((counts > 1) & (np.pi - angles < DEGENERATE_NORM)):
+        raise ValueError("the great circle between antipodal points is undefined")
 
-    # Add a point in the middle and recursively densify the resulting edges
+    # The fraction along its edge of each new point, for all edges at once
+    edges = np.repeat(np.arange(len(counts)), counts - 1)
+    offsets = np.cumsum(counts - 1) - (counts - 1)
+    fractions = (np.arange(len(edges)) - offsets[edges] + 1) / counts[edges]
+
+    # Spherical linear interpolation
+    angle = angles[edges]
+    sines = np.sin(angle)
+    new_vectors = (
+        np.sin((1 - fractions) * angle)[:, np.newaxis] * starts[edges]
+        + np.sin(fractions * angle)[:, np.newaxis] * ends[edges]
+    ) / sines[:, np.newaxis]
+
+    new_points = from_unit_vectors(new_vectors)
+    if points.shape[1] > 2:
+        start_z, end_z = points[:-1][edges, 2:], points[1:][edges, 2:]
+        z = start_z + fractions[:, np.newaxis] * (end_z - start_z)
+        new_points = np.concatenate((new_points, z), axis=1)
+
+    indices = np.repeat(np.arange(1, len(points)), counts - 1)
+
+    return np.insert(points, indices, new_points, axis=0), np.insert(vectors, indices, new_vectors, axis=0)
+
+
+def _densify_ring_ellipsoidal(
+    points: FloatArray,
+    vectors: FloatArray,
+    tolerance_meters: float,
+    max_points: int | None = None,
+) -> _Ring:
+    """Densify a ring along WGS84 geodesics.
+
+    This adds the same points as bisecting each edge like `_densify_edge`
+    does, except that all edges at the same depth of the recursion are
+    bisected at once. Added points get the average Z value of their edge.
+
+    :param max_points: stop early once the ring has more points than this
+    """
+    assert tolerance_meters > 0
+
+    # Whether each edge may still need to be split
+    active = np.ones(max(len(points) - 1, 0), dtype=np.bool_)
+
+    for _ in range(_MAX_BISECTIONS):
+        if not np.any(active) or (max_points is not None and len(points) > max_points):
+            break
+
+        edges = np.flatnonzero(active)
+        starts, ends = points[edges], points[edges + 1]
+        errors, midpoints = _ellipsoidal_edge_errors(starts, ends)
+
+        split = errors >= tolerance_meters
+        if points.shape[1] > 2:
+            z = (starts[:, 2:] + ends[:, 2:]) / 2
+            midpoints = np.concatenate((midpoints, z), axis=1)
+
+        split_edges = edges[split]
+        points = np.insert(points, split_edges + 1, midpoints[split], axis=0)
+        vectors = np.insert(vectors, split_edges + 1, to_unit_vectors(midpoints[split]), axis=0)
+        # Both halves of a split edge are checked again on the next pass
+        splits = np.zeros(len(active), dtype=np.bool_)
+        splits[split_edges] = True
+        active = np.repeat(splits, np.where(splits, 2, 1))
+
+    return points, vectors
+
+
+def _ellipsoidal_edge_errors(starts: FloatArray, ends: FloatArray) -> tuple[FloatArray, FloatArray]:
+    """Compute the error of interpreting each edge as a cartesian line instead
+    of a geodesic.
+
+    The error is the distance from the cartesian midpoint to the geodesic,
+    measured perpendicular to the geodesic at its midpoint.
+
+    :returns: the error of each edge in meters, and the (lon, lat) geodesic
+        midpoint of each edge
+    """
+    distances, azimuths, _ = inverse_geodesics(starts, ends)
+    midpoints, midpoint_azimuths = direct_geodesics(starts, azimuths, distances / 2)
+
+    # The end longitudes are unwrapped relative to the starts, so that edges
+    # crossing the antimeridian, which the geodesic midpoints normalized to
+    # -180 create, don't get a midpoint on the other side of the Earth
+    end_lons = starts[:, 0] + (ends[:, 0] - starts[:, 0] + 180) % 360 - 180
+    cartesian_midpoints = np.stack(((starts[:, 0] + end_lons) / 2, (starts[:, 1] + ends[:, 1]) / 2), axis=-1)
+    offsets, offset_azimuths, _ = inverse_geodesics(midpoints, cartesian_midpoints)
+    errors = offsets * np.abs(np.sin(np.radians(offset_azimuths - midpoint_azimuths)))
+
+    return errors, midpoints
+
+
+def _densify_edge(v1: _Vertex, v2: _Vertex, tolerance_meters: float) -> Generator[_Vertex]:
+    (p1, n1), (p2, n2) = v1, v2
+
+    # Cross track error of the cartesian midpoint
+    normal = _cross(n1, n2)
+    norm = math.sqrt(_dot(normal, normal))
+    if norm < DEGENERATE_NORM:
+        # Coincident points have no error, antipodal points are bisected
+        if _dot(n1, n2) > 0:
+            return
+    else:
+        n_mid_cartesian = _to_unit_vector((p1.lon + p2.lon) / 2, (p1.lat + p2.lat) / 2)
+        sine = min(abs(_dot(n_mid_cartesian, normal)) / norm, 1.0)
+        if EARTH_RADIUS_METERS * math.asin(sine) < tolerance_meters:
+            return
+
+    # Add a point in the middle and recursively densify the resulting edges.
+    # The new point is converted once and shared by both halves.
     p_mid = p1.midpointTo(p2)
-    yield from _densify_edge(p1, p_mid, tolerance_meters)
-    yield p_mid
-    yield from _densify_edge(p_mid, p2, tolerance_meters)
+    v_mid = (p_mid, _to_unit_vector(p_mid.lon, p_mid.lat))
+    yield from _densify_edge(v1, v_mid, tolerance_meters)
+    yield v_mid
+    yield from _densify_edge(v_mid, v2, tolerance_meters)
+
+
+def _to_unit_vector(lon: float, lat: float) -> _Vector:
+    lon, lat = math.radians(lon), math.radians(lat)
+    cos_lat = math.cos(lat)
+
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def _cross(a: _Vector, b: _Vector) -> _Vector:
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
 
 
-def _shapely_to_pygeodesy(coord: tuple[float, ...]) -> LatLon:
-    return LatLon(coord[1], coord[0])
+def _dot(a: _Vector, b: _Vector) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
@@ -1,16 +1,123 @@
-from collections.abc import Iterable, Sequence
+import asyncio
+import contextlib
+import itertools
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 
+import numpy as np
+import numpy.typing as npt
+import shapely
 from shapely import Geometry, wkt
 from shapely.geometry import MultiPolygon, Polygon, shape
 
+from geo_extensions.checkpoint import CheckpointStore, checkpoint_keys
+from geo_extensions.metadata import (
+    fingerprint,
+    get_transformation_info,
+    transformation_applies,
+    transformation_costs,
+)
+from geo_extensions.planner import plan_transformations
+from geo_extensions.sharedmemory import (
+    SharedMemoryExecutor,
+    TransformOutput,
+    fork_context,
+)
+from geo_extensions.tracking import MemoryDiagnostics, SlowInputTracker, StageProfiler
 from geo_extensions.types import Transformation, TransformationResult
 
 
+@dataclass
+class BatchResult:
+    """The outcome of transforming a batch with `Transformer.try_transform_batch`.
+
+    :param results: the transformed polygons of each input, or None for the
+        inputs that failed
+    :param errors: the exception raised for each failed input, by index
+    """
+
+    results: list[list[Polygon] | None]
+    errors: dict[int, Exception] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> list[int]:
+        """The indices of the failed inputs, in order."""
+        return sorted(self.errors)
+
+
 class Transformer:
-    """Apply a sequence of transformations to a polygon list."""
+    """Apply a sequence of transformations to a polygon list.
+
+    :param transformations: the transformations to apply in order
+    :param checkpoints: a store used to resume from the saved results of the
+        longest matching prefix of the transformations.
+    :param checkpoint_after: save the intermediate results to `checkpoints`
+        after this many transformations have been applied.
+    :param optimize: rewrite the transformations using the pipeline planner
+        before applying them. Disable this to apply the transformations
+        exactly as given, for instance when debugging.
+    :param threads: apply each transformation to the polygons of a batch in
+        this many threads. Shapely releases the GIL in GEOS operations such as
+        `simplify`, so this may speed up the cartesian transformations on a
+        multi-core machine. The speedup is unmeasured, so check it with
+        `python -m benchmarks.threads` before relying on it. All built-in
+        transformations are safe to call from several threads at once. Custom
+        transformations must be too.
+    :param processes: apply each transformation to the polygons of a batch in
+        this many worker processes. The polygons are passed to the workers and
+        back through shared memory instead of being pickled. The workers are
+        started with the `fork` start method and get the transformations
+        without pickling them, so this raises ValueError on platforms without
+        `fork`. A new pool is started for every call, which takes tens of
+        milliseconds, so this only pays off for large batches. Can't be
+        combined with `threads`.
+    :param tracker: record the slowest inputs, with the time spent in each
+        transformation, in this tracker.
+    :param diagnostics: record the peak memory use of each transformation and
+        the largest polygon it produced.
+    :param profiler: profile each transformation separately.
+    """
+
+    def __init__(
+        self,
+        transformations: Sequence[Transformation],
+        checkpoints: CheckpointStore | None = None,
+        checkpoint_after: int | None = None,
+        optimize: bool = True,
+        threads: int | None = None,
+        processes: int | None = None,
+        tracker: SlowInputTracker | None = None,
+        diagnostics: MemoryDiagnostics | None = None,
+        profiler: StageProfiler | None = None,
+    ):
+        if checkpoint_after is not None:
+            if checkpoints is None:
+                raise ValueError("'checkpoint_after' requires a checkpoint store")
+            if not 0 < checkpoint_after <= len(transformations):
+                raise ValueError("'checkpoint_after' must be between 1 and the number of transformations")
+            if len(_fingerprints(tuple(transformations))) < checkpoint_after:
+                raise ValueError("transformations before the checkpoint must have a fingerprint")
+        if threads is not None and threads < 1:
+            raise ValueError("'threads' must be at least 1")
+        if processes is not None and processes < 1:
+            raise ValueError("'processes' must be at least 1")
+        if threads is not None and processes is not None:
+            raise ValueError("'threads' and 'processes' can't be combined")
+        if processes is not None and processes > 1:
+            fork_context()
 
-    def __init__(self, transformations: Sequence[Transformation]):
         self.transformations = transformations
+        self.checkpoints = checkpoints
+        self.checkpoint_after = checkpoint_after
+        self.optimize = optimize
+        self.threads = threads
+        self.processes = processes
+        self.tracker = tracker
+        self.diagnostics = diagnostics
+        self.profiler = profiler
 
     def from_geo_json(self, geo_json: dict) -> list[Polygon]:
         """Load and transform an object from a GeoJSON dict.
@@ -39,15 +146,305 @@ class Transformer:
     def transform(self, polygons: Iterable[Polygon]) -> list[Polygon]:
         """Perform the transformation chain on a sequence of polygons.
 
+        Each polygon is passed through the whole chain before the next one is
+        read, unless something needs a whole stage of the batch at once: a
+        transformation with an `applies` predicate, checkpoints, `threads` or
+        `processes`, or a tracker, diagnostics or profiler. In that case every
+        stage is computed for the whole batch before the next one starts, so
+        memory use grows with the size of the batch times the size of the
+        largest stage, for instance after densifying.
+
         :returns: a list of transformed polygons
         """
 
-        return list(
-            _apply_transformations(
-                polygons,
-                tuple(self.transformations),
-            ),
-        )
+        transformations = tuple(self.plan())
+        if self._streams(transformations):
+            return list(_apply_transformations(polygons, transformations))
+
+        if self.checkpoints is not None:
+            return [
+                # ruff hint
+                polygon
+                for group in self.transform_batch(polygons)
+                for polygon in group
+            ]
+
+        return [
+            # ruff hint
+            polygon
+            for group in self._transform_groups(list(polygons))
+            for polygon in group
+        ]
+
+    def transform_batch(
+        self,
+        polygons: Iterable[Polygon],
+        deduplicate: bool = True,
+    ) -> list[list[Polygon]]:
+        """Perform the transformation chain on each polygon of a batch
+        separately.
+
+        Unlike `transform`, the results are grouped by input, so the list at
+        index `i` holds the polygons produced from the `i`th input polygon.
+
+        :param deduplicate: transform byte-identical input polygons only once
+            and share the result between every position they appear at.
+        :returns: a list of transformed polygon lists, one per input polygon
+        """
+
+        polygons = list(polygons)
+
+        if deduplicate:
+            unique_polygons, inverse = _unique_polygons(polygons)
+        else:
+            unique_polygons, inverse = polygons, list(range(len(polygons)))
+
+        results = self._transform_groups(unique_polygons)
+
+        return [list(results[i]) for i in inverse]
+
+    def try_transform_batch(
+        self,
+        inputs: Iterable[Geometry | str | dict],
+        deduplicate: bool = True,
+    ) -> BatchResult:
+        """Perform the transformation chain on each input of a batch
+        separately, capturing the errors of each input instead of failing the
+        whole batch.
+
+        An input fails when it can't be loaded or converted to polygons, or
+        when any transformation raises an exception for one of its polygons.
+        The other inputs are still transformed.
+
+        :param inputs: polygons or multipolygons, WKT strings or GeoJSON dicts
+        :param deduplicate: transform byte-identical polygons only once
+        :returns: the results and the errors of the inputs
+        """
+
+        inputs = list(inputs)
+        result = BatchResult([None] * len(inputs))
+
+        owners: list[int] = []
+        polygons: list[Polygon] = []
+        for i, obj in enumerate(inputs):
+            try:
+                input_polygons = list(to_polygons(_load(obj)))
+            except Exception as e:
+                result.errors[i] = e
+                continue
+
+            owners.extend([i] * len(input_polygons))
+            polygons.extend(input_polygons)
+            result.results[i] = []
+
+        if deduplicate:
+            unique_polygons, inverse = _unique_polygons(polygons)
+        else:
+            unique_polygons, inverse = polygons, list(range(len(polygons)))
+
+        errors: dict[int, Exception] = {}
+        groups = self._transform_groups(unique_polygons, errors)
+
+        for owner, i in zip(owners, inverse):
+            if owner in result.errors:
+                continue
+            if i in errors:
+                result.errors[owner] = errors[i]
+                result.results[owner] = None
+                continue
+
+            group = result.results[owner]
+            assert group is not None
+            group.extend(groups[i])
+
+        return result
+
+    async def transform_async(
+        self,
+        polygons: Iterable[Polygon] | AsyncIterable[Polygon],
+        executor: Executor | None = None,
+        chunk_size: int = 256,
+        max_in_flight: int = 4,
+    ) -> AsyncIterator[Polygon]:
+        """Perform the transformation chain without blocking the event loop.
+
+        The input is split into chunks which are transformed with `transform`
+        in an executor, so the transformations must be picklable when using a
+        process pool. The results are yielded in the same order as `transform`
+        would return them, as soon as each chunk and all chunks before it are
+        done.
+
+        :param polygons: a sync or async iterable of polygons
+        :param executor: the executor to run the chunks in, or None to use the
+            default executor of the event loop
+        :param chunk_size: the number of input polygons per chunk
+        :param max_in_flight: the maximum number of chunks submitted to the
+            executor at once. Reading from `polygons` pauses until the oldest
+            chunk is done.
+        :returns: an async iterator of transformed polygons
+        """
+
+        if chunk_size < 1:
+            raise ValueError("'chunk_size' must be at least 1")
+        if max_in_flight < 1:
+            raise ValueError("'max_in_flight' must be at least 1")
+
+        loop = asyncio.get_running_loop()
+        pending: deque[asyncio.Future[list[Polygon]]] = deque()
+
+        try:
+            async for chunk in _chunks(polygons, chunk_size):
+                if len(pending) >= max_in_flight:
+                    for polygon in await pending.popleft():
+                        yield polygon
+
+                pending.append(loop.run_in_executor(executor, self.transform, chunk))
+
+            while pending:
+                for polygon in await pending.popleft():
+                    yield polygon
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def plan(self) -> list[Transformation]:
+        """Get the transformations in the order they will be applied.
+
+        When a checkpoint is configured, the transformations before and after
+        it are planned separately so that the checkpoint holds the same
+        results regardless of optimization.
+
+        :returns: the planned list of transformations
+        """
+
+        return list(self._plan_with_checkpoint()[0])
+
+    def _streams(self, transformations: tuple[Transformation, ...]) -> bool:
+        """Check if the transformations can be applied to one polygon at a
+        time.
+        """
+        if self.checkpoints is not None or (self.threads or 1) > 1 or (self.processes or 1) > 1:
+            return False
+        if self.tracker is not None or self.diagnostics is not None or self.profiler is not None:
+            return False
+
+        return all(_applies_to_all(transformation) for transformation in transformations)
+
+    def _plan_with_checkpoint(self) -> tuple[tuple[Transformation, ...], int | None]:
+        """Plan the transformations and find the number of planned
+        transformations to apply before saving the checkpoint.
+        """
+
+        if not self.optimize:
+            return tuple(self.transformations), self.checkpoint_after
+
+        if self.checkpoint_after is None:
+            return tuple(plan_transformations(self.transformations)), None
+
+        split = self.checkpoint_after
+        head = plan_transformations(self.transformations[:split])
+        tail = plan_transformations(self.transformations[split:])
+
+        return (*head, *tail), len(head)
+
+    def _transform_groups(
+        self,
+        polygons: list[Polygon],
+        errors: dict[int, Exception] | None = None,
+    ) -> list[list[Polygon]]:
+        """Apply the planned transformations one at a time to the whole batch,
+        keeping track of which input polygon each result came from.
+
+        :param errors: if given, exceptions raised for a polygon are stored in
+            it by the index of the input polygon instead of being raised, and
+            the group of that polygon is left empty.
+        """
+        transformations, checkpoint_after = self._plan_with_checkpoint()
+        start, groups = 0, [[polygon] for polygon in polygons]
+
+        keys: list[str] = []
+        if self.checkpoints is not None:
+            keys = checkpoint_keys(_fingerprints(transformations), polygons)
+            for i in reversed(range(len(keys))):
+                saved = self.checkpoints.load(keys[i])
+                if saved is not None and len(saved) == len(polygons):
+                    start, groups = i + 1, saved
+                    break
+
+        shape = (len(transformations) - start, len(polygons) if self.tracker is not None else 0)
+        seconds = np.zeros(shape)
+        vertices = np.zeros(shape, dtype=np.int64)
+
+        workers = self.threads or self.processes or 1
+        diagnostics = self.diagnostics
+        if diagnostics is not None:
+            diagnostics.start_run()
+            diagnostics.end_stage(None, groups, None)
+
+        try:
+            with _executor(self.threads, self.processes, transformations) as executor:
+                for i in range(start, len(transformations)):
+                    stage_seconds = None
+                    if self.tracker is not None:
+                        stage_seconds = [0.0] * len(groups)
+                    traced_before = diagnostics.start_stage() if diagnostics is not None else None
+                    profile = self.profiler.start_stage() if self.profiler is not None else None
+
+                    try:
+                        groups = _apply_transformation(
+                            transformations[i],
+                            groups,
+                            executor,
+                            workers,
+                            errors,
+                            stage_seconds,
+                        )
+                    finally:
+                        if self.profiler is not None:
+                            self.profiler.end_stage(transformations[i], profile)
+                    # A checkpoint with failed groups would look like they
+                    # succeeded with no polygons
+                    if self.checkpoints is not None and i + 1 == checkpoint_after and not errors:
+                        self.checkpoints.save(keys[i], groups)
+
+                    if stage_seconds is not None:
+                        seconds[i - start] = stage_seconds
+                        vertices[i - start] = _group_vertex_counts(groups)
+                    if diagnostics is not None:
+                        diagnostics.end_stage(transformations[i], groups, traced_before)
+        finally:
+            if diagnostics is not None:
+                diagnostics.stop_run()
+
+        if self.tracker is not None:
+            self.tracker.record(polygons, transformations[start:], seconds, vertices)
+
+        return groups
+
+
+def transform_many(
+    transformers: Sequence[Transformer],
+    polygons: Iterable[Polygon],
+) -> list[list[Polygon]]:
+    """Perform several transformation chains on the same sequence of polygons.
+
+    Leading transformations that are shared between transformers, either
+    because they are the same object or because they have the same
+    fingerprint, are only applied once and their results are passed on to
+    each of the diverging branches. Checkpoint settings of the transformers
+    are not used.
+
+    :returns: a list of transformed polygons for each transformer
+    """
+
+    results: list[list[Polygon]] = [[] for _ in transformers]
+    _fan_out(
+        list(polygons),
+        [(i, tuple(transformer.plan())) for i, transformer in enumerate(transformers)],
+        results,
+    )
+
+    return results
 
 
 def to_polygons(obj: Geometry) -> TransformationResult:
@@ -71,14 +468,306 @@ def to_polygons(obj: Geometry) -> TransformationResult:
 def _apply_transformations(
     polygons: Iterable[Polygon],
     transformations: tuple[Transformation, ...],
-) -> TransformationResult:
-    if not transformations:
-        yield from polygons
-        return
+) -> Iterator[Polygon]:
+    """Lazily apply the transformations to each polygon in turn."""
+    for transformation in transformations:
+        polygons = itertools.chain.from_iterable(map(transformation, polygons))
+
+    return iter(polygons)
+
+
+def _applies_to_all(transformation: Transformation) -> bool:
+    info = get_transformation_info(transformation)
+
+    return info is None or info.applies is None
+
+
+def _apply_transformation(
+    transformation: Transformation,
+    groups: list[list[Polygon]],
+    executor: Executor | SharedMemoryExecutor | None = None,
+    workers: int = 1,
+    errors: dict[int, Exception] | None = None,
+    seconds: list[float] | None = None,
+) -> list[list[Polygon]]:
+    """Apply a transformation to every polygon in a list of groups.
+
+    The transformation's predicate is evaluated for all polygons at once, and
+    polygons the transformation would not change are passed through as they
+    are without calling it. The remaining polygons are transformed in the
+    executor, if one is given, which has `workers` workers.
+
+    When `errors` is given, an exception raised for a polygon is stored in it
+    by group index and the group is emptied, so later transformations skip
+    it. Groups that already have an error are expected to be empty.
+
+    When `seconds` is given, the time spent transforming the polygons of
+    each group is added to it by group index.
+    """
+    capture = errors is not None
+    polygons = [polygon for group in groups for polygon in group]
+    try:
+        applies = transformation_applies(transformation, polygons).tolist()
+    except Exception:
+        if not capture:
+            raise
+        # Calling the transformation on every polygon is always correct, and
+        # finds the polygons that made the predicate fail
+        applies = [True] * len(polygons)
+    selected = [polygon for polygon, selected in zip(polygons, applies) if selected]
+
+    results: Iterable[TransformOutput]
+    if executor is None:
+        results = (_transform_one(transformation, polygon, capture) for polygon in selected)
+    else:
+        results = _map_chunks(transformation, selected, executor, workers, capture)
+
+    flags, outputs = iter(applies), iter(results)
+    new_groups = []
+    for index, group in enumerate(groups):
+        new_group: list[Polygon] = []
+        for polygon in group:
+            if not next(flags):
+                new_group.append(polygon)
+                continue
+
+            output, elapsed = next(outputs)
+            if seconds is not None:
+                seconds[index] += elapsed
+            if isinstance(output, Exception):
+                assert errors is not None
+                errors.setdefault(index, output)
+            else:
+                new_group.extend(output)
+
+        new_groups.append([] if errors is not None and index in errors else new_group)
+
+    return new_groups
+
+
+def _map_chunks(
+    transformation: Transformation,
+    polygons: list[Polygon],
+    executor: Executor | SharedMemoryExecutor,
+    workers: int,
+    capture: bool = False,
+) -> list[TransformOutput]:
+    """Transform the polygons in chunks in an executor.
+
+    The chunks are sized by the estimated cost of the polygons rather than
+    their number, and the most expensive polygons are submitted first, so a
+    few huge polygons don't leave the other workers idle at the end.
+
+    :param capture: return the exception raised for a polygon in place of
+        its results instead of raising it
+    :returns: the transformed polygons of each input polygon and the time
+        it took, in order
+    """
+    try:
+        costs = transformation_costs(transformation, polygons)
+    except Exception:
+        if not capture:
+            raise
+        costs = np.asarray(shapely.get_num_coordinates(polygons), dtype=np.float64).reshape(-1)
+
+    results: list[TransformOutput] = [([], 0.0) for _ in polygons]
+    chunks = _chunk_by_cost(costs, workers)
+    chunk_polygons = [[polygons[i] for i in chunk] for chunk in chunks]
+
+    outputs: Iterable[list[TransformOutput]]
+    if isinstance(executor, SharedMemoryExecutor):
+        outputs = executor.map_chunks(transformation, chunk_polygons, capture)
+    else:
+        outputs = executor.map(
+            _transform_chunk,
+            itertools.repeat(transformation),
+            chunk_polygons,
+            itertools.repeat(capture),
+        )
+    for chunk, chunk_outputs in zip(chunks, outputs):
+        for i, output in zip(chunk, chunk_outputs):
+            results[i] = output
+
+    return results
+
+
+def _chunk_by_cost(costs: npt.NDArray[np.float64], workers: int) -> list[list[int]]:
+    """Split polygon indices into chunks of similar total cost, most expensive
+    polygons first.
+
+    Each worker gets a few chunks on average, so uneven estimates even out.
+    Polygons costing more than a chunk get a chunk of their own.
+    """
+    order = np.argsort(-costs, kind="stable").tolist()
+    target = float(costs.sum()) / (4 * workers)
+
+    chunks: list[list[int]] = []
+    chunk: list[int] = []
+    work = 0.0
+    for i in order:
+        chunk.append(i)
+        work += costs[i]
+        if work >= target:
+            chunks.append(chunk)
+            chunk, work = [], 0.0
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def _group_vertex_counts(groups: list[list[Polygon]]) -> npt.NDArray[np.int64]:
+    """Count the vertices of all polygons of each group."""
+    polygons = [polygon for group in groups for polygon in group]
+    group_index = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+    counts = shapely.get_num_coordinates(np.asarray(polygons, dtype=object))
 
-    transformation, transformations = transformations[0], transformations[1:]
-    for polygon in polygons:
-        yield from _apply_transformations(
-            transformation(polygon),
-            transformations,
+    return np.bincount(group_index, weights=counts, minlength=len(groups)).astype(np.int64)
+
+
+def _transform_chunk(
+    transformation: Transformation,
+    polygons: list[Polygon],
+    capture: bool = False,
+) -> list[TransformOutput]:
+    return [_transform_one(transformation, polygon, capture) for polygon in polygons]
+
+
+def _transform_one(
+    transformation: Transformation,
+    polygon: Polygon,
+    capture: bool = False,
+) -> TransformOutput:
+    """Apply a transformation to a polygon, returning the exception it
+    raises instead of raising it if `capture` is set.
+
+    :returns: the transformed polygons or the exception, and the time it took
+    """
+    start = time.perf_counter()
+    if not capture:
+        return list(transformation(polygon)), time.perf_counter() - start
+
+    try:
+        return list(transformation(polygon)), time.perf_counter() - start
+    except Exception as e:
+        return e, time.perf_counter() - start
+
+
+def _executor(
+    threads: int | None,
+    processes: int | None,
+    transformations: Sequence[Transformation],
+) -> Executor | SharedMemoryExecutor | contextlib.nullcontext[None]:
+    """Create the executor for a transformation run.
+
+    The pool is not reused between runs, as the process pool needs the
+    transformations of the run when its workers start.
+    """
+    if processes is not None and processes > 1:
+        return SharedMemoryExecutor(processes, transformations)
+    if threads is not None and threads > 1:
+        return ThreadPoolExecutor(threads, thread_name_prefix="geo_extensions")
+
+    return contextlib.nullcontext()
+
+
+def _fan_out(
+    polygons: list[Polygon],
+    branches: list[tuple[int, tuple[Transformation, ...]]],
+    results: list[list[Polygon]],
+) -> None:
+    """Apply the first transformation of each branch, sharing the work between
+    branches that start with the same transformation, and recurse into the
+    rest of each branch.
+    """
+    groups: dict[object, list[tuple[int, tuple[Transformation, ...]]]] = {}
+    for index, transformations in branches:
+        if not transformations:
+            results[index] = list(polygons)
+            continue
+
+        transformation = transformations[0]
+        key = fingerprint(transformation) or id(transformation)
+        groups.setdefault(key, []).append((index, transformations))
+
+    for group in groups.values():
+        transformation = group[0][1][0]
+        (new_polygons,) = _apply_transformation(transformation, [polygons])
+        _fan_out(
+            new_polygons,
+            [(index, transformations[1:]) for index, transformations in group],
+            results,
         )
+
+
+async def _chunks(
+    polygons: Iterable[Polygon] | AsyncIterable[Polygon],
+    size: int,
+) -> AsyncIterator[list[Polygon]]:
+    """Group a sync or async iterable of polygons into lists of `size`
+    polygons. The last list may be shorter.
+    """
+    chunk: list[Polygon] = []
+
+    if isinstance(polygons, AsyncIterable):
+        async for polygon in polygons:
+            chunk.append(polygon)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    else:
+        for polygon in polygons:
+            chunk.append(polygon)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _load(obj: Geometry | str | dict) -> Geometry:
+    """Load a geometry from WKT or a GeoJSON dict."""
+    if isinstance(obj, str):
+        return wkt.loads(obj)
+    if isinstance(obj, dict):
+        return shape(obj)
+
+    return obj
+
+
+def _fingerprints(transformations: tuple[Transformation, ...]) -> list[str]:
+    """Get the fingerprints of the leading transformations up to the first one
+    that doesn't have a fingerprint.
+    """
+    fingerprints = []
+    for transformation in transformations:
+        value = fingerprint(transformation)
+        if value is None:
+            break
+        fingerprints.append(value)
+
+    return fingerprints
+
+
+def _unique_polygons(polygons: list[Polygon]) -> tuple[list[Polygon], list[int]]:
+    """Collapse byte-identical polygons.
+
+    :returns: the unique polygons in order of first appearance, and for each
+        input polygon, the index of its unique counterpart.
+    """
+    unique_polygons: list[Polygon] = []
+    index_by_key: dict[bytes, int] = {}
+    inverse = []
+
+    for key, polygon in zip(shapely.to_wkb(polygons), polygons):
+        index = index_by_key.get(key)
+        if index is None:
+            index = len(unique_polygons)
+            index_by_key[key] = index
+            unique_polygons.append(polygon)
+
+        inverse.append(index)
+
+    return unique_polygons, inverse
@@ -0,0 +1,31 @@
+import pytest
+
+from benchmarks.corpora import CORPORA
+from benchmarks.suite import BENCHMARKS, FORMAT_VERSION, run_suite
+from geo_extensions.checks import validate_polygons
+
+
+@pytest.mark.parametrize("corpus", list(CORPORA))
+@pytest.mark.parametrize("vertices", [4, 100, 1000])
+def test_corpus(corpus, vertices):
+    polygons = CORPORA[corpus](vertices, 3, 0)
+
+    assert polygons
+    assert all(result.valid for result in validate_polygons(polygons, "geodetic"))
+    assert all(polygon.bounds[0] >= -180 and polygon.bounds[2] <= 180 for polygon in polygons)
+    # The same seed gives the same polygons
+    assert CORPORA[corpus](vertices, 3, 0) == polygons
+
+
+def test_run_suite():
+    results = run_suite(list(CORPORA), list(BENCHMARKS), [100], vertices=200, repeat=1)
+
+    assert results["version"] == FORMAT_VERSION
+    assert len(results["calibration"]) > 0
+    assert [benchmark["name"] for benchmark in results["benchmarks"]] == [
+        f"{corpus}/100/{benchmark}" for corpus in CORPORA for benchmark in BENCHMARKS
+    ]
+    for benchmark in results["benchmarks"]:
+        assert len(benchmark["seconds"]) == 1
+        assert benchmark["errors"] == 0
+        assert benchmark["output_polygons"] > 0
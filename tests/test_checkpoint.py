@@ -0,0 +1,120 @@
+import pytest
+from shapely.geometry import Polygon
+
+from geo_extensions.checkpoint import (
+    DirectoryCheckpointStore,
+    MemoryCheckpointStore,
+    checkpoint_keys,
+)
+from geo_extensions.metadata import describe_transformation
+from geo_extensions.transformations import (
+    densify_polygon,
+    drop_z_coordinate,
+    round_points,
+)
+from geo_extensions.transformer import Transformer
+
+
+@pytest.fixture
+def counted():
+    calls = []
+
+    @describe_transformation("counted")
+    def count(polygon):
+        calls.append(polygon)
+        yield polygon
+
+    count.calls = calls
+    return count
+
+
+def test_checkpoint_keys(rectangle, centered_rectangle):
+    keys = checkpoint_keys(["a()", "b()"], [rectangle])
+
+    assert len(keys) == 2
+    assert len(set(keys)) == 2
+    assert checkpoint_keys(["a()"], [rectangle]) == keys[:1]
+    assert checkpoint_keys(["a()"], [centered_rectangle]) != keys[:1]
+    assert checkpoint_keys(["b()", "a()"], [rectangle]) != keys
+
+
+def test_directory_checkpoint_store(tmp_path, rectangle):
+    store = DirectoryCheckpointStore(tmp_path / "checkpoints")
+    polygon_3d = Polygon([(0, 0, 1), (1, 0, 2), (1, 1, 3), (0, 0, 1)])
+    polygon_holes = Polygon(
+        shell=[(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+        holes=[[(1, 1), (2, 1), (2, 2), (1, 1)]],
+    )
+    results = [[rectangle, polygon_3d], [], [polygon_holes, Polygon()]]
+
+    assert store.load("key") is None
+    store.save("key", results)
+    assert store.load("key") == results
+    assert store.load("key")[0][1].has_z
+    assert list((tmp_path / "checkpoints").iterdir()) == [tmp_path / "checkpoints" / "key.bin"]
+
+
+def test_transformer_checkpoint_resume(counted, rectangle):
+    store = MemoryCheckpointStore()
+
+    first = Transformer([counted, round_points(0)], checkpoints=store, checkpoint_after=1)
+    assert first.transform([rectangle]) == [rectangle]
+    assert len(counted.calls) == 1
+
+    # Shares the leading transformation so it resumes from the checkpoint
+    second = Transformer([counted, round_points(-1)], checkpoints=store)
+    assert second.transform_batch([rectangle]) == [
+        [Polygon([(160, 60), (170, 60), (170, 70), (160, 70), (160, 60)])],
+    ]
+    assert len(counted.calls) == 1
+
+    # Different input is not resumed
+    second.transform([Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])])
+    assert len(counted.calls) == 2
+
+
+def test_transformer_checkpoint_resume_directory(tmp_path, counted, rectangle):
+    Transformer(
+        [counted, round_points(0)],
+        checkpoints=DirectoryCheckpointStore(tmp_path),
+        checkpoint_after=1,
+    ).transform([rectangle])
+
+    transformer = Transformer([counted, round_points(1)], checkpoints=DirectoryCheckpointStore(tmp_path))
+    assert transformer.transform([rectangle]) == [rectangle]
+    assert len(counted.calls) == 1
+
+
+def test_transformer_checkpoint_mismatched_prefix(counted, rectangle):
+    store = MemoryCheckpointStore()
+    Transformer([round_points(0), counted], checkpoints=store, checkpoint_after=1).transform([rectangle])
+    assert len(counted.calls) == 1
+
+    Transformer([round_points(1), counted], checkpoints=store).transform([rectangle])
+    assert len(counted.calls) == 2
+
+
+def test_transformer_checkpoint_errors(counted):
+    def closure(polygon):
+        yield polygon
+
+    with pytest.raises(ValueError, match="requires a checkpoint store"):
+        Transformer([counted], checkpoint_after=1)
+
+    with pytest.raises(ValueError, match="must be between 1 and"):
+        Transformer([counted], checkpoints=MemoryCheckpointStore(), checkpoint_after=2)
+
+    with pytest.raises(ValueError, match="must have a fingerprint"):
+        Transformer([counted, closure], checkpoints=MemoryCheckpointStore(), checkpoint_after=2)
+
+
+def test_transformer_checkpoint_planned_separately():
+    densify = densify_polygon(50_000)
+
+    transformer = Transformer(
+        [densify, drop_z_coordinate],
+        checkpoints=MemoryCheckpointStore(),
+        checkpoint_after=1,
+    )
+    assert transformer.plan() == [densify, drop_z_coordinate]
+    assert Transformer([densify, drop_z_coordinate]).plan() == [drop_z_coordinate, densify]
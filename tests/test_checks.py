@@ -1,9 +1,28 @@
+import numpy as np
+import pytest
+from pygeodesy.sphericalTrigonometry import LatLon, areaOf
 from shapely.geometry import Polygon
 
 from geo_extensions.checks import (
+    ValidationResult,
     polygon_crosses_antimeridian_ccw,
     polygon_crosses_antimeridian_fixed_size,
+    polygon_exceeds_hemisphere,
+    polygon_is_ccw_spherical,
+    polygon_spherical_signed_area,
+    polygons_are_ccw_spherical,
+    polygons_cross_antimeridian_ccw,
+    polygons_cross_antimeridian_fixed_size,
+    polygons_exceed_hemisphere,
+    polygons_spherical_signed_area,
+    validate_polygons,
 )
+from geo_extensions.spherical import EARTH_RADIUS_METERS
+
+# A ring along the 80th parallel, in counter-clockwise order around the north
+# pole
+LONS = np.linspace(-180, 180, 361)
+NORTH_POLE_CAP = Polygon(np.stack((LONS, np.full_like(LONS, 80)), axis=-1))
 
 
 def test_polygon_crosses_antimeridian_ccw_simple(centered_rectangle):
@@ -116,3 +135,141 @@ def test_polygon_crosses_antimeridian_fixed_size_antarctica():
         ]
     )
     assert polygon_crosses_antimeridian_fixed_size(polygon, 40) is True
+
+
+def test_polygons_cross_antimeridian_ccw(
+    rectangle,
+    centered_rectangle,
+    antimeridian_centered_rectangle,
+    multi_crossing_polygon,
+):
+    polygons = [rectangle, centered_rectangle, antimeridian_centered_rectangle, multi_crossing_polygon]
+
+    assert polygons_cross_antimeridian_ccw(polygons).tolist() == [
+        polygon_crosses_antimeridian_ccw(polygon) for polygon in polygons
+    ]
+    assert polygons_cross_antimeridian_ccw([]).tolist() == []
+
+
+def test_polygons_cross_antimeridian_fixed_size(
+    rectangle,
+    centered_rectangle,
+    antimeridian_centered_rectangle,
+):
+    polygons = [rectangle, centered_rectangle, antimeridian_centered_rectangle, Polygon()]
+
+    assert polygons_cross_antimeridian_fixed_size(polygons, 40).tolist() == [True, False, True, False]
+    assert polygons_cross_antimeridian_fixed_size([], 20).tolist() == []
+
+
+def test_polygon_spherical_signed_area(centered_rectangle):
+    expected = areaOf(
+        [LatLon(lat, lon) for lon, lat in centered_rectangle.exterior.coords[:-1]],
+        radius=EARTH_RADIUS_METERS,
+    )
+
+    assert polygon_spherical_signed_area(centered_rectangle) == pytest.approx(expected, rel=1e-9)
+    assert polygon_spherical_signed_area(centered_rectangle.reverse()) == pytest.approx(-expected, rel=1e-9)
+
+
+def test_polygon_spherical_signed_area_pole():
+    # Close to the area of the cap north of the 80th parallel
+    cap_area = 2 * np.pi * EARTH_RADIUS_METERS**2 * (1 - np.sin(np.radians(80)))
+
+    assert polygon_spherical_signed_area(NORTH_POLE_CAP) == pytest.approx(cap_area, rel=1e-4)
+    assert polygon_spherical_signed_area(NORTH_POLE_CAP.reverse()) == pytest.approx(-cap_area, rel=1e-4)
+
+
+def test_polygon_is_ccw_spherical(centered_rectangle, antimeridian_centered_rectangle):
+    assert polygon_is_ccw_spherical(centered_rectangle) is True
+    assert polygon_is_ccw_spherical(centered_rectangle.reverse()) is False
+    assert polygon_is_ccw_spherical(antimeridian_centered_rectangle) is True
+    # The planar check gets polygons around the pole wrong
+    assert NORTH_POLE_CAP.exterior.is_ccw is False
+    assert polygon_is_ccw_spherical(NORTH_POLE_CAP) is True
+
+
+def test_polygon_exceeds_hemisphere(centered_rectangle):
+    southern = Polygon(np.stack((LONS[::-1], np.full_like(LONS, 10)), axis=-1))
+
+    assert polygon_exceeds_hemisphere(centered_rectangle) is False
+    assert polygon_exceeds_hemisphere(NORTH_POLE_CAP) is False
+    # Everything south of the 10th parallel
+    assert polygon_exceeds_hemisphere(southern) is True
+
+
+def test_polygons_spherical_checks(centered_rectangle):
+    polygons = [centered_rectangle, centered_rectangle.reverse(), NORTH_POLE_CAP, Polygon()]
+
+    areas = polygons_spherical_signed_area(polygons)
+    assert areas.tolist() == pytest.approx([polygon_spherical_signed_area(polygon) for polygon in polygons])
+    assert areas[3] == 0
+    assert polygons_are_ccw_spherical(polygons).tolist() == [True, False, True, False]
+    assert polygons_exceed_hemisphere(polygons).tolist() == [False, True, False, False]
+    assert polygons_spherical_signed_area([]).tolist() == []
+
+
+def test_validate_polygons(centered_rectangle, antimeridian_centered_rectangle):
+    bowtie = Polygon([(0, 0), (1, 1), (1, 0), (0, 1)])
+    duplicates = Polygon([(0, 0), (1, 0), (1, 0), (1, 1), (0, 1)])
+    polygons = [
+        centered_rectangle,
+        centered_rectangle.reverse(),
+        antimeridian_centered_rectangle,
+        NORTH_POLE_CAP,
+        bowtie,
+        duplicates,
+        Polygon(),
+    ]
+
+    results = validate_polygons(polygons)
+    assert [result.check for result in results] == [
+        None,
+        "orientation",
+        None,
+        None,
+        "self_intersection",
+        "duplicate_points",
+        "empty",
+    ]
+    assert results[0].valid is True
+    assert results[6].valid is False
+    assert validate_polygons([]) == []
+
+
+def test_validate_polygons_rounding():
+    # Summing the longitude steps along this ring doesn't quite get back to
+    # the first point
+    steps = np.linspace(0, 1, 3, endpoint=False)
+    x, y = 31.7, -5.9
+    polygon = Polygon(
+        [(x + t, y) for t in steps]
+        + [(x + 1, y + t) for t in steps]
+        + [(x + 1 - t, y + 1) for t in steps]
+        + [(x, y + 1 - t) for t in steps]
+    )
+
+    assert validate_polygons([polygon]) == [ValidationResult()]
+
+
+def test_validate_polygons_cartesian(centered_rectangle, antimeridian_centered_rectangle):
+    hole = Polygon(
+        [(-10, -10), (10, -10), (10, 10), (-10, 10)],
+        [[(-1, -1), (-1, 1), (1, 1), (1, -1)]],
+    )
+    wrong_hole = Polygon(hole.exterior, [hole.interiors[0].coords[::-1]])
+    polygons = [centered_rectangle, hole, wrong_hole, antimeridian_centered_rectangle]
+
+    results = validate_polygons(polygons, "cartesian")
+    assert [result.check for result in results] == [None, None, "orientation", "orientation"]
+
+
+def test_validate_polygons_max_vertices(centered_rectangle):
+    results = validate_polygons([centered_rectangle, NORTH_POLE_CAP], max_vertices=361)
+
+    assert [result.check for result in results] == [None, "vertex_count"]
+
+
+def test_validate_polygons_unknown_coordinate_system():
+    with pytest.raises(ValueError, match="unknown coordinate system"):
+        validate_polygons([], "spherical")  # type: ignore[arg-type]
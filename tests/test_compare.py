@@ -0,0 +1,121 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.compare import compare, load_results, main
+
+
+def write_results(path, calibration, benchmarks):
+    path.write_text(
+        json.dumps(
+            {
+                "calibration": calibration,
+                "benchmarks": [{"name": name, "seconds": seconds} for name, seconds in benchmarks.items()],
+            }
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    return write_results(
+        tmp_path / "baseline.json",
+        [0.10, 0.11, 0.12],
+        {
+            "swaths/100/densify_polygon": [1.00, 1.02, 0.98, 1.01, 0.99],
+            "swaths/100/simplify_polygon": [0.50, 0.51, 0.49, 0.50, 0.50],
+        },
+    )
+
+
+def test_load_results(baseline):
+    timings, scale = load_results(baseline)
+
+    assert scale == 0.10
+    np.testing.assert_allclose(timings["swaths/100/simplify_polygon"], [5.0, 5.1, 4.9, 5.0, 5.0])
+
+    timings, scale = load_results(baseline, normalize=False)
+    assert scale == 1.0
+    np.testing.assert_allclose(timings["swaths/100/simplify_polygon"], [0.50, 0.51, 0.49, 0.50, 0.50])
+
+
+def test_compare_bootstrap_interval():
+    before = np.array([1.00, 1.02, 0.98, 1.01, 0.99])
+
+    (unchanged,) = compare({"a": before}, {"a": before.copy()})
+    assert unchanged.ratio == pytest.approx(1.0)
+    assert unchanged.low < 1 < unchanged.high
+    assert not unchanged.regressed
+
+    (slower,) = compare({"a": before}, {"a": before * 1.5})
+    assert slower.ratio == pytest.approx(1.5)
+    assert 1 < slower.low < 1.5 < slower.high
+    assert slower.regressed
+
+    # Resampling is seeded
+    assert compare({"a": before}, {"a": before * 1.5}) == [slower]
+
+
+def test_compare_threshold():
+    before = np.array([1.00, 1.02, 0.98, 1.01, 0.99])
+
+    # Slower for sure, but by less than the threshold
+    (comparison,) = compare({"a": before}, {"a": before * 1.05})
+    assert comparison.low > 1
+    assert not comparison.regressed
+    (comparison,) = compare({"a": before}, {"a": before * 1.05}, threshold=0.01)
+    assert comparison.regressed
+
+    # Noisy results whose interval includes no change never regress
+    (comparison,) = compare({"a": before}, {"a": np.array([0.9, 2.0, 0.95, 1.9, 1.0])})
+    assert comparison.ratio > 1.1
+    assert comparison.low < 1
+    assert not comparison.regressed
+
+    (comparison,) = compare({"a": before}, {"a": before * 1.5}, min_seconds=2.0)
+    assert not comparison.regressed
+
+
+def test_compare_missing_benchmarks():
+    before = np.array([1.0, 1.1])
+
+    comparisons = compare({"a": before, "b": before, "c": before}, {"c": before, "b": np.array([])})
+
+    assert [comparison.name for comparison in comparisons] == ["c"]
+
+
+def test_main_without_regression(baseline, tmp_path, capsys):
+    # Twice as slow on a machine that is twice as slow
+    candidate = write_results(
+        tmp_path / "candidate.json",
+        [0.20, 0.22, 0.24],
+        {
+            "swaths/100/densify_polygon": [2.00, 2.04, 1.96, 2.02, 1.98],
+            "swaths/100/simplify_polygon": [1.00, 1.02, 0.98, 1.00, 1.00],
+        },
+    )
+
+    assert main([str(baseline), str(candidate)]) == 0
+    assert "REGRESSED" not in capsys.readouterr().out
+    # Without normalization both benchmarks are twice as slow
+    assert main([str(baseline), str(candidate), "--no-normalize"]) == 1
+
+
+def test_main_with_regression(baseline, tmp_path, capsys):
+    candidate = write_results(
+        tmp_path / "candidate.json",
+        [0.10, 0.11, 0.12],
+        {
+            "swaths/100/densify_polygon": [1.50, 1.53, 1.47, 1.51, 1.49],
+            "swaths/100/simplify_polygon": [0.50, 0.51, 0.49, 0.50, 0.50],
+        },
+    )
+
+    assert main([str(baseline), str(candidate)]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines if line.endswith("REGRESSED")] == ["swaths/100/densify_polygon"]
+    assert lines[-1] == "1 of 2 benchmarks regressed by more than 10%"
+
+    assert main([str(baseline), str(candidate), "--threshold", "0.6"]) == 0
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from pygeodesy.ellipsoidalVincenty import LatLon
+
+from geo_extensions.ellipsoidal import direct_geodesics, inverse_geodesics
+
+STARTS = np.array([(20.0, 10.0), (-170.0, 60.0), (0.0, 0.0), (45.0, -80.0)])
+ENDS = np.array([(60.0, 30.0), (170.0, 65.0), (90.0, 0.0), (-130.0, -70.0)])
+
+
+def test_inverse_geodesics():
+    distances, start_azimuths, end_azimuths = inverse_geodesics(STARTS, ENDS)
+
+    expected = [
+        (p.distanceTo(q), p.initialBearingTo(q), p.finalBearingTo(q))
+        for p, q in (
+            # ruff hint
+            (LatLon(s_lat, s_lon), LatLon(e_lat, e_lon))
+            for (s_lon, s_lat), (e_lon, e_lat) in zip(STARTS, ENDS)
+        )
+    ]
+    assert distances == pytest.approx([d for d, _, _ in expected], abs=1e-3)
+    assert start_azimuths % 360 == pytest.approx([a for _, a, _ in expected], abs=1e-9)
+    assert end_azimuths % 360 == pytest.approx([a for _, _, a in expected], abs=1e-9)
+
+
+def test_inverse_geodesics_coincident():
+    distances, start_azimuths, end_azimuths = inverse_geodesics(
+        np.array([(10.0, 10.0)]),
+        np.array([(10.0, 10.0)]),
+    )
+
+    assert distances.tolist() == [0.0]
+    assert start_azimuths.tolist() == [0.0]
+    assert end_azimuths.tolist() == [0.0]
+
+
+def test_direct_geodesics():
+    azimuths = np.array([45.0, 300.0, 90.0, 180.0])
+    distances = np.array([1_000_000.0, 2_500_000.0, 10.0, 0.0])
+
+    points, end_azimuths = direct_geodesics(STARTS, azimuths, distances)
+
+    for (lon, lat), azimuth, distance, point, end_azimuth in zip(STARTS, azimuths, distances, points, end_azimuths):
+        start = LatLon(lat, lon)
+        expected = start.destination(distance, azimuth)
+        assert point.tolist() == pytest.approx([expected.lon, expected.lat], abs=1e-9)
+        assert end_azimuth % 360 == pytest.approx(start.finalBearingOn(distance, azimuth), abs=1e-9)
+
+
+def test_direct_geodesics_normalizes_longitude():
+    points, _ = direct_geodesics(np.array([(179.0, 0.0)]), np.array([90.0]), np.array([300_000.0]))
+
+    assert -180 <= points[0, 0] < -177
+
+
+def test_direct_inverse_round_trip():
+    distances, azimuths, _ = inverse_geodesics(STARTS, ENDS)
+    points, _ = direct_geodesics(STARTS, azimuths, distances)
+
+    assert points == pytest.approx(ENDS, abs=1e-9)
@@ -0,0 +1,44 @@
+from geo_extensions.metadata import (
+    TransformationInfo,
+    describe_transformation,
+    fingerprint,
+    get_transformation_info,
+)
+from geo_extensions.transformations import (
+    densify_polygon,
+    drop_z_coordinate,
+    round_points,
+    simplify_polygon,
+)
+
+
+def module_level_transformation(polygon):
+    yield polygon
+
+
+def test_describe_transformation():
+    @describe_transformation("custom", factor=2)
+    def custom(polygon):
+        yield polygon
+
+    assert get_transformation_info(custom) == TransformationInfo("custom", (("factor", 2),))
+    assert fingerprint(custom) == "custom(factor=2)"
+
+
+def test_fingerprint_builtin():
+    assert fingerprint(drop_z_coordinate) == "drop_z_coordinate()"
+    assert fingerprint(densify_polygon(50_000)) == (
+        "densify_polygon(tolerance_meters=50000, max_vertices=None, adaptive=True, ellipsoidal=False)"
+    )
+    assert fingerprint(simplify_polygon(0.1)) == "simplify_polygon(tolerance=0.1, preserve_topology=True)"
+    assert fingerprint(round_points(3)) == fingerprint(round_points(3))
+    assert fingerprint(round_points(3)) != fingerprint(round_points(4))
+
+
+def test_fingerprint_undescribed():
+    def closure(polygon):
+        yield polygon
+
+    assert fingerprint(module_level_transformation) == "test_metadata.module_level_transformation"
+    assert fingerprint(closure) is None
+    assert fingerprint(lambda polygon: iter([polygon])) is None
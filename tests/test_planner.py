@@ -0,0 +1,108 @@
+from shapely.geometry import Polygon
+
+from geo_extensions.metadata import fingerprint
+from geo_extensions.planner import plan_transformations
+from geo_extensions.transformations import (
+    densify_polygon,
+    drop_z_coordinate,
+    reverse_polygon,
+    round_points,
+    simplify_polygon,
+    split_polygon_on_antimeridian_ccw,
+)
+from geo_extensions.transformer import Transformer
+
+
+def fingerprints(transformations):
+    return [fingerprint(transformation) for transformation in transformations]
+
+
+def test_plan_hoists_drop_z_coordinate():
+    densify = densify_polygon(50_000)
+
+    assert plan_transformations([densify, drop_z_coordinate]) == [drop_z_coordinate, densify]
+
+
+def test_plan_does_not_hoist_past_vertex_reduction():
+    simplify = simplify_polygon(0.1)
+
+    assert plan_transformations([simplify, drop_z_coordinate]) == [simplify, drop_z_coordinate]
+
+
+def test_plan_does_not_hoist_past_non_commuting():
+    densify = densify_polygon(50_000)
+    round_3 = round_points(3)
+
+    assert plan_transformations([densify, round_3]) == [densify, round_3]
+    assert plan_transformations([split_polygon_on_antimeridian_ccw, drop_z_coordinate]) == [
+        split_polygon_on_antimeridian_ccw,
+        drop_z_coordinate,
+    ]
+
+
+def test_plan_merges_round_points():
+    round_3 = round_points(3)
+
+    assert plan_transformations([round_3, round_points(5)]) == [round_3]
+    assert plan_transformations([round_3, round_points(3)]) == [round_3]
+    assert fingerprints(plan_transformations([round_3, round_points(1)])) == [
+        "round_points(ndigits=3)",
+        "round_points(ndigits=1)",
+    ]
+
+
+def test_plan_merges_idempotent():
+    densify = densify_polygon(50_000)
+
+    assert plan_transformations([densify, densify_polygon(50_000)]) == [densify]
+    assert len(plan_transformations([densify, densify_polygon(10_000)])) == 2
+    assert len(plan_transformations([reverse_polygon, reverse_polygon])) == 2
+
+
+def test_plan_undescribed_barrier():
+    def custom(polygon):
+        yield polygon
+
+    densify = densify_polygon(50_000)
+
+    assert plan_transformations([densify, custom, drop_z_coordinate]) == [densify, custom, drop_z_coordinate]
+
+
+def test_plan_multiple_rewrites():
+    densify = densify_polygon(50_000)
+    round_3 = round_points(3)
+
+    plan = plan_transformations(
+        [
+            densify,
+            drop_z_coordinate,
+            drop_z_coordinate,
+            round_3,
+            round_points(4),
+        ]
+    )
+    assert plan == [drop_z_coordinate, densify, round_3]
+
+
+def test_transformer_plan():
+    densify = densify_polygon(50_000)
+    polygon = Polygon([(50, 75, 1), (10, 80, 1), (0, 77, 1), (40, 70, 1), (50, 75, 1)])
+
+    transformer = Transformer([densify, drop_z_coordinate])
+    assert transformer.plan() == [drop_z_coordinate, densify]
+    assert transformer.transform([polygon]) == [
+        Polygon(
+            [
+                (50, 75),
+                (34.100003241169595, 78.2028289318241),
+                (10, 80),
+                (0, 77),
+                (24.297878219303588, 74.40374356383884),
+                (40, 70),
+                (50, 75),
+            ]
+        ),
+    ]
+
+    unoptimized = Transformer([densify, drop_z_coordinate], optimize=False)
+    assert unoptimized.plan() == [densify, drop_z_coordinate]
@@ -0,0 +1,98 @@
+import multiprocessing
+
+import pytest
+from shapely.geometry import Polygon
+
+from geo_extensions.sharedmemory import SharedMemoryExecutor, fork_context, share_groups
+
+
+def test_share_groups_round_trip():
+    groups = [
+        [Polygon([(0, 0), (1, 0), (1, 1), (0, 0)]), Polygon()],
+        [],
+        [
+            Polygon(
+                [(0, 0, 1), (5, 0, 2), (5, 5, 3), (0, 0, 1)],
+                [[(1, 1, 0), (2, 1, 0), (2, 2, 0), (1, 1, 0)]],
+            )
+        ],
+        [Polygon(), Polygon([(3, 3), (4, 3), (4, 4), (3, 3)])],
+    ]
+
+    shared = share_groups(groups)
+    try:
+        loaded = shared.load()
+        assert loaded == groups
+        assert [polygon.has_z for group in loaded for polygon in group] == [False, False, True, False, False]
+        assert shared.load(1, 3) == groups[1:3]
+        assert shared.load(3) == groups[3:]
+    finally:
+        shared.release()
+
+    with pytest.raises(FileNotFoundError):
+        shared.load()
+
+
+def test_share_groups_empty():
+    shared = share_groups([])
+    try:
+        assert shared.load() == []
+    finally:
+        shared.release()
+
+
+def duplicate(polygon):
+    yield polygon
+    yield polygon
+
+
+def fail(polygon):
+    raise ValueError("bad polygon")
+    yield polygon
+
+
+def test_shared_memory_executor(rectangle, centered_rectangle):
+    def unpicklable(polygon):
+        yield polygon.reverse()
+
+    def outputs(results):
+        return [[output for output, _ in chunk] for chunk in results]
+
+    with SharedMemoryExecutor(2, [unpicklable]) as executor:
+        # Known transformations are referred to by position
+        assert outputs(executor.map_chunks(unpicklable, [[rectangle], [centered_rectangle]])) == [
+            [[rectangle.reverse()]],
+            [[centered_rectangle.reverse()]],
+        ]
+        # Other transformations are pickled
+        results = executor.map_chunks(duplicate, [[rectangle, centered_rectangle]])
+        assert outputs(results) == [
+            [[rectangle, rectangle], [centered_rectangle, centered_rectangle]],
+        ]
+        assert all(seconds >= 0 for chunk in results for _, seconds in chunk)
+
+        (chunk,) = executor.map_chunks(fail, [[rectangle]], capture=True)
+        assert [str(output) for output, _ in chunk] == ["bad polygon"]
+        with pytest.raises(ValueError, match="bad polygon"):
+            executor.map_chunks(fail, [[rectangle], [centered_rectangle]])
+
+
+def test_shared_memory_executor_default_start_method(monkeypatch, rectangle):
+    def unpicklable(polygon):
+        yield polygon.reverse()
+
+    # The workers are forked even where the default would spawn them
+    default = multiprocessing.context._default_context
+    monkeypatch.setattr(default, "_actual_context", multiprocessing.get_context("spawn"))
+    with SharedMemoryExecutor(1, [unpicklable]) as executor:
+        assert executor.map_chunks(unpicklable, [[rectangle]])[0][0][0] == [rectangle.reverse()]
+
+
+def test_fork_context_unavailable(monkeypatch):
+    assert fork_context().get_start_method() == "fork"
+
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    with pytest.raises(ValueError, match="fork"):
+        fork_context()
+    with pytest.raises(ValueError, match="fork"):
+        SharedMemoryExecutor(2, [])
@@ -0,0 +1,149 @@
+import gc
+
+import numpy as np
+import pytest
+from pygeodesy.sphericalTrigonometry import LatLon
+from shapely.geometry import Polygon
+
+from geo_extensions import spherical
+from geo_extensions.spherical import (
+    _RINGS,
+    GeodeticRings,
+    cross_track_distances,
+    from_unit_vectors,
+    to_unit_vectors,
+)
+from geo_extensions.transformations import (
+    densify_polygon_by_length,
+    simplify_polygon_geodetic,
+)
+
+
+def test_to_unit_vectors():
+    vectors = to_unit_vectors([(0, 0), (90, 0), (0, 90), (180, -45)])
+
+    assert vectors == pytest.approx(
+        np.array(
+            [
+                [1, 0, 0],
+                [0, 1, 0],
+                [0, 0, 1],
+                [-np.sqrt(0.5), 0, -np.sqrt(0.5)],
+            ]
+        )
+    )
+
+
+def test_cross_track_distances():
+    points = np.array([(30.0, 78.0), (5.0, 73.5), (-170.0, 10.0)])
+    starts = np.array([(50.0, 75.0), (0.0, 77.0), (170.0, 5.0)])
+    ends = np.array([(10.0, 80.0), (40.0, 70.0), (-160.0, 5.0)])
+
+    distances = cross_track_distances(
+        to_unit_vectors(points),
+        to_unit_vectors(starts),
+        to_unit_vectors(ends),
+    )
+
+    assert distances == pytest.approx(
+        [
+            # ruff hint
+            abs(LatLon(lat, lon).crossTrackDistanceTo(LatLon(s_lat, s_lon), LatLon(e_lat, e_lon)))
+            for (lon, lat), (s_lon, s_lat), (e_lon, e_lat) in zip(points, starts, ends)
+        ],
+        rel=1e-9,
+    )
+
+
+def test_cross_track_distances_degenerate():
+    points = to_unit_vectors([(10.0, 10.0), (11.0, 10.0), (0.0, 0.0), (0.0, 0.0)])
+    starts = to_unit_vectors([(10.0, 10.0), (10.0, 10.0), (-180.0, 0.0), (90.0, 0.0)])
+    ends = to_unit_vectors([(10.0, 10.0), (10.0, 10.0), (180.0, 0.0), (-90.0, 0.0)])
+
+    assert cross_track_distances(points, starts, ends).tolist() == pytest.approx(
+        [
+            0.0,
+            abs(LatLon(10.0, 11.0).crossTrackDistanceTo(LatLon(10.0, 10.0), LatLon(10.0, 10.0))),
+            abs(LatLon(0.0, 0.0).crossTrackDistanceTo(LatLon(0.0, -180.0), LatLon(0.0, 180.0))),
+            np.inf,
+        ],
+        abs=1e-6,
+    )
+
+
+def test_from_unit_vectors():
+    coords = np.array([(0.0, 0.0), (90.0, 0.0), (-135.0, 45.0), (10.0, -89.0)])
+
+    assert from_unit_vectors(to_unit_vectors(coords)) == pytest.approx(coords)
+
+
+def test_geodetic_rings():
+    polygon = Polygon(
+        shell=[(50, 70), (50, 80), (0, 80), (0, 70), (50, 70)],
+        holes=[[(45, 72), (45, 78), (5, 78), (5, 72), (45, 72)]],
+    )
+
+    rings = GeodeticRings.from_polygon(polygon)
+
+    assert len(rings.coords) == len(rings.vectors) == 2
+    assert [tuple(coord) for coord in rings.coords[1].tolist()] == list(polygon.interiors[0].coords)
+    assert rings.vectors[1] == pytest.approx(to_unit_vectors(rings.coords[1]))
+    # The rings are cached for as long as the polygon is alive
+    assert GeodeticRings.from_polygon(polygon) is rings
+    assert rings.to_polygon() == polygon
+
+
+def test_geodetic_rings_from_polygons():
+    first = Polygon([(0, 0), (10, 0), (10, 10), (0, 0)])
+    second = Polygon([(0, 0, 1), (10, 0, 1), (10, 10, 1), (0, 0, 1)])
+
+    cached = GeodeticRings.from_polygon(second)
+    all_rings = GeodeticRings.from_polygons([first, second, Polygon(), first])
+
+    assert all_rings[0] is all_rings[3]
+    assert all_rings[1] is cached
+    assert all_rings[1].coords[0].shape == (4, 3)
+    assert all_rings[0].vectors[0] == pytest.approx(cached.vectors[0])
+    assert all_rings[2] == GeodeticRings((), ())
+    assert all_rings[2].to_polygon() == Polygon()
+
+
+def test_geodetic_rings_released():
+    polygon = Polygon([(0, 0), (10, 0), (10, 10), (0, 0)])
+    GeodeticRings.from_polygon(polygon)
+    assert id(polygon) in _RINGS
+
+    key = id(polygon)
+    del polygon
+    gc.collect()
+    assert key not in _RINGS
+
+
+def test_geodetic_rings_cache_bounded(monkeypatch):
+    monkeypatch.setattr(spherical, "MAX_CACHED_VERTICES", 10)
+    polygons = [Polygon([(i, 0), (i + 1, 0), (i + 1, 1), (i, 0)]) for i in range(3)]
+    large = Polygon([(i, 0) for i in range(10)] + [(0, 1)])
+
+    GeodeticRings.from_polygons(polygons[:2])
+    GeodeticRings.from_polygon(polygons[0])
+    GeodeticRings.from_polygon(polygons[2])
+    # The least recently used rings are dropped first
+    assert [id(polygon) in _RINGS for polygon in polygons] == [True, False, True]
+
+    # Rings larger than the whole cache are not cached
+    GeodeticRings.from_polygon(large)
+    assert id(large) not in _RINGS
+    assert id(polygons[2]) in _RINGS
+
+
+def test_geodetic_rings_shared_between_stages():
+    polygon = Polygon([(0, 0), (10, 0), (10, 1), (0, 1), (0, 0)])
+
+    (densified,) = densify_polygon_by_length(300_000)(polygon)
+    rings = GeodeticRings.from_polygon(densified)
+    # The densified polygon comes with the unit vectors of its new points
+    assert rings.vectors[0] == pytest.approx(to_unit_vectors(densified.exterior.coords))
+
+    (simplified,) = simplify_polygon_geodetic(1)(densified)
+    assert simplified == polygon
+    assert GeodeticRings.from_polygon(simplified).vectors[0] == pytest.approx(to_unit_vectors(polygon.exterior.coords))
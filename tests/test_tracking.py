@@ -0,0 +1,191 @@
+import asyncio
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from geo_extensions.tracking import (
+    MemoryDiagnostics,
+    SlowInputTracker,
+    StageProfiler,
+    load_slow_inputs,
+)
+from geo_extensions.transformations import densify_polygon, drop_z_coordinate
+from geo_extensions.transformer import Transformer
+
+
+def sleep_on_large(polygon):
+    time.sleep(polygon.area / 10_000)
+    yield polygon
+
+
+def test_tracker_keeps_slowest(tmp_path):
+    tracker = SlowInputTracker(size=2)
+    polygons = [Polygon([(0, 0), (size, 0), (size, size), (0, 0)]) for size in (10, 100, 50, 20)]
+
+    transformer = Transformer([drop_z_coordinate, sleep_on_large], tracker=tracker)
+    transformer.transform(polygons)
+    transformer.transform(polygons[:1])
+
+    slowest = tracker.slowest()
+    assert [slow_input.polygon for slow_input in slowest] == [polygons[1], polygons[2]]
+    assert [timing.stage for timing in slowest[0].stages] == [
+        "drop_z_coordinate()",
+        "test_tracking.sleep_on_large",
+    ]
+    assert slowest[0].seconds >= 0.5
+    assert slowest[0].output_vertices == 4
+
+    tracker.dump(tmp_path / "slow.jsonl")
+    assert load_slow_inputs(tmp_path / "slow.jsonl") == slowest
+
+    tracker.clear()
+    assert len(tracker) == 0
+
+
+def test_tracker_vertex_counts():
+    tracker = SlowInputTracker()
+    polygon = Polygon([(50, 75), (10, 80), (0, 77), (50, 75)])
+
+    (densified,) = Transformer([densify_polygon(1000)], tracker=tracker, threads=2).transform([polygon])
+
+    (slow_input,) = tracker.slowest()
+    assert slow_input.output_vertices == len(densified.exterior.coords)
+
+
+def test_tracker_record_empty():
+    tracker = SlowInputTracker()
+    tracker.record([], [drop_z_coordinate], np.zeros((1, 0)), np.zeros((1, 0), dtype=np.int64))
+
+    assert tracker.slowest() == []
+
+
+def test_tracker_bad_size():
+    with pytest.raises(ValueError, match="size"):
+        SlowInputTracker(size=0)
+
+
+def test_memory_diagnostics():
+    diagnostics = MemoryDiagnostics()
+    small = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+    large = Polygon([(50, 75), (10, 80), (0, 77), (50, 75)])
+
+    transformer = Transformer([drop_z_coordinate, densify_polygon(1000)], diagnostics=diagnostics, optimize=False)
+    (_, densified) = transformer.transform([small, large])
+
+    assert not tracemalloc.is_tracing()
+    input_memory, drop_z_memory, densify_memory = diagnostics.stages()
+    assert [memory.stage for memory in diagnostics.stages()] == [
+        "input",
+        "drop_z_coordinate()",
+        "densify_polygon(tolerance_meters=1000, max_vertices=None, adaptive=True, ellipsoidal=False)",
+    ]
+    assert input_memory.largest_vertices == 4
+    assert input_memory.largest_polygon == small
+    assert densify_memory.largest_polygon == densified
+    vertices = len(densified.exterior.coords) + 4
+    assert densify_memory.estimated_bytes == vertices * MemoryDiagnostics.BYTES_PER_VERTEX
+    assert densify_memory.traced_peak_bytes > 0
+
+    # Later runs only raise the recorded values
+    transformer.transform([small])
+    assert diagnostics.stages()[2].largest_polygon == densified
+
+
+def test_memory_diagnostics_concurrent_runs():
+    diagnostics = MemoryDiagnostics()
+
+    diagnostics.start_run()
+    diagnostics.start_run()
+    traced_before = diagnostics.start_stage()
+    data = np.ones(1_000_000)
+    del data
+    # A stage of the other run doesn't reset the peak
+    diagnostics.start_stage()
+    diagnostics.end_stage(None, [], traced_before)
+    assert diagnostics.stages()[0].traced_peak_bytes >= 8_000_000
+
+    # Tracing only stops when the last run ends
+    diagnostics.stop_run()
+    assert tracemalloc.is_tracing()
+    diagnostics.stop_run()
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_diagnostics_without_tracing():
+    diagnostics = MemoryDiagnostics(trace=False)
+
+    Transformer([drop_z_coordinate], diagnostics=diagnostics).transform([])
+
+    assert [(memory.stage, memory.traced_peak_bytes, memory.largest_wkb) for memory in diagnostics.stages()] == [
+        ("input", None, None),
+        ("drop_z_coordinate()", None, None),
+    ]
+    diagnostics.clear()
+    assert diagnostics.stages() == []
+
+
+@pytest.mark.parametrize("sampling", [False, True])
+def test_stage_profiler(tmp_path, sampling):
+    if sampling:
+        pytest.importorskip("pyinstrument")
+
+    profiler = StageProfiler(sampling=sampling)
+    polygons = [Polygon([(50, 75), (10, 80), (0, 77), (50, 75)])] * 20
+
+    transformer = Transformer([drop_z_coordinate, densify_polygon(100)], profiler=profiler, optimize=False)
+    transformer.transform_batch(polygons, deduplicate=False)
+    transformer.transform_batch(polygons, deduplicate=False)
+
+    assert list(profiler.stats()) == [
+        "drop_z_coordinate()",
+        "densify_polygon(tolerance_meters=100, max_vertices=None, adaptive=True, ellipsoidal=False)",
+    ]
+
+    paths = profiler.dump(tmp_path)
+    assert [path.name for path in paths] == ["00-drop_z_coordinate.prof", "01-densify_polygon.prof", "pipeline.prof"]
+    densify_functions = {function for _, _, function in pstats.Stats(str(paths[1])).stats}
+    assert "_densify_edge" in densify_functions
+    assert "_densify_edge" in {function for _, _, function in pstats.Stats(str(paths[2])).stats}
+
+    profiler.clear()
+    assert profiler.stats() == {}
+
+
+@pytest.mark.parametrize("sampling", [False, True])
+def test_stage_profiler_concurrent_runs(sampling):
+    if sampling:
+        pytest.importorskip("pyinstrument")
+
+    barrier = threading.Barrier(2, timeout=10)
+
+    def wait_for_other_run(polygon):
+        barrier.wait()
+        time.sleep(0.01)
+        return [polygon]
+
+    profiler = StageProfiler(sampling=sampling)
+    transformer = Transformer([wait_for_other_run], profiler=profiler)
+    polygons = [Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])] * 2
+
+    async def transform():
+        with ThreadPoolExecutor(2) as executor:
+            return [polygon async for polygon in transformer.transform_async(polygons, executor, chunk_size=1)]
+
+    assert asyncio.run(transform()) == polygons
+
+    (stats,) = profiler.stats().values()
+    if not sampling:
+        # Only one cProfile profiler can be active from Python 3.12
+        calls = sum(
+            call_count
+            for (_, _, function), (_, call_count, *_) in stats.stats.items()
+            if function == "wait_for_other_run"
+        )
+        assert calls == (2 if sys.version_info < (3, 12) else 1)
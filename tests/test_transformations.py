@@ -1,15 +1,30 @@
+import math
+
+import numpy as np
 import pytest
 import shapely.geometry
 import strategies
 from hypothesis import HealthCheck, given, settings
 from hypothesis import strategies as st
+from pygeodesy.ellipsoidalVincenty import LatLon as EllipsoidalLatLon
+from pygeodesy.sphericalTrigonometry import LatLon
 from shapely.geometry import Polygon
 
+from geo_extensions.metadata import transformation_applies, transformation_costs
+from geo_extensions.spherical import to_unit_vectors
 from geo_extensions.transformations import (
+    EdgeCache,
+    VertexBudgetExceeded,
+    cartesian,
     densify_polygon,
+    densify_polygon_by_length,
     drop_z_coordinate,
+    geodetic,
     round_points,
     simplify_polygon,
+    simplify_polygon_geodetic,
+    simplify_polygon_to_vertex_count,
+    simplify_polygons_to_vertex_count,
     split_polygon_on_antimeridian_ccw,
     split_polygon_on_antimeridian_fixed_size,
 )
@@ -821,3 +836,510 @@ def test_split_polygon_on_antimeridian_fixed_size_alos2_example():
             (180.0, -83.31530686924889),
         ],
     ]
+
+
+def test_densify_applies():
+    polygon = Polygon(
+        [
+            (50, 75),
+            (10, 80),
+            (0, 77),
+            (40, 70),
+            (50, 75),
+        ]
+    )
+    transformation = densify_polygon(50_000)
+    (densified,) = transformation(polygon)
+
+    assert transformation_applies(transformation, [polygon, densified, Polygon()]).tolist() == [
+        True,
+        False,
+        False,
+    ]
+    assert transformation_applies(transformation, []).tolist() == []
+
+
+@given(
+    # Densify can't handle edges between antipodal points
+    polygon=strategies.rectangles(lons=st.floats(min_value=-80, max_value=80)),
+)
+@settings(suppress_health_check=[HealthCheck.filter_too_much])
+def test_densify_applies_matches_densify(polygon):
+    transformation = densify_polygon(50_000)
+    (densified,) = transformation(polygon)
+
+    (applies,) = transformation_applies(transformation, [polygon])
+    assert applies == (len(densified.exterior.coords) != len(polygon.exterior.coords))
+
+
+def test_densify_costs():
+    polygons = [
+        Polygon([(50, 75), (10, 80), (0, 77), (40, 70), (50, 75)]),
+        Polygon([(0, 0), (1, 0), (1, 1), (0, 0)]),
+        Polygon(),
+    ]
+
+    for transformation in (densify_polygon(1_000), densify_polygon_by_length(10_000)):
+        costs = transformation_costs(transformation, polygons)
+        counts = [len(densified.exterior.coords) for polygon in polygons for densified in transformation(polygon)]
+        # Within a factor of 2 of the actual number of vertices
+        assert counts[0] / 2 < costs[0] < counts[0] * 2
+        assert costs[0] > 5 * costs[1]
+        assert costs[2] == 0
+
+    assert transformation_costs(densify_polygon(10, max_vertices=100), polygons)[0] == 100
+    assert transformation_costs(simplify_polygon(0.1), polygons).tolist() == [5, 4, 0]
+
+
+def test_drop_z_coordinate_applies():
+    polygon_2d = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+    polygon_3d = Polygon([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0)])
+
+    assert transformation_applies(drop_z_coordinate, [polygon_2d, polygon_3d]).tolist() == [False, True]
+
+
+def test_split_polygon_on_antimeridian_applies(rectangle, antimeridian_centered_rectangle):
+    polygons = [rectangle, antimeridian_centered_rectangle]
+
+    assert transformation_applies(split_polygon_on_antimeridian_ccw, polygons).tolist() == [False, True]
+    assert transformation_applies(split_polygon_on_antimeridian_fixed_size(40), polygons).tolist() == [
+        True,
+        True,
+    ]
+
+
+def test_densify_max_vertices():
+    polygon = Polygon(
+        [
+            (50, 75),
+            (10, 80),
+            (0, 77),
+            (40, 70),
+            (50, 75),
+        ]
+    )
+    unlimited = list(densify_polygon(1_000)(polygon))
+    assert len(unlimited[0].exterior.coords) == 46
+
+    # Budget is not reached
+    assert list(densify_polygon(1_000, max_vertices=46)(polygon)) == unlimited
+
+    # The tolerance is increased by a factor of 4 until the polygon fits
+    assert list(densify_polygon(1_000, max_vertices=20)(polygon)) == list(densify_polygon(16_000)(polygon))
+
+    with pytest.raises(VertexBudgetExceeded, match="tolerance of 1000 meters produces more than 45 vertices"):
+        list(densify_polygon(1_000, max_vertices=45, adaptive=False)(polygon))
+
+
+def test_densify_max_vertices_with_holes():
+    polygon = Polygon(
+        shell=[(50, 70), (50, 80), (0, 80), (0, 70), (50, 70)],
+        holes=[[(45, 72), (45, 78), (5, 78), (5, 72), (45, 72)]],
+    )
+
+    (adapted,) = densify_polygon(1_000, max_vertices=40)(polygon)
+    assert len(adapted.exterior.coords) + len(adapted.interiors[0].coords) <= 40
+    assert len(adapted.interiors) == 1
+
+
+def test_densify_max_vertices_already_over_budget():
+    polygon = Polygon(
+        [
+            (50, 75),
+            (34.100003241169595, 78.2028289318241),
+            (10, 80),
+            (0, 77),
+            (24.297878219303588, 74.40374356383884),
+            (40, 70),
+            (50, 75),
+        ]
+    )
+
+    # No points are added, but the polygon is not rejected either
+    assert list(densify_polygon(50_000, max_vertices=3)(polygon)) == [polygon]
+    assert list(densify_polygon(50_000, max_vertices=3, adaptive=False)(polygon)) == [polygon]
+
+
+def test_densify_max_vertices_antipodal_edge():
+    polygon = Polygon([(0, 0), (180, 0), (90, 10), (0, 0)])
+
+    # Antipodal great circle edges are always split, so no tolerance fits in
+    # the budget
+    with pytest.raises(VertexBudgetExceeded, match="more than 4 vertices with any tolerance"):
+        list(densify_polygon(1000, max_vertices=4)(polygon))
+    # Ellipsoidal edges are only split while their error exceeds the tolerance
+    assert list(densify_polygon(1000, max_vertices=4, ellipsoidal=True)(polygon)) == [polygon]
+
+
+def test_densify_max_vertices_error():
+    with pytest.raises(ValueError, match="'max_vertices' must be greater than 0"):
+        densify_polygon(50_000, max_vertices=0)
+
+
+def test_densify_ellipsoidal():
+    polygon = Polygon(
+        [
+            (50, 75),
+            (10, 80),
+            (0, 77),
+            (40, 70),
+            (50, 75),
+        ]
+    )
+    transformation = densify_polygon(1_000, ellipsoidal=True)
+    (densified,) = transformation(polygon)
+
+    # Geodesics are close to great circles, so a similar number of points is
+    # added
+    assert len(densified.exterior.coords) == pytest.approx(46, abs=3)
+    # The original points are kept in order
+    assert [coord for coord in densified.exterior.coords if coord in polygon.exterior.coords] == list(
+        polygon.exterior.coords
+    )
+    # Every edge is now within the tolerance
+    assert transformation_applies(transformation, [polygon, densified]).tolist() == [True, False]
+    assert list(transformation(densified)) == [densified]
+
+
+def test_densify_ellipsoidal_points_on_geodesic():
+    (densified,) = densify_polygon(100, ellipsoidal=True)(Polygon([(0, 10), (40, 10), (40, 30), (0, 10)]))
+    coords = list(densified.exterior.coords)
+    first_edge = coords[: coords.index((40.0, 10.0)) + 1]
+    assert len(first_edge) > 3
+
+    start, end = EllipsoidalLatLon(10, 0), EllipsoidalLatLon(10, 40)
+    length = start.distanceTo(end)
+    for lon, lat in first_edge:
+        # Points on the geodesic split it without a detour
+        point = EllipsoidalLatLon(lat, lon)
+        assert start.distanceTo(point) + point.distanceTo(end) == pytest.approx(length, abs=1e-3)
+
+
+def test_densify_ellipsoidal_antimeridian():
+    crossing = Polygon([(170, 0), (-170, 0), (-170, 10), (170, 10), (170, 0)])
+    shifted = Polygon([(-10, 0), (10, 0), (10, 10), (-10, 10), (-10, 0)])
+
+    (densified,) = densify_polygon(1000, ellipsoidal=True)(crossing)
+    (densified_shifted,) = densify_polygon(1000, ellipsoidal=True)(shifted)
+
+    assert len(densified.exterior.coords) == len(densified_shifted.exterior.coords)
+    assert all(abs(lon) >= 170 for lon, _ in densified.exterior.coords)
+
+
+def test_densify_ellipsoidal_max_bisections(monkeypatch):
+    error_edges = geodetic._ellipsoidal_edge_errors
+
+    def first_edge_errors(starts, ends):
+        # Every edge starting at the first point looks too far off
+        errors, midpoints = error_edges(starts, ends)
+        return np.where(np.all(starts[:, :2] == [0, 0], axis=1), np.inf, errors), midpoints
+
+    monkeypatch.setattr(geodetic, "_ellipsoidal_edge_errors", first_edge_errors)
+    points = np.array([(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 0.0)])
+    densified, _ = geodetic._densify_ring_ellipsoidal(points, to_unit_vectors(points), 1000)
+
+    assert len(densified) == len(points) + geodetic._MAX_BISECTIONS
+
+
+def test_densify_ellipsoidal_z_coordinate():
+    (densified,) = densify_polygon(10_000, ellipsoidal=True)(
+        Polygon([(0, 70, 0), (40, 70, 10), (40, 80, 10), (0, 70, 0)])
+    )
+
+    assert densified.has_z
+    assert len(densified.exterior.coords) > 4
+    assert all(0 <= z <= 10 for _, _, z in densified.exterior.coords)
+
+
+def test_densify_ellipsoidal_max_vertices():
+    polygon = Polygon(
+        shell=[(50, 70), (50, 80), (0, 80), (0, 70), (50, 70)],
+        holes=[[(45, 72), (45, 78), (5, 78), (5, 72), (45, 72)]],
+    )
+
+    (adapted,) = densify_polygon(1_000, max_vertices=40, ellipsoidal=True)(polygon)
+    assert len(adapted.exterior.coords) + len(adapted.interiors[0].coords) <= 40
+    assert len(adapted.interiors) == 1
+
+    with pytest.raises(VertexBudgetExceeded):
+        list(densify_polygon(1_000, max_vertices=40, adaptive=False, ellipsoidal=True)(polygon))
+
+
+def test_densify_edge_cache():
+    # Two adjacent frames sharing the edge from (10, 80) to (40, 70), with the
+    # second one going around it in the opposite direction
+    first = Polygon([(0, 77), (40, 70), (10, 80), (0, 77)])
+    second = Polygon([(40, 70), (50, 75), (10, 80), (40, 70)])
+    cache = EdgeCache()
+    transformation = densify_polygon(1_000, cache=cache)
+
+    (densified_first,) = transformation(first)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    (densified_second,) = transformation(second)
+    assert (cache.hits, cache.misses) == (1, 5)
+
+    (expected_first,) = densify_polygon(1_000)(first)
+    (expected_second,) = densify_polygon(1_000)(second)
+    assert densified_first == expected_first
+    assert densified_second.equals_exact(expected_second, tolerance=1e-9)
+
+    # The shared edge is reused, in reverse
+    shared = [coord for coord in densified_first.exterior.coords if coord in densified_second.exterior.coords]
+    assert len(shared) > 10
+
+
+def test_densify_edge_cache_eviction():
+    cache = EdgeCache(maxsize=2)
+    polygon = Polygon([(50, 75), (10, 80), (0, 77), (40, 70), (50, 75)])
+
+    list(densify_polygon(1_000, cache=cache)(polygon))
+    assert len(cache) == 2
+
+    # The oldest edges were evicted, so densifying again misses on them
+    list(densify_polygon(1_000, cache=cache)(polygon))
+    assert (cache.hits, cache.misses) == (0, 8)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_densify_edge_cache_tolerance():
+    cache = EdgeCache()
+    polygon = Polygon([(50, 75), (10, 80), (0, 77), (40, 70), (50, 75)])
+
+    list(densify_polygon(1_000, cache=cache)(polygon))
+    (densified,) = densify_polygon(50_000, cache=cache)(polygon)
+
+    assert cache.hits == 0
+    assert list(densify_polygon(50_000)(polygon)) == [densified]
+
+
+def test_densify_edge_cache_error():
+    with pytest.raises(ValueError, match="'maxsize' must be greater than 0"):
+        EdgeCache(maxsize=0)
+
+    with pytest.raises(ValueError, match="'cache' is not supported with 'ellipsoidal'"):
+        densify_polygon(1_000, ellipsoidal=True, cache=EdgeCache())
+
+
+def test_densify_by_length():
+    polygon = Polygon([(0, 0), (10, 0), (10, 1), (0, 1), (0, 0)])
+    transformation = densify_polygon_by_length(300_000)
+
+    (densified,) = transformation(polygon)
+
+    # The long edges along the equator are split into 4 equal segments, and
+    # the short edges are not split
+    assert len(densified.exterior.coords) == 11
+    assert np.array(densified.exterior.coords[:6]) == pytest.approx(
+        np.array([(0, 0), (2.5, 0), (5, 0), (7.5, 0), (10, 0), (10, 1)]),
+        abs=1e-9,
+    )
+    coords = list(densified.exterior.coords)
+    for (lon1, lat1), (lon2, lat2) in zip(coords, coords[1:]):
+        assert LatLon(lat1, lon1).distanceTo(LatLon(lat2, lon2)) <= 300_000
+
+    assert transformation_applies(transformation, [polygon, densified]).tolist() == [True, False]
+    assert list(transformation(densified)) == [densified]
+
+
+def test_densify_by_length_great_circle():
+    (densified,) = densify_polygon_by_length(100_000)(Polygon([(50, 75), (10, 80), (0, 77), (50, 75)]))
+
+    # The new points are on the great circle between the original points
+    start, end = LatLon(75, 50), LatLon(80, 10)
+    for lon, lat in list(densified.exterior.coords)[1:7]:
+        assert LatLon(lat, lon).crossTrackDistanceTo(start, end) == pytest.approx(0, abs=1e-6)
+
+
+def test_densify_by_length_z_coordinate():
+    (densified,) = densify_polygon_by_length(300_000)(Polygon([(0, 0, 0), (10, 0, 8), (10, 1, 8), (0, 0, 0)]))
+
+    assert [z for _, _, z in densified.exterior.coords][:5] == pytest.approx([0, 2, 4, 6, 8])
+
+
+def test_densify_by_length_antimeridian():
+    (densified,) = densify_polygon_by_length(300_000)(Polygon([(175, 0), (-175, 0), (-175, 1), (175, 0)]))
+
+    assert np.array(densified.exterior.coords[:5]) == pytest.approx(
+        np.array([(175, 0), (177.5, 0), (180, 0), (-177.5, 0), (-175, 0)]),
+        abs=1e-9,
+    )
+
+
+def test_densify_by_length_error():
+    with pytest.raises(ValueError, match="'max_segment_meters' must be greater than 0"):
+        densify_polygon_by_length(0)
+
+    with pytest.raises(ValueError, match="antipodal"):
+        list(densify_polygon_by_length(300_000)(Polygon([(0, 0), (180, 0), (90, 10), (0, 0)])))
+
+
+def test_simplify_to_vertex_count():
+    polygon = Polygon(
+        [
+            (0, 0),
+            (5, 0.1),
+            (10, 0),
+            (10, 5),
+            (10.5, 7),
+            (10, 10),
+            (0, 10),
+            (0, 0),
+        ]
+    )
+
+    # The least important vertices are removed first
+    assert list(simplify_polygon_to_vertex_count(7)(polygon)) == [
+        Polygon([(0, 0), (10, 0), (10, 5), (10.5, 7), (10, 10), (0, 10), (0, 0)]),
+    ]
+    assert list(simplify_polygon_to_vertex_count(6)(polygon)) == [
+        Polygon([(0, 0), (10, 0), (10.5, 7), (10, 10), (0, 10), (0, 0)]),
+    ]
+    assert list(simplify_polygon_to_vertex_count(5)(polygon)) == [
+        Polygon([(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]),
+    ]
+    # Polygons within the limit are untouched
+    assert list(simplify_polygon_to_vertex_count(8)(polygon)) == [polygon]
+
+
+@given(
+    radii=st.integers(min_value=10, max_value=200).flatmap(
+        lambda n: st.lists(
+            st.floats(min_value=0.5, max_value=1.5),
+            min_size=n,
+            max_size=n,
+        )
+    ),
+    max_vertices=st.integers(min_value=4, max_value=250),
+    preserve_topology=st.booleans(),
+)
+def test_simplify_to_vertex_count_random(radii, max_vertices, preserve_topology):
+    angles = [2 * math.pi * i / len(radii) for i in range(len(radii))]
+    polygon = Polygon([(r * math.cos(a), r * math.sin(a)) for r, a in zip(radii, angles)])
+
+    (simplified,) = simplify_polygon_to_vertex_count(max_vertices, preserve_topology=preserve_topology)(polygon)
+
+    assert not simplified.is_empty
+    if len(polygon.exterior.coords) <= max_vertices:
+        assert simplified is polygon
+        return
+
+    def simplify(tolerance):
+        result = polygon.simplify(tolerance, preserve_topology=preserve_topology)
+        return result, not result.is_empty and len(result.exterior.coords) <= max_vertices
+
+    # The result comes from the smallest candidate tolerance that fits, or
+    # from the largest one that doesn't empty the polygon if none fits
+    rings = cartesian._ring_coordinates(polygon)
+    tolerances, _, complete = cartesian._tolerance_candidates(rings, max_vertices, len(polygon.exterior.coords))
+    assert complete
+    results = [simplify(tolerance) for tolerance in tolerances]
+    fitting = [i for i, (_, fits) in enumerate(results) if fits]
+    if fitting:
+        assert len(simplified.exterior.coords) <= max_vertices
+        assert any(results[i][0] == simplified and (i == 0 or not results[i - 1][1]) for i in fitting)
+    else:
+        assert simplified == [result for result, _ in results if not result.is_empty][-1]
+    if preserve_topology:
+        assert simplified.is_valid
+
+
+def test_simplify_to_vertex_count_never_empties():
+    polygon = Polygon([(1.2, 0), (0.6, 0.6), (0, 1.1), (-0.8, 0.8), (-1.2, 0), (-0.7, -0.7), (0, -1.1), (0.5, -0.5)])
+    square = Polygon([(1.2, 0), (0, 1.1), (-1.2, 0), (0, -1.1)])
+
+    # Without preserving topology, GEOS collapses the square instead of
+    # making a triangle of it
+    assert list(simplify_polygon_to_vertex_count(5, preserve_topology=False)(polygon)) == [square]
+    assert list(simplify_polygon_to_vertex_count(4, preserve_topology=False)(polygon)) == [square]
+    (triangle,) = simplify_polygon_to_vertex_count(4)(polygon)
+    assert len(triangle.exterior.coords) == 4
+
+
+def test_simplify_polygons_to_vertex_count(rectangle):
+    polygon = Polygon(
+        shell=[(0, 0), (5, 0.1), (10, 0), (10, 10), (5, 9.8), (0, 10), (0, 0)],
+        holes=[[(1, 1), (2, 1), (2, 2), (1.5, 2.1), (1, 2), (1, 1)]],
+    )
+
+    results = simplify_polygons_to_vertex_count([rectangle, polygon, Polygon()], 10)
+    assert results[0] is rectangle
+    assert results[1] == Polygon(
+        shell=[(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+        holes=[[(1, 1), (2, 1), (2, 2), (1, 2), (1, 1)]],
+    )
+    assert results[2] == Polygon()
+
+    # The holes can't be removed, so the polygon is simplified as far as
+    # possible
+    (result,) = simplify_polygons_to_vertex_count([polygon], 4)
+    assert result == Polygon(
+        shell=[(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+        holes=[[(1, 2), (2, 1), (2, 2), (1, 2)]],
+    )
+
+    assert simplify_polygons_to_vertex_count([], 10) == []
+
+
+def test_simplify_to_vertex_count_error():
+    with pytest.raises(ValueError, match="must be at least 4"):
+        simplify_polygon_to_vertex_count(3)
+
+    with pytest.raises(ValueError, match="must be at least 4"):
+        simplify_polygons_to_vertex_count([], 3)
+
+
+def test_simplify_geodetic_inverse_of_densify():
+    polygon = Polygon(
+        shell=[(50, 70), (50, 80), (0, 80), (0, 70), (50, 70)],
+        holes=[[(45, 72), (45, 78), (5, 78), (5, 72), (45, 72)]],
+    )
+    (densified,) = densify_polygon(1_000)(polygon)
+    assert len(densified.exterior.coords) > 20
+
+    assert list(simplify_polygon_geodetic(1)(densified)) == [polygon]
+
+
+def test_simplify_geodetic_tolerance():
+    polygon = Polygon(
+        [
+            (0, 0),
+            (5, 0.1),
+            (10, 0),
+            (10, 10),
+            (0, 10),
+            (0, 0),
+        ]
+    )
+
+    # The point is about 11km away from the great circle along the equator
+    assert list(simplify_polygon_geodetic(12_000)(polygon)) == [
+        Polygon([(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]),
+    ]
+    assert list(simplify_polygon_geodetic(11_000)(polygon)) == [polygon]
+
+
+def test_simplify_geodetic_keeps_rings_valid():
+    polygon = Polygon(
+        [
+            (0, 0),
+            (0.0001, 0),
+            (0.0001, 0.0001),
+            (0, 0.0001),
+            (0, 0),
+        ]
+    )
+
+    (simplified,) = simplify_polygon_geodetic(1_000)(polygon)
+    assert len(simplified.exterior.coords) == 4
+    assert simplified.is_valid
+
+    assert list(simplify_polygon_geodetic(1_000)(Polygon())) == [Polygon()]
+
+
+def test_simplify_geodetic_error():
+    with pytest.raises(ValueError, match="must not be negative"):
+        simplify_polygon_geodetic(-1)
@@ -1,9 +1,22 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
+import shapely.geometry
 from shapely.errors import ShapelyError
 from shapely.geometry import Polygon
 
-from geo_extensions.transformations import simplify_polygon
-from geo_extensions.transformer import Transformer
+from geo_extensions.metadata import describe_transformation
+from geo_extensions.transformations import (
+    densify_polygon,
+    drop_z_coordinate,
+    round_points,
+    simplify_polygon,
+    split_polygon_on_antimeridian_ccw,
+)
+from geo_extensions.transformer import Transformer, _chunk_by_cost, transform_many
 
 
 @pytest.fixture
@@ -228,3 +241,294 @@ def test_from_geo_json_bad_points(simplify_transformer):
 
     with pytest.raises(AttributeError):
         simplify_transformer.from_geo_json({})
+
+
+def test_transform_batch():
+    def duplicate(polygon):
+        yield polygon
+        yield polygon
+
+    transformer = Transformer([duplicate])
+    polygon_1 = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+    polygon_2 = Polygon([(2, 2), (3, 2), (3, 3), (2, 2)])
+
+    assert transformer.transform_batch([polygon_1, polygon_2]) == [
+        [polygon_1, polygon_1],
+        [polygon_2, polygon_2],
+    ]
+    assert transformer.transform_batch([]) == []
+
+
+def test_transform_batch_deduplicate():
+    calls = []
+
+    def record(polygon):
+        calls.append(polygon)
+        yield polygon
+
+    transformer = Transformer([record])
+    polygon_1 = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+    polygon_2 = Polygon([(2, 2), (3, 2), (3, 3), (2, 2)])
+
+    results = transformer.transform_batch([polygon_1, polygon_2, Polygon(polygon_1.exterior), polygon_2])
+    assert results == [[polygon_1], [polygon_2], [polygon_1], [polygon_2]]
+    assert calls == [polygon_1, polygon_2]
+    # Each position gets its own list
+    assert results[0] is not results[2]
+
+    calls.clear()
+    transformer.transform_batch([polygon_1, polygon_1], deduplicate=False)
+    assert calls == [polygon_1, polygon_1]
+
+
+def test_transform_batch_deduplicate_z_coordinate():
+    calls = []
+
+    def record(polygon):
+        calls.append(polygon)
+        yield polygon
+
+    transformer = Transformer([record])
+    polygon_2d = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+    polygon_3d = Polygon([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0)])
+
+    assert transformer.transform_batch([polygon_2d, polygon_3d]) == [[polygon_2d], [polygon_3d]]
+    assert len(calls) == 2
+
+
+def test_transform_streams(rectangle, centered_rectangle):
+    calls = []
+
+    def first(polygon):
+        calls.append(("first", polygon))
+        yield polygon
+
+    def second(polygon):
+        calls.append(("second", polygon))
+        yield polygon
+
+    assert Transformer([first, second]).transform(iter([rectangle, centered_rectangle])) == [
+        rectangle,
+        centered_rectangle,
+    ]
+    assert calls == [
+        ("first", rectangle),
+        ("second", rectangle),
+        ("first", centered_rectangle),
+        ("second", centered_rectangle),
+    ]
+
+    # A predicate needs the whole batch at each stage
+    calls.clear()
+    Transformer(
+        [describe_transformation("first", applies=lambda polygons: np.ones(len(polygons), dtype=bool))(first), second]
+    ).transform([rectangle, centered_rectangle])
+    assert [name for name, _ in calls] == ["first", "first", "second", "second"]
+
+
+def test_transform_threads(rectangle, centered_rectangle, antimeridian_centered_rectangle):
+    transformations = [
+        split_polygon_on_antimeridian_ccw,
+        densify_polygon(100_000),
+        simplify_polygon(0.1),
+    ]
+    polygons = [rectangle, centered_rectangle, antimeridian_centered_rectangle] * 20
+
+    expected = Transformer(transformations).transform_batch(polygons, deduplicate=False)
+    assert Transformer(transformations, threads=4).transform_batch(polygons, deduplicate=False) == expected
+    assert Transformer(transformations, threads=4).transform([]) == []
+
+
+def test_transform_processes(rectangle, centered_rectangle, antimeridian_centered_rectangle):
+    transformations = [
+        split_polygon_on_antimeridian_ccw,
+        densify_polygon(100_000),
+        simplify_polygon(0.1),
+    ]
+    polygons = [rectangle, centered_rectangle, antimeridian_centered_rectangle, Polygon()] * 5
+
+    expected = Transformer(transformations).transform_batch(polygons, deduplicate=False)
+    assert Transformer(transformations, processes=2).transform_batch(polygons, deduplicate=False) == expected
+    assert Transformer(transformations, processes=2).transform([]) == []
+
+
+def test_transform_parallel_bad_arguments():
+    with pytest.raises(ValueError, match="threads"):
+        Transformer([], threads=0)
+    with pytest.raises(ValueError, match="processes"):
+        Transformer([], processes=0)
+    with pytest.raises(ValueError, match="can't be combined"):
+        Transformer([], threads=2, processes=2)
+
+
+def test_transform_processes_without_fork(monkeypatch):
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    with pytest.raises(ValueError, match="'fork' start method"):
+        Transformer([], processes=2)
+    # A single process doesn't start a pool
+    Transformer([], processes=1)
+
+
+def fail_on_large(polygon):
+    if polygon.area > 100:
+        raise ValueError("too large")
+    yield polygon
+
+
+@pytest.mark.parametrize("parallel", [{}, {"threads": 2}, {"processes": 2}])
+def test_try_transform_batch(rectangle, centered_rectangle, parallel):
+    transformer = Transformer([fail_on_large, simplify_polygon(0.1)], **parallel)
+    small = Polygon([(0, 0), (1, 0), (1, 1), (0, 0)])
+
+    result = transformer.try_transform_batch(
+        [
+            small,
+            "POLYGON ((0 0, 1 0, 1 1, 0 0))",
+            centered_rectangle,
+            "not wkt",
+            {"type": "Point", "coordinates": [0, 0]},
+            shapely.geometry.MultiPolygon([small, centered_rectangle]),
+            small,
+        ]
+    )
+
+    assert result.results[0] == result.results[1] == result.results[6] == [small]
+    assert result.results[2:6] == [None, None, None, None]
+    assert result.failed == [2, 3, 4, 5]
+    assert str(result.errors[2]) == "too large"
+    assert isinstance(result.errors[3], ShapelyError)
+    assert "is not a Polygon or MultiPolygon" in str(result.errors[4])
+    # The multipolygon shares its failing polygon with input 2
+    assert result.errors[5] is result.errors[2]
+
+
+def test_try_transform_batch_failing_predicate(rectangle):
+    def applies(polygons):
+        raise ValueError("predicate failed")
+
+    @describe_transformation("custom", applies=applies)
+    def custom(polygon):
+        yield polygon.reverse()
+
+    result = Transformer([custom]).try_transform_batch([rectangle])
+    assert result.results == [[rectangle.reverse()]]
+    assert result.errors == {}
+
+    with pytest.raises(ValueError, match="predicate failed"):
+        Transformer([custom]).transform([rectangle])
+
+
+def test_chunk_by_cost():
+    costs = np.array([1.0, 1.0, 100.0, 1.0, 50.0, 1.0, 50.0, 1.0])
+
+    chunks = _chunk_by_cost(costs, workers=2)
+    # The expensive polygons come first and get a chunk each
+    assert chunks[:3] == [[2], [4], [6]]
+    assert sorted(i for chunk in chunks for i in chunk) == list(range(len(costs)))
+    assert _chunk_by_cost(np.array([]), workers=2) == []
+
+
+def test_transform_async():
+    def duplicate(polygon):
+        yield polygon
+        yield polygon
+
+    transformer = Transformer([duplicate])
+    polygons = [Polygon([(i, 0), (i + 1, 0), (i + 1, 1), (i, 0)]) for i in range(10)]
+
+    async def collect(polygons, **kwargs):
+        return [polygon async for polygon in transformer.transform_async(polygons, **kwargs)]
+
+    async def agen():
+        for polygon in polygons:
+            yield polygon
+
+    expected = transformer.transform(polygons)
+    assert asyncio.run(collect(polygons, chunk_size=3, max_in_flight=2)) == expected
+    assert asyncio.run(collect(agen(), chunk_size=4)) == expected
+    with ThreadPoolExecutor(2) as executor:
+        assert asyncio.run(collect(iter(polygons), executor=executor, chunk_size=1)) == expected
+    assert asyncio.run(collect([])) == []
+
+
+def test_transform_async_bad_arguments():
+    transformer = Transformer([])
+
+    async def first(**kwargs):
+        return await anext(transformer.transform_async([], **kwargs))
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        asyncio.run(first(chunk_size=0))
+    with pytest.raises(ValueError, match="max_in_flight"):
+        asyncio.run(first(max_in_flight=0))
+
+
+def test_transform_many(rectangle, centered_rectangle):
+    calls = []
+
+    def record(polygon):
+        calls.append(polygon)
+        yield polygon
+
+    densify = densify_polygon(50_000)
+    cartesian = Transformer([record, drop_z_coordinate, densify, split_polygon_on_antimeridian_ccw])
+    geodetic = Transformer([record, drop_z_coordinate, densify_polygon(50_000), round_points(3)])
+    identity = Transformer([])
+
+    polygons = [rectangle, centered_rectangle]
+    results = transform_many([cartesian, geodetic, identity], polygons)
+
+    assert results == [
+        cartesian.transform(polygons),
+        geodetic.transform(polygons),
+        polygons,
+    ]
+    # The shared transformation was only applied once per polygon for
+    # `transform_many` and once per polygon for each of the two `transform`
+    # calls.
+    assert len(calls) == 6
+
+
+def test_transform_many_partially_shared(rectangle):
+    calls = []
+
+    @describe_transformation("record")
+    def record(polygon):
+        calls.append(polygon)
+        yield polygon
+
+    results = transform_many(
+        [
+            Transformer([record, record, round_points(0)]),
+            Transformer([record, round_points(0)]),
+            Transformer([record, record, round_points(1)]),
+        ],
+        [rectangle],
+    )
+
+    assert results == [[rectangle], [rectangle], [rectangle]]
+    assert len(calls) == 2
+    assert transform_many([], [rectangle]) == []
+
+
+def test_transform_skips_polygons_not_applied_to(rectangle, centered_rectangle):
+    calls = []
+
+    @describe_transformation(
+        "reverse_east",
+        applies=lambda polygons: np.array([polygon.bounds[0] > 0 for polygon in polygons]),
+    )
+    def reverse_east(polygon):
+        calls.append(polygon)
+        yield polygon.reverse()
+
+    transformer = Transformer([reverse_east])
+    results = transformer.transform([rectangle, centered_rectangle])
+
+    assert results == [rectangle.reverse(), centered_rectangle]
+    assert results[1] is centered_rectangle
+    assert calls == [rectangle]
+    assert transformer.transform_batch([centered_rectangle, rectangle]) == [
+        [centered_rectangle],
+        [rectangle.reverse()],
+    ]